@@ -0,0 +1,35 @@
+"""add keyset pagination indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+# (index name, table, columns) backing ORDER BY <timestamp> DESC, id DESC
+# and the (<timestamp>, id) < (:ts, :id) cursor predicate
+KEYSET_INDEXES = [
+    ('idx_jobs_created_at_id', 'jobs', ['created_at', 'id']),
+    ('idx_companies_created_at_id', 'companies', ['created_at', 'id']),
+    ('idx_applications_applied_at_id', 'applications', ['applied_at', 'id']),
+]
+
+
+def upgrade() -> None:
+    for idx_name, table_name, columns in KEYSET_INDEXES:
+        op.create_index(idx_name, table_name, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for idx_name, table_name, _ in reversed(KEYSET_INDEXES):
+        op.drop_index(idx_name, table_name, if_exists=True)
@@ -0,0 +1,35 @@
+"""add resume_blobs table
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing per-user resume files are left in place and keep working
+    op.create_table(
+        'resume_blobs',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('content_type', sa.String(length=100), nullable=False),
+        sa.Column('ref_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+    op.create_index(op.f('ix_resume_blobs_ref_count'), 'resume_blobs', ['ref_count'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_resume_blobs_ref_count'), table_name='resume_blobs')
+    op.drop_table('resume_blobs')
@@ -0,0 +1,33 @@
+"""add resume_texts table
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Rows are written by the extraction pipeline (app.storage.resume_text)
+    op.create_table(
+        'resume_texts',
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('detected_type', sa.String(length=100), nullable=False),
+        sa.Column('text', sa.Text(), nullable=False, server_default=''),
+        sa.Column('tokens', sa.Text(), nullable=False, server_default=''),
+        sa.Column('extracted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('sha256'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('resume_texts')
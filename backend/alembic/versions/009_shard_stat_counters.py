@@ -0,0 +1,39 @@
+"""shard stat_counters rows
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows become shard 0; the next refresh adds the other shards
+    op.add_column(
+        'stat_counters',
+        sa.Column('shard', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.drop_constraint('stat_counters_pkey', 'stat_counters', type_='primary')
+    op.create_primary_key('stat_counters_pkey', 'stat_counters', ['name', 'shard'])
+
+
+def downgrade() -> None:
+    # Fold every counter back into its shard 0 row
+    op.execute(
+        "UPDATE stat_counters SET value = "
+        "(SELECT SUM(s.value) FROM stat_counters s WHERE s.name = stat_counters.name) "
+        "WHERE shard = 0"
+    )
+    op.execute("DELETE FROM stat_counters WHERE shard <> 0")
+    op.drop_constraint('stat_counters_pkey', 'stat_counters', type_='primary')
+    op.create_primary_key('stat_counters_pkey', 'stat_counters', ['name'])
+    op.drop_column('stat_counters', 'shard')
@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from app.database import get_db
+from app.database import get_db, get_read_db, replicas
 from app.models import User, Profile, UserRole
 from app.admin.schemas import UserListResponse, UserStatusUpdate, UserRoleUpdate
 from app.auth.dependencies import require_admin
+from app.jobs.search_index import REBUILD_TAG, job_search_index
+from app.db_pool import pool_stats
+from app.admin.stats import platform_stats
+from app.cache import publish_invalidation
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -17,7 +21,7 @@ def list_all_users(
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search by email or name"),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     List all users in the system.
@@ -187,7 +191,7 @@ def delete_user(
 @router.get("/pending-employers", response_model=List[UserListResponse])
 def get_pending_employers(
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get all pending employer registrations awaiting approval.
@@ -303,7 +307,7 @@ def list_all_companies(
     limit: int = Query(100, ge=1, le=500),
     search: Optional[str] = Query(None, description="Search by company name"),
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     List all companies in the system.
@@ -377,50 +381,69 @@ def delete_company(
 @router.get("/stats")
 def get_platform_stats(
     current_user: User = Depends(require_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get platform statistics.
 
-    Admin-only endpoint for dashboard overview.
+    Admin-only endpoint for dashboard overview. Served from the
+    stat_counters table when STATS_COUNTERS_MODE is enabled, otherwise
+    from a single aggregate query.
     """
-    from app.models import Company, Job, Application
+    return platform_stats(db)
 
-    total_users = db.query(User).count()
-    active_users = db.query(User).filter(User.is_active == True).count()
-    total_employers = db.query(User).filter(User.role == UserRole.employer).count()
-    total_seekers = db.query(User).filter(User.role == UserRole.seeker).count()
-    pending_employers = db.query(User).filter(
-        User.role == UserRole.employer,
-        User.is_active == False
-    ).count()
-
-    total_companies = db.query(Company).count()
-    total_jobs = db.query(Job).count()
-    open_jobs = db.query(Job).filter(Job.status == "open").count()
-
-    total_applications = db.query(Application).count()
-    pending_applications = db.query(Application).filter(
-        Application.status == "applied"
-    ).count()
-
-    return {
-        "users": {
-            "total": total_users,
-            "active": active_users,
-            "employers": total_employers,
-            "seekers": total_seekers,
-            "pending_employers": pending_employers
-        },
-        "companies": {
-            "total": total_companies
-        },
-        "jobs": {
-            "total": total_jobs,
-            "open": open_jobs
-        },
-        "applications": {
-            "total": total_applications,
-            "pending": pending_applications
-        }
-    }
+
+@router.get("/search-index")
+def get_search_index_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    In-process job search index statistics for this worker.
+
+    Admin-only endpoint. Includes document, term and posting counts and
+    the approximate memory footprint.
+    """
+    return job_search_index.stats()
+
+
+@router.post("/search-index/rebuild")
+def rebuild_search_index(
+    current_user: User = Depends(require_admin),
+    db: Session = Depends(get_db)
+):
+    """
+    Rebuild the in-process job search index from the database.
+
+    Admin-only endpoint. Rebuilds in the worker that serves the request and
+    tells the other workers to rebuild in the background.
+    """
+    stats = job_search_index.rebuild_from_db(db)
+    publish_invalidation(REBUILD_TAG)
+    return stats
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Database connection pool statistics for this worker.
+
+    Admin-only endpoint. Per engine: checkouts, checkout wait time
+    (total, max, histogram), timeouts, connections in use, idle
+    connections and current overflow.
+    """
+    return pool_stats()
+
+
+@router.get("/db-replicas")
+def get_db_replica_status(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Read replica health as seen by this worker.
+
+    Admin-only endpoint. Lists each replica's last measured lag and
+    whether it is currently used for read-only routes.
+    """
+    return replicas.status()
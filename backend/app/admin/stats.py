@@ -0,0 +1,338 @@
+"""
+Platform statistics for the admin dashboard and health checks.
+
+All counts come from one aggregate statement: one single-row subquery per
+table computing every counter for it with COUNT(*) FILTER (WHERE ...),
+explicitly cross-joined into a single row. Each table is scanned once per
+call.
+
+STATS_COUNTERS_MODE additionally materializes the counts in the
+stat_counters table so reads cost O(1) whatever the table sizes:
+
+    off          every read runs the aggregate statement
+    incremental  Session after_flush events apply +/- deltas in the
+                 writing transaction; a periodic refresh repairs drift
+                 from writes that bypass the ORM (bulk updates, raw SQL)
+    scheduled    counters are only recomputed every
+                 STATS_REFRESH_INTERVAL seconds, so reads may be that stale
+
+Every counter is stored as STATS_COUNTER_SHARDS rows and read as their
+sum. Each writing transaction adds its deltas to one randomly chosen shard,
+so concurrent writers rarely wait on each other's row locks, which they
+hold until commit.
+
+A refresh locks every shard row, so no delta can commit meanwhile, then
+aggregates and adds the drift (aggregate minus the shard sum) to shard 0.
+Deltas committed before it are part of both numbers and are kept. On
+Postgres only one worker refreshes at a time (advisory lock), and the
+refresh gives up quickly instead of queueing behind, or deadlocking with,
+a writer; it runs again on the next interval.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional
+from collections import Counter
+import logging
+import random
+import threading
+
+from sqlalchemy import and_, bindparam, event, false, func, inspect, select, text, true, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import (
+    User, Company, Job, Application, Profile, StatCounter,
+    UserRole, JobStatus, ApplicationStatus,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class CounterDef(NamedTuple):
+    name: str
+    model: Any
+    # Column equality conditions; empty counts every row
+    where: Dict[str, Any]
+
+
+COUNTERS: List[CounterDef] = [
+    CounterDef("users_total", User, {}),
+    CounterDef("users_active", User, {"is_active": True}),
+    CounterDef("users_admins", User, {"role": UserRole.admin}),
+    CounterDef("users_employers", User, {"role": UserRole.employer}),
+    CounterDef("users_seekers", User, {"role": UserRole.seeker}),
+    CounterDef("users_pending_employers", User, {"role": UserRole.employer, "is_active": False}),
+    CounterDef("profiles_total", Profile, {}),
+    CounterDef("companies_total", Company, {}),
+    CounterDef("jobs_total", Job, {}),
+    CounterDef("jobs_open", Job, {"status": JobStatus.open}),
+    CounterDef("applications_total", Application, {}),
+    CounterDef("applications_pending", Application, {"status": ApplicationStatus.applied}),
+]
+
+# Advisory lock held by the worker refreshing stat_counters
+STATS_REFRESH_LOCK_KEY = 0x5747A75
+
+REFRESH_LOCK_TIMEOUT_MS = 500
+
+_COUNTERS_BY_MODEL: Dict[Any, List[CounterDef]] = {}
+for _counter in COUNTERS:
+    _COUNTERS_BY_MODEL.setdefault(_counter.model, []).append(_counter)
+
+
+# --------------------------------------------------
+# Aggregate query
+# --------------------------------------------------
+def aggregate_counts(db: Session) -> Dict[str, int]:
+    """Every counter, computed from the base tables in one statement."""
+    per_table = []
+    for model, counters in _COUNTERS_BY_MODEL.items():
+        columns = []
+        for counter in counters:
+            count = func.count()
+            if counter.where:
+                count = count.filter(
+                    and_(*(getattr(model, column) == value for column, value in counter.where.items()))
+                )
+            columns.append(count.label(counter.name))
+        per_table.append(select(*columns).select_from(model).subquery())
+
+    # Single-row subqueries: an explicit ON TRUE join instead of an
+    # implicit cartesian FROM list
+    joined = per_table[0]
+    for subquery in per_table[1:]:
+        joined = joined.join(subquery, true())
+    stmt = select(*(column for subquery in per_table for column in subquery.c)).select_from(joined)
+    row = db.execute(stmt).one()
+    return {name: int(value) for name, value in row._mapping.items()}
+
+
+# --------------------------------------------------
+# Materialized counters
+# --------------------------------------------------
+def read_counters(db: Session) -> Optional[Dict[str, int]]:
+    """Counters from stat_counters, or None if any is missing."""
+    values = dict(
+        db.query(StatCounter.name, func.sum(StatCounter.value)).group_by(StatCounter.name)
+    )
+    if any(counter.name not in values for counter in COUNTERS):
+        return None
+    return {counter.name: int(values[counter.name]) for counter in COUNTERS}
+
+
+def _lock_counters(db: Session) -> bool:
+    """
+    Lock stat_counters against deltas for the rest of the transaction.
+
+    Returns:
+        False if another worker is already refreshing
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        if not db.scalar(select(func.pg_try_advisory_xact_lock(STATS_REFRESH_LOCK_KEY))):
+            return False
+        # Shorter than deadlock_timeout, so a writer never loses to the refresh
+        db.execute(text(f"SET LOCAL lock_timeout = '{REFRESH_LOCK_TIMEOUT_MS}ms'"))
+        db.execute(
+            select(StatCounter.name, StatCounter.shard)
+            .order_by(StatCounter.name, StatCounter.shard)
+            .with_for_update()
+        ).all()
+    else:
+        # SQLite: the first write takes the database write lock
+        db.execute(update(StatCounter).where(false()).values(value=StatCounter.value))
+    return True
+
+
+def refresh_counters(db: Session) -> Optional[Dict[str, int]]:
+    """
+    Repair stat_counters from the base tables and commit.
+
+    Returns:
+        The aggregated counts, or None if another worker is refreshing
+    """
+    if not _lock_counters(db):
+        db.rollback()
+        return None
+    counts = aggregate_counts(db)
+    shards = {
+        (name, shard): value
+        for name, shard, value in db.query(StatCounter.name, StatCounter.shard, StatCounter.value)
+    }
+    for name, value in counts.items():
+        drift = value - sum(v for (counter, _), v in shards.items() if counter == name)
+        if (name, 0) not in shards:
+            db.add(StatCounter(name=name, shard=0, value=drift))
+        elif drift:
+            db.query(StatCounter).filter(StatCounter.name == name, StatCounter.shard == 0).update(
+                {StatCounter.value: StatCounter.value + drift}, synchronize_session=False
+            )
+        for shard in range(1, settings.STATS_COUNTER_SHARDS):
+            if (name, shard) not in shards:
+                db.add(StatCounter(name=name, shard=shard, value=0))
+    db.commit()
+    return counts
+
+
+def get_counts(db: Session) -> Dict[str, int]:
+    """Counters from the materialized table when enabled, else aggregated."""
+    if settings.STATS_COUNTERS_MODE != "off":
+        counts = read_counters(db)
+        if counts is not None:
+            return counts
+    return aggregate_counts(db)
+
+
+def platform_stats(db: Session) -> Dict[str, Any]:
+    """Dashboard payload served by GET /admin/stats."""
+    counts = get_counts(db)
+    return {
+        "users": {
+            "total": counts["users_total"],
+            "active": counts["users_active"],
+            "employers": counts["users_employers"],
+            "seekers": counts["users_seekers"],
+            "pending_employers": counts["users_pending_employers"],
+        },
+        "companies": {
+            "total": counts["companies_total"],
+        },
+        "jobs": {
+            "total": counts["jobs_total"],
+            "open": counts["jobs_open"],
+        },
+        "applications": {
+            "total": counts["applications_total"],
+            "pending": counts["applications_pending"],
+        },
+    }
+
+
+# --------------------------------------------------
+# Incremental updates (STATS_COUNTERS_MODE=incremental)
+# --------------------------------------------------
+def _matches(values: Dict[str, Any], where: Dict[str, Any]) -> bool:
+    return all(values.get(column) == value for column, value in where.items())
+
+
+def _row_values(obj: Any, columns, old: bool) -> Dict[str, Any]:
+    """Current attribute values, or their pre-flush values when old=True."""
+    state = inspect(obj)
+    values = {}
+    for column in columns:
+        value = getattr(obj, column)
+        if old:
+            history = state.attrs[column].history
+            if history.deleted:
+                value = history.deleted[0]
+        values[column] = value
+    return values
+
+
+_INCREMENT = (
+    update(StatCounter)
+    .where(StatCounter.name == bindparam("counter_name"))
+    .where(StatCounter.shard == bindparam("counter_shard"))
+    .values(value=StatCounter.value + bindparam("delta"))
+)
+
+
+# session.info key: (transaction, shard) its counter deltas go to
+_SHARD_KEY = "stat_counter_shard"
+
+
+def _track_old_values() -> None:
+    """
+    Make the ORM load a counted column's old value before it is
+    overwritten, so expired objects still report what they changed from.
+    """
+    columns = {
+        (counter.model, column) for counter in COUNTERS for column in counter.where
+    }
+    for model, column in columns:
+        event.listen(getattr(model, column), "set", lambda *args: None, active_history=True)
+
+
+if settings.STATS_COUNTERS_MODE == "incremental":
+    _track_old_values()
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_counter_deltas(session: Session, flush_context) -> None:
+    if settings.STATS_COUNTERS_MODE != "incremental":
+        return
+
+    deltas: Counter = Counter()
+    for obj in session.new:
+        for counter in _COUNTERS_BY_MODEL.get(type(obj), ()):
+            if _matches(_row_values(obj, counter.where, old=False), counter.where):
+                deltas[counter.name] += 1
+    for obj in session.deleted:
+        for counter in _COUNTERS_BY_MODEL.get(type(obj), ()):
+            if _matches(_row_values(obj, counter.where, old=True), counter.where):
+                deltas[counter.name] -= 1
+    for obj in session.dirty:
+        for counter in _COUNTERS_BY_MODEL.get(type(obj), ()):
+            if not counter.where:
+                continue
+            before = _matches(_row_values(obj, counter.where, old=True), counter.where)
+            after = _matches(_row_values(obj, counter.where, old=False), counter.where)
+            if before != after:
+                deltas[counter.name] += 1 if after else -1
+
+    # One shard per transaction, in a fixed row order, so two writers can
+    # never lock the same rows in opposite orders
+    transaction = session.get_transaction()
+    pinned = session.info.get(_SHARD_KEY)
+    if pinned is None or pinned[0] is not transaction:
+        pinned = session.info[_SHARD_KEY] = (transaction, random.randrange(settings.STATS_COUNTER_SHARDS))
+    shard = pinned[1]
+    changes = [
+        {"counter_name": name, "counter_shard": shard, "delta": delta}
+        for name, delta in sorted(deltas.items()) if delta
+    ]
+    if changes:
+        # Same transaction as the write, so counters commit or roll back with it
+        session.connection().execute(_INCREMENT, changes)
+
+
+# --------------------------------------------------
+# Periodic refresh
+# --------------------------------------------------
+_refresh_stop = threading.Event()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def _refresh_once() -> None:
+    db = SessionLocal()
+    try:
+        refresh_counters(db)
+    except Exception:
+        db.rollback()
+        logger.exception("Stat counter refresh failed")
+    finally:
+        db.close()
+
+
+def _refresh_loop() -> None:
+    while not _refresh_stop.wait(settings.STATS_REFRESH_INTERVAL):
+        _refresh_once()
+
+
+def start_stats_refresher() -> None:
+    """Fill stat_counters now and refresh them periodically in a daemon thread."""
+    global _refresh_thread
+    if settings.STATS_COUNTERS_MODE == "off":
+        return
+    if _refresh_thread and _refresh_thread.is_alive():
+        return
+    _refresh_once()
+    _refresh_stop.clear()
+    _refresh_thread = threading.Thread(target=_refresh_loop, name="stats-refresh", daemon=True)
+    _refresh_thread.start()
+
+
+def stop_stats_refresher() -> None:
+    global _refresh_thread
+    _refresh_stop.set()
+    if _refresh_thread:
+        _refresh_thread.join(timeout=5)
+        _refresh_thread = None
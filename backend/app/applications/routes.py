@@ -1,13 +1,19 @@
-from fastapi import APIRouter, Depends, status, Request
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Query, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Query as ORMQuery, Session
+from typing import List, Optional, Union
 
-from app.database import get_db
-from app.models import Job, Application, User, UserRole
+from app.database import get_db, get_read_db
+from app.errors import APIError
+from app.models import Job, Application, Company, Profile, ResumeBlob, User, UserRole, ApplicationStatus
 from app.applications.schemas import (
     ApplicationCreate,
     ApplicationResponse,
+    ApplicationPage,
+    ApplicationWithDetailsResponse,
+    ApplicationWithDetailsPage,
 )
+from app.auth.dependencies import get_current_user
 from app.auth.permissions import require_roles
 from app.middleware.rate_limiter import limiter
 from app.middleware.rate_limits import (
@@ -15,6 +21,10 @@ from app.middleware.rate_limits import (
     PUBLIC_READ_LIMIT,
 )
 from app.cache import invalidate_cache
+from app.pagination import order_newest_first, paginate_keyset
+from app.serialization import json_response, row_dicts
+from app.storage.downloads import resume_response
+from app.storage.file_handler import file_handler
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
@@ -56,19 +66,182 @@ def apply_to_job(
     db.commit()
     db.refresh(new_application)
 
-    invalidate_cache("applications")
+    invalidate_cache("applications", f"job:{new_application.job_id}")
     return new_application
 
 
 # --------------------------------------------------
 # List applications (RATE LIMITED)
 # --------------------------------------------------
-@router.get("", response_model=List[ApplicationResponse])
+@router.get("", response_model=Union[List[ApplicationResponse], ApplicationPage])
 @limiter.limit(PUBLIC_READ_LIMIT)
 def list_applications(
     request: Request,  # ✅ REQUIRED for SlowAPI
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor; pass an empty value for the first page",
+    ),
     db: Session = Depends(get_db),
 ):
-    return db.query(Application).offset(skip).limit(limit).all()
+    """
+    List applications, most recent first.
+
+    Without `cursor` this returns a plain list paged by skip/limit. With
+    `cursor` it returns `{items, next_cursor}`.
+    """
+    query = db.query(Application)
+
+    if cursor is not None:
+        items, next_cursor = paginate_keyset(
+            query, Application.applied_at, Application.id, cursor, limit
+        )
+        return ApplicationPage(items=items, next_cursor=next_cursor)
+
+    return (
+        order_newest_first(query, Application.applied_at, Application.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+# --------------------------------------------------
+# Applications with job / company / applicant details
+# --------------------------------------------------
+def application_details_query(db: Session) -> ORMQuery:
+    """
+    ApplicationWithDetailsResponse rows from one joined query.
+
+    Only the projected columns are selected, so building the response
+    never lazy-loads a job, company, user or profile per row.
+    """
+    return (
+        db.query(
+            Application.id,
+            Application.job_id,
+            Job.title.label("job_title"),
+            Company.name.label("company_name"),
+            Application.user_id,
+            func.coalesce(Profile.full_name, User.email).label("applicant_name"),
+            User.email.label("applicant_email"),
+            Application.resume_file_url,
+            Application.cover_letter,
+            Application.status,
+            Application.applied_at,
+        )
+        .join(Job, Job.id == Application.job_id)
+        .join(Company, Company.id == Job.company_id)
+        .join(User, User.id == Application.user_id)
+        .outerjoin(Profile, Profile.user_id == Application.user_id)
+    )
+
+
+def _details_page(query: ORMQuery, skip: int, limit: int, cursor: Optional[str]):
+    if cursor is not None:
+        items, next_cursor = paginate_keyset(
+            query, Application.applied_at, Application.id, cursor, limit
+        )
+        return json_response(
+            ApplicationWithDetailsPage, {"items": row_dicts(items), "next_cursor": next_cursor}
+        )
+
+    rows = (
+        order_newest_first(query, Application.applied_at, Application.id)
+        .offset(skip)
+        .limit(limit)
+    )
+    return json_response(List[ApplicationWithDetailsResponse], row_dicts(rows))
+
+
+@router.get(
+    "/my-applications",
+    response_model=Union[List[ApplicationWithDetailsResponse], ApplicationWithDetailsPage],
+)
+@limiter.limit(PUBLIC_READ_LIMIT)
+def my_applications(
+    request: Request,  # ✅ REQUIRED for SlowAPI
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(require_roles([UserRole.seeker])),
+    db: Session = Depends(get_read_db),
+):
+    """The current seeker's applications, most recent first."""
+    query = application_details_query(db).filter(Application.user_id == current_user.id)
+    return _details_page(query, skip, limit, cursor)
+
+
+@router.get(
+    "/employer/applications",
+    response_model=Union[List[ApplicationWithDetailsResponse], ApplicationWithDetailsPage],
+)
+@limiter.limit(PUBLIC_READ_LIMIT)
+def employer_applications(
+    request: Request,  # ✅ REQUIRED for SlowAPI
+    job_id: Optional[int] = None,
+    application_status: Optional[ApplicationStatus] = Query(None, alias="status"),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(None),
+    current_user: User = Depends(require_roles([UserRole.admin, UserRole.employer])),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Applications to jobs of the current employer's companies (all
+    companies for admins), most recent first.
+    """
+    query = application_details_query(db)
+    if current_user.role != UserRole.admin:
+        query = query.filter(Company.owner_id == current_user.id)
+    if job_id is not None:
+        query = query.filter(Application.job_id == job_id)
+    if application_status is not None:
+        query = query.filter(Application.status == application_status)
+    return _details_page(query, skip, limit, cursor)
+
+
+# --------------------------------------------------
+# Resume download
+# --------------------------------------------------
+@router.get("/{application_id}/resume", response_class=Response)
+@limiter.limit(PUBLIC_READ_LIMIT)
+def download_resume(
+    request: Request,  # ✅ REQUIRED for SlowAPI
+    application_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """
+    The application's resume, for the applicant, the employer owning the
+    job's company and admins. Supports Range requests and ETag revalidation.
+    """
+    application = (
+        db.query(Application.user_id, Application.resume_file_url, Company.owner_id)
+        .join(Job, Job.id == Application.job_id)
+        .join(Company, Company.id == Job.company_id)
+        .filter(Application.id == application_id)
+        .first()
+    )
+    if not application:
+        raise APIError(
+            code="APPLICATION_NOT_FOUND",
+            message="Application not found",
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+
+    if current_user.role != UserRole.admin and current_user.id not in (
+        application.user_id, application.owner_id
+    ):
+        raise APIError(
+            code="FORBIDDEN",
+            message="Not authorized to view this resume",
+            status_code=status.HTTP_403_FORBIDDEN,
+        )
+
+    content_type = None
+    sha256 = file_handler.blob_hash(application.resume_file_url)
+    if sha256 is not None:
+        content_type = db.query(ResumeBlob.content_type).filter(ResumeBlob.sha256 == sha256).scalar()
+    return resume_response(request, application.resume_file_url, content_type)
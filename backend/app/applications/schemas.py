@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from app.models import ApplicationStatus
+from app.pagination import CursorPage
 
 
 class ApplicationCreate(BaseModel):
@@ -25,6 +26,10 @@ class ApplicationResponse(BaseModel):
         from_attributes = True
 
 
+class ApplicationPage(CursorPage[ApplicationResponse]):
+    pass
+
+
 class ApplicationWithDetailsResponse(BaseModel):
     id: int
     job_id: int
@@ -40,3 +45,7 @@ class ApplicationWithDetailsResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ApplicationWithDetailsPage(CursorPage[ApplicationWithDetailsResponse]):
+    pass
@@ -1,38 +1,45 @@
 from fastapi import Depends, Cookie, status, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import Optional, Dict, Any, Union
+from typing import Dict, Optional, Union
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_async_db
 from app.models import User, UserRole
 from app.errors import APIError
 from app.auth.jwt import decode_token
-from app.cache import cache
+from app.cache import cache, invalidate_cache
+from app.cache_sync import cache_sync_healthy
+from app.metrics import CACHE_LOOKUPS
 
 security = HTTPBearer(auto_error=False)
 
+_user_cache_hits = CACHE_LOOKUPS.labels("user", "hit")
+_user_cache_misses = CACHE_LOOKUPS.labels("user", "miss")
+
 # --------------------------------------------------
 # Cached user representation
 # --------------------------------------------------
 class CachedUser:
-    def __init__(self, data: Dict[str, Any]):
-        self.id = data["id"]
-        self.email = data["email"]
-        self.role = UserRole(data["role"])
-        self.is_active = data["is_active"]
-
+    """
+    The authenticated principal: the User fields authorization needs.
 
-def _serialize_user_for_cache(user: User) -> Dict[str, Any]:
-    return {
-        "id": user.id,
-        "email": user.email,
-        "role": user.role.value,
-        "is_active": user.is_active,
-    }
+    Stored as is under user:{id} (the L1 cache keeps the object, the
+    shared L2 pickles it), so a cache hit builds nothing per request.
+    """
+    __slots__ = ("id", "email", "role", "is_active")
 
+    def __init__(self, id: int, email: str, role: UserRole, is_active: bool):
+        self.id = id
+        self.email = email
+        self.role = role
+        self.is_active = is_active
 
-def _reconstruct_user_from_cache(data: Dict[str, Any]) -> CachedUser:
-    return CachedUser(data)
+    @classmethod
+    def from_user(cls, user: User) -> "CachedUser":
+        return cls(user.id, user.email, UserRole(user.role), user.is_active)
 
 # --------------------------------------------------
 # Token extraction
@@ -71,12 +78,17 @@ def _decode_and_validate_token(token: Optional[str]) -> int:
 # --------------------------------------------------
 # User retrieval
 # --------------------------------------------------
-def _get_user_by_id(user_id: int, db: Session) -> Union[User, CachedUser]:
+def _get_cached_user(user_id: int) -> Optional[CachedUser]:
     cached = cache.get(f"user:{user_id}")
-    if cached:
-        return _reconstruct_user_from_cache(cached)
+    # Entries in another format (e.g. written by an older release) are misses
+    if isinstance(cached, CachedUser):
+        _user_cache_hits.inc()
+        return cached
+    _user_cache_misses.inc()
+    return None
 
-    user = db.query(User).filter(User.id == user_id).first()
+
+def _remember_user(user_id: int, user: Optional[User], generations: Optional[Dict[str, int]]) -> User:
     if not user:
         raise APIError(
             code="USER_NOT_FOUND",
@@ -84,10 +96,83 @@ def _get_user_by_id(user_id: int, db: Session) -> Union[User, CachedUser]:
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
 
-    cache.set(f"user:{user_id}", _serialize_user_for_cache(user), ttl_seconds=300)
+    # The long TTL is only safe while other workers' evictions reach us
+    ttl_seconds = (
+        settings.AUTH_USER_CACHE_TTL if cache_sync_healthy()
+        else settings.AUTH_USER_CACHE_FALLBACK_TTL
+    )
+    cache.set(
+        f"user:{user_id}",
+        CachedUser.from_user(user),
+        ttl_seconds=ttl_seconds,
+        tags=[f"user:{user_id}"],
+        generations=generations,
+    )
     return user
 
 
+def _get_user_by_id(user_id: int, db: Session) -> Union[User, CachedUser]:
+    cached = _get_cached_user(user_id)
+    if cached:
+        return cached
+
+    # Snapshot before loading: an eviction racing the query makes the
+    # shared entry stale instead of caching the old principal for hours
+    generations = cache.tag_generations([f"user:{user_id}"])
+    user = db.query(User).filter(User.id == user_id).first()
+    return _remember_user(user_id, user, generations)
+
+
+async def _get_user_by_id_async(user_id: int, db: AsyncSession) -> Union[User, CachedUser]:
+    cached = _get_cached_user(user_id)
+    if cached:
+        return cached
+
+    generations = cache.tag_generations([f"user:{user_id}"])
+    user = await db.get(User, user_id)
+    return _remember_user(user_id, user, generations)
+
+
+# --------------------------------------------------
+# Cache invalidation from the ORM
+# --------------------------------------------------
+# Principals are cached for AUTH_USER_CACHE_TTL (hours) while cache sync is
+# healthy, so every ORM write changing a principal field, or deleting a
+# user, evicts user:{id} in all workers once it commits. Bulk UPDATE/DELETE statements bypass these
+# events and must call invalidate_cache(f"user:{id}") themselves.
+_PENDING_KEY = "user_principal_pending"
+PRINCIPAL_FIELDS = ("email", "role", "is_active")
+
+
+def _principal_changed(user: User) -> bool:
+    attrs = inspect(user).attrs
+    return any(attrs[field].history.has_changes() for field in PRINCIPAL_FIELDS)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session: Session, flush_context) -> None:
+    changed = [
+        obj.id for obj in session.dirty
+        if isinstance(obj, User) and _principal_changed(obj)
+    ]
+    changed += [obj.id for obj in session.deleted if isinstance(obj, User)]
+    if changed:
+        session.info.setdefault(_PENDING_KEY, set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_changed_users(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    invalidate_cache(*(f"user:{user_id}" for user_id in pending))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
 def _check_user_active(user: Union[User, CachedUser]) -> None:
     if not user.is_active:
         raise APIError(
@@ -111,6 +196,20 @@ def get_current_user(
 
     request.state.user = user
     return user
+
+
+async def get_current_user_async(
+    request: Request,
+    token: Optional[str] = Depends(get_token_from_request),
+    db: AsyncSession = Depends(get_async_db),
+) -> Union[User, CachedUser]:
+    """get_current_user on the async engine (DATABASE_MODE=async)."""
+    user_id = _decode_and_validate_token(token)
+    user = await _get_user_by_id_async(user_id, db)
+    _check_user_active(user)
+
+    request.state.user = user
+    return user
 # --------------------------------------------------
 # ROLE HELPERS
 # --------------------------------------------------
@@ -0,0 +1,19 @@
+"""
+Bcrypt hashing primitives.
+
+Kept free of app imports (settings, database, FastAPI) so the password
+hashing worker processes (app.auth.password_pool) start quickly.
+"""
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a hashed password."""
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """Generate a bcrypt hash for a password."""
+    return pwd_context.hash(password)
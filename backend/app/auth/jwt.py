@@ -1,8 +1,15 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from typing import Optional
+import hashlib
+import threading
+import time
+
 from jose import jwt, JWTError
 from fastapi import status
 from app.config import settings
 from app.errors import APIError
+from app.metrics import CACHE_LOOKUPS
 
 
 def create_token(
@@ -27,7 +34,69 @@ def create_token(
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+# --------------------------------------------------
+# Verified token cache
+# --------------------------------------------------
+class VerifiedTokenCache:
+    """
+    Bounded LRU of verified access token payloads, so a client's repeated
+    requests with the same token skip the signature check and JSON parse.
+
+    Keyed by the SHA-256 of the token (tokens themselves are not kept);
+    an entry is only served until the token's exp.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = CACHE_LOOKUPS.labels("token", "hit")
+        self._misses = CACHE_LOOKUPS.labels("token", "miss")
+
+    @staticmethod
+    def key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, key: bytes) -> Optional[dict]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None and payload["exp"] <= time.time():
+                del self._entries[key]
+                payload = None
+            if payload is None:
+                self._misses.inc()
+                return None
+            self._entries.move_to_end(key)
+        self._hits.inc()
+        return payload
+
+    def set(self, key: bytes, payload: dict) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = payload
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache(settings.AUTH_TOKEN_CACHE_SIZE)
+
+
 def decode_token(token: str, expected_type: str) -> dict:
+    """
+    Verified payload of a token of the expected type (do not mutate it:
+    access token payloads are shared through verified_tokens).
+    """
+    cache_key = VerifiedTokenCache.key(token) if expected_type == "access" else None
+    payload = verified_tokens.get(cache_key) if cache_key else None
+    if payload is not None:
+        return payload
+
     try:
         payload = jwt.decode(
             token,
@@ -48,4 +117,6 @@ def decode_token(token: str, expected_type: str) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
         )
 
+    if cache_key and "exp" in payload:
+        verified_tokens.set(cache_key, payload)
     return payload
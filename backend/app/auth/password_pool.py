@@ -0,0 +1,111 @@
+"""
+Bcrypt off the request path.
+
+A bcrypt hash or verification is tens of milliseconds of CPU. Login and
+registration run it in a process pool of PASSWORD_HASH_WORKERS spawned
+workers, so it neither holds this process's GIL nor slows the other
+requests it serves; the request thread only waits.
+
+The pool is bounded: at most PASSWORD_HASH_MAX_PENDING calls per app
+process may be queued or running. Calls beyond that are shed at once with
+a 503 (AUTH_BUSY) instead of queueing for ever longer, which keeps the
+latency of admitted logins flat under a burst. PASSWORD_HASH_WORKERS = 0
+hashes inline in the calling thread.
+"""
+from typing import Any, Callable, Optional, TypeVar
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import status
+
+from app.auth import hashing
+from app.config import settings
+from app.errors import APIError
+from app.metrics import PASSWORD_HASH_PENDING, PASSWORD_HASH_REJECTIONS
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_lock = threading.Lock()
+_pending = 0
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _run(func: Callable[..., T], *args: Any) -> T:
+    global _pending, _pool
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return func(*args)
+
+    with _lock:
+        if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+            PASSWORD_HASH_REJECTIONS.inc()
+            raise APIError(
+                code="AUTH_BUSY",
+                message="Too many sign-in requests, please retry shortly",
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        _pending += 1
+        pool = _get_pool()
+    PASSWORD_HASH_PENDING.inc()
+
+    try:
+        return pool.submit(func, *args).result()
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool for the next call
+        logger.error("Password hashing pool broken, restarting it")
+        with _lock:
+            if _pool is pool:
+                _pool = None
+        raise
+    finally:
+        with _lock:
+            _pending -= 1
+        PASSWORD_HASH_PENDING.dec()
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """app.auth.security.verify_password in the pool (blocks the calling thread)."""
+    return _run(hashing.verify_password, plain_password, hashed_password)
+
+
+def get_password_hash(password: str) -> str:
+    """app.auth.security.get_password_hash in the pool (blocks the calling thread)."""
+    return _run(hashing.get_password_hash, password)
+
+
+def _warmup_done(future: Future) -> None:
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Password hashing pool warmup failed", exc_info=future.exception())
+
+
+def start_password_pool() -> None:
+    """Start spawning the workers now rather than on the first login; does not wait."""
+    if settings.PASSWORD_HASH_WORKERS > 0:
+        with _lock:
+            pool = _get_pool()
+        # Workers are spawned on demand; one submitted call per worker starts
+        # them all in the background while startup carries on
+        for _ in range(settings.PASSWORD_HASH_WORKERS):
+            pool.submit(int).add_done_callback(_warmup_done)
+
+
+def stop_password_pool() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
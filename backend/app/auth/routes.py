@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, status, Request, Response, Cookie
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import timedelta, datetime
 
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.models import User, Profile, UserRole, RefreshToken
 from app.errors import APIError
 from app.auth.schemas import (
@@ -11,14 +13,10 @@ from app.auth.schemas import (
     TokenResponse,
     UserResponse,
 )
-from app.auth.security import (
-    verify_password,
-    get_password_hash,
-    set_auth_cookie,
-    clear_auth_cookie,
-)
+from app.auth.security import set_auth_cookie, clear_auth_cookie
+from app.auth.password_pool import verify_password, get_password_hash
 from app.auth.jwt import create_token, decode_token
-from app.auth.dependencies import get_current_user
+from app.auth.dependencies import get_current_user, get_current_user_async
 from app.auth.token_util import hash_token
 from app.middleware.rate_limiter import limiter
 from app.middleware.rate_limits import (
@@ -238,7 +236,6 @@ def logout(
 # --------------------------------------------------
 # Current user
 # --------------------------------------------------
-@router.get("/me", response_model=UserResponse)
 @limiter.limit("30/minute")
 def me(
     request: Request,                 # ✅ MUST be first
@@ -257,3 +254,31 @@ def me(
         full_name=profile.full_name if profile else None,
     )
 
+
+@limiter.limit("30/minute")
+async def me_async(
+    request: Request,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """/auth/me on the async engine (DATABASE_MODE=async)."""
+    profile = await db.scalar(
+        select(Profile).where(Profile.user_id == current_user.id)
+    )
+
+    return UserResponse(
+        id=current_user.id,
+        email=current_user.email,
+        role=current_user.role,
+        is_active=current_user.is_active,
+        full_name=profile.full_name if profile else None,
+    )
+
+
+router.add_api_route(
+    "/me",
+    me_async if settings.use_async_db else me,
+    methods=["GET"],
+    response_model=UserResponse,
+)
+
@@ -1,21 +1,11 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Response
 from app.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
-
-
-def get_password_hash(password: str) -> str:
-    """Generate a bcrypt hash for a password."""
-    return pwd_context.hash(password)
+# Inline bcrypt, for scripts; request handlers use app.auth.password_pool
+from app.auth.hashing import pwd_context, verify_password, get_password_hash  # noqa: F401
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -1,125 +1,459 @@
 """
-Simple in-memory cache for frequently accessed data.
-Uses TTL (time-to-live) to automatically expire cached entries.
+In-memory cache for frequently accessed data.
+
+Entries expire after a TTL and the store is bounded by entry count and an
+approximate byte budget; the least recently used entries are evicted first.
+Entries can be registered under tags (e.g. "jobs", "company:42", "user:7")
+so that a whole group can be invalidated without scanning the key space.
+
+The in-process LRUCache is always the first level. When CACHE_REDIS_URL is
+set, a shared Redis-protocol store is layered behind it as the second
+level (see app.cache_redis).
 """
-from typing import Any, Optional, Callable
-from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
+import asyncio
 import hashlib
 import json
+import logging
+import threading
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.cache_local import ALL_TAGS, CacheBackend, LRUCache
+from app.cache_redis import RedisCache, TieredCache
+from app.config import settings
+from app.metrics import CACHE_LOOKUPS
+
+logger = logging.getLogger(__name__)
+
 
+# Backwards-compatible name
+SimpleCache = LRUCache
 
-class SimpleCache:
-    """Thread-safe in-memory cache with TTL support."""
-
-    def __init__(self):
-        self._cache = {}
-        self._expiry = {}
-
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache if not expired."""
-        if key in self._cache:
-            if key in self._expiry and datetime.utcnow() < self._expiry[key]:
-                return self._cache[key]
-            else:
-                # Expired, remove from cache
-                self._cache.pop(key, None)
-                self._expiry.pop(key, None)
-        return None
-
-    def set(self, key: str, value: Any, ttl_seconds: int = 300):
-        """Set value in cache with TTL."""
-        self._cache[key] = value
-        self._expiry[key] = datetime.utcnow() + timedelta(seconds=ttl_seconds)
-
-    def delete(self, key: str):
-        """Delete specific key from cache."""
-        self._cache.pop(key, None)
-        self._expiry.pop(key, None)
-
-    def clear(self):
-        """Clear entire cache."""
-        self._cache.clear()
-        self._expiry.clear()
-
-    def cleanup_expired(self):
-        """Remove all expired entries."""
-        now = datetime.utcnow()
-        expired_keys = [
-            key for key, expiry in self._expiry.items()
-            if now >= expiry
-        ]
-        for key in expired_keys:
-            self._cache.pop(key, None)
-            self._expiry.pop(key, None)
+
+def build_cache() -> CacheBackend:
+    """Create the process cache from settings (L1 only, or L1 + Redis L2)."""
+    local = LRUCache(
+        max_entries=settings.CACHE_MAX_ENTRIES,
+        max_bytes=settings.CACHE_MAX_BYTES,
+        sweep_interval=settings.CACHE_SWEEP_INTERVAL,
+    )
+    if not settings.CACHE_REDIS_URL:
+        return local
+
+    return TieredCache(local, RedisCache.from_url(settings.CACHE_REDIS_URL))
 
 
 # Global cache instance
-cache = SimpleCache()
+cache = build_cache()
+
+
+def _key_part(value: Any) -> Any:
+    # Request-scoped sessions must not make every call's key unique
+    if isinstance(value, (Session, AsyncSession)):
+        return "<session>"
+    return value
+
+
+def _has_session(args: tuple, kwargs: dict) -> bool:
+    return any(isinstance(value, (Session, AsyncSession)) for value in (*args, *kwargs.values()))
+
+
+def _swap_sessions(args: tuple, kwargs: dict, session: Any) -> Tuple[tuple, dict]:
+    """The call's arguments with every db session replaced by session."""
+    def swap(value):
+        return session if isinstance(value, (Session, AsyncSession)) else value
+    return tuple(swap(arg) for arg in args), {name: swap(value) for name, value in kwargs.items()}
 
 
 def cache_key(*args, **kwargs) -> str:
     """Generate cache key from function arguments."""
     key_data = {
-        'args': args,
-        'kwargs': kwargs
+        'args': [_key_part(arg) for arg in args],
+        'kwargs': {name: _key_part(value) for name, value in kwargs.items()}
     }
     key_str = json.dumps(key_data, sort_keys=True, default=str)
     return hashlib.md5(key_str.encode()).hexdigest()
 
 
-def cached(ttl_seconds: int = 300, key_prefix: str = ""):
+TagSpec = Union[Iterable[str], Callable[..., Iterable[str]], None]
+
+
+def _resolve_tags(tags: TagSpec, args: tuple, kwargs: dict) -> Iterable[str]:
+    if tags is None:
+        return ()
+    if callable(tags):
+        return tags(*args, **kwargs) or ()
+    return tags
+
+
+# --------------------------------------------------
+# Single-flight (request coalescing)
+# --------------------------------------------------
+# Followers give up waiting on a stuck leader and compute themselves
+SINGLE_FLIGHT_TIMEOUT = 30.0
+
+
+class _Stamped(NamedTuple):
+    """Cached value plus the wall clock time until which it is fresh."""
+    value: Any
+    fresh_until: float
+
+
+class _Flight:
+    """One in-progress computation that concurrent callers wait on."""
+
+    def __init__(self, event):
+        self.event = event
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+_flights: Dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+# Keyed by (event loop id, cache key); only touched from the loop thread
+_async_flights: Dict[Tuple[int, str], _Flight] = {}
+_async_refresh_tasks: Set["asyncio.Task"] = set()
+
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+
+def _single_flight(key: str, compute: Callable[[], Any]) -> Any:
+    """Run compute() once per key across threads; others share the result."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight(threading.Event())
+
+    if not leader:
+        if flight.event.wait(SINGLE_FLIGHT_TIMEOUT):
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+        return compute()
+
+    try:
+        flight.result = compute()
+        return flight.result
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.event.set()
+
+
+async def _single_flight_async(key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+    """Async counterpart of _single_flight for callers on one event loop."""
+    flight_key = (id(asyncio.get_running_loop()), key)
+    flight = _async_flights.get(flight_key)
+
+    if flight is not None:
+        try:
+            await asyncio.wait_for(flight.event.wait(), SINGLE_FLIGHT_TIMEOUT)
+        except asyncio.TimeoutError:
+            return await compute()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    flight = _async_flights[flight_key] = _Flight(asyncio.Event())
+    try:
+        flight.result = await compute()
+        return flight.result
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        _async_flights.pop(flight_key, None)
+        flight.event.set()
+
+
+def cached(
+    ttl_seconds: int = 300,
+    key_prefix: str = "",
+    tags: TagSpec = None,
+    stale_ttl_seconds: int = 0,
+    single_flight: bool = True,
+    session_factory: Optional[Callable[[], Any]] = None,
+):
     """
     Decorator to cache function results.
 
+    Works on both sync and async functions. On a miss only one caller per
+    key recomputes; concurrent callers wait for and share its result.
+
     Args:
         ttl_seconds: Time to live in seconds (default: 5 minutes)
-        key_prefix: Prefix for cache key to avoid collisions
+        key_prefix: Prefix for cache key to avoid collisions. Entries are
+            also tagged with it, so invalidate_cache(key_prefix) drops them.
+        tags: Extra tags for each result. Either a static iterable or a
+            callable receiving the decorated function's arguments.
+        stale_ttl_seconds: Extra window after ttl_seconds during which the
+            old value is served while one background refresh runs. The
+            refresh outlives the request, so it never reuses the call's
+            db session: it opens one from session_factory, and without a
+            factory a stale value taking a session is recomputed inline.
+        single_flight: Coalesce concurrent misses for the same key.
+        session_factory: Opens the session background refreshes use in
+            place of the call's (SessionLocal, or AsyncSessionLocal for
+            async functions).
 
     Example:
         @cached(ttl_seconds=60, key_prefix="companies")
         def get_all_companies(db: Session):
             return db.query(Company).all()
+
+        @cached(key_prefix="jobs", tags=lambda company_id, db: [f"company:{company_id}"])
+        def get_company_jobs(company_id: int, db: Session):
+            ...
     """
     def decorator(func: Callable):
+        func_name = f"{key_prefix}:{func.__name__}" if key_prefix else func.__name__
+        lookup_counters = {
+            result: CACHE_LOOKUPS.labels(key_prefix or func.__name__, result)
+            for result in ("hit", "stale", "miss")
+        }
+
+        def make_key(args, kwargs) -> str:
+            return f"{func_name}:{cache_key(*args, **kwargs)}"
+
+        def entry_tags(args, kwargs) -> Set[str]:
+            resolved = set(_resolve_tags(tags, args, kwargs))
+            if key_prefix:
+                resolved.add(key_prefix)
+            return resolved
+
+        def store(key, result, resolved_tags, generations) -> None:
+            if stale_ttl_seconds:
+                result = _Stamped(result, time.time() + ttl_seconds)
+            cache.set(
+                key, result, ttl_seconds + stale_ttl_seconds,
+                tags=resolved_tags, generations=generations,
+            )
+
+        def lookup(key):
+            """Return (value, is_stale) or (None, False) on a miss."""
+            cached_result = cache.get(key)
+            if isinstance(cached_result, _Stamped):
+                return cached_result.value, time.time() >= cached_result.fresh_until
+            return cached_result, False
+
+        def count_lookup(value, stale) -> None:
+            result = "miss" if value is None else "stale" if stale else "hit"
+            lookup_counters[result].inc()
+
+        def refreshable(stale, args, kwargs) -> bool:
+            """Whether a stale value can be served while refreshing later."""
+            return not stale or session_factory is not None or not _has_session(args, kwargs)
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = make_key(args, kwargs)
+
+                async def compute(call_args=args, call_kwargs=kwargs):
+                    # Another flight may have filled the cache meanwhile
+                    value, stale = lookup(key)
+                    if value is not None and not stale:
+                        return value
+                    # Snapshot before computing so a concurrent
+                    # invalidation makes the shared entry stale
+                    resolved = entry_tags(args, kwargs)
+                    generations = cache.tag_generations(resolved)
+                    result = await func(*call_args, **call_kwargs)
+                    store(key, result, resolved, generations)
+                    return result
+
+                async def refresh():
+                    if session_factory is None:
+                        return await compute()
+                    session = session_factory()
+                    try:
+                        return await compute(*_swap_sessions(args, kwargs, session))
+                    finally:
+                        await session.close()
+
+                value, stale = lookup(key)
+                count_lookup(value, stale)
+                if value is not None and refreshable(stale, args, kwargs):
+                    refresh_key = f"refresh:{key}"
+                    flight_key = (id(asyncio.get_running_loop()), refresh_key)
+                    if stale and flight_key not in _async_flights:
+                        task = asyncio.create_task(_refresh_quietly_async(refresh_key, refresh))
+                        # Keep a reference so the task is not garbage collected
+                        _async_refresh_tasks.add(task)
+                        task.add_done_callback(_async_refresh_tasks.discard)
+                    return value
+
+                if single_flight:
+                    return await _single_flight_async(key, compute)
+                return await compute()
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            # Generate cache key
-            func_name = f"{key_prefix}:{func.__name__}" if key_prefix else func.__name__
-            key = f"{func_name}:{cache_key(*args, **kwargs)}"
+            key = make_key(args, kwargs)
 
-            # Try to get from cache
-            cached_result = cache.get(key)
-            if cached_result is not None:
-                return cached_result
+            def compute(call_args=args, call_kwargs=kwargs):
+                # Another flight may have filled the cache meanwhile
+                value, stale = lookup(key)
+                if value is not None and not stale:
+                    return value
+                resolved = entry_tags(args, kwargs)
+                generations = cache.tag_generations(resolved)
+                result = func(*call_args, **call_kwargs)
+                store(key, result, resolved, generations)
+                return result
 
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            cache.set(key, result, ttl_seconds)
-            return result
+            def refresh():
+                # Runs on _refresh_executor after the request (and its
+                # session, which is not thread-safe) may be gone
+                if session_factory is None:
+                    return compute()
+                session = session_factory()
+                try:
+                    return compute(*_swap_sessions(args, kwargs, session))
+                finally:
+                    session.close()
+
+            value, stale = lookup(key)
+            count_lookup(value, stale)
+            if value is not None and refreshable(stale, args, kwargs):
+                if stale:
+                    refresh_key = f"refresh:{key}"
+                    with _flights_lock:
+                        refreshing = refresh_key in _flights
+                    if not refreshing:
+                        _refresh_executor.submit(_refresh_quietly, refresh_key, refresh)
+                return value
+
+            if single_flight:
+                return _single_flight(key, compute)
+            return compute()
 
         return wrapper
     return decorator
 
 
-def invalidate_cache(key_prefix: str = ""):
+def _refresh_quietly(key: str, compute: Callable[[], Any]) -> None:
+    try:
+        _single_flight(key, compute)
+    except Exception:
+        logger.exception("Background cache refresh failed")
+
+
+async def _refresh_quietly_async(key: str, compute: Callable[[], Awaitable[Any]]) -> None:
+    try:
+        await _single_flight_async(key, compute)
+    except Exception:
+        logger.exception("Background cache refresh failed")
+
+
+# --------------------------------------------------
+# Cross-worker invalidation
+# --------------------------------------------------
+# Callables notified with the tags of every local invalidation so they can
+# be forwarded to other workers (see app.cache_sync).
+_invalidation_publishers: List[Callable[[Tuple[str, ...]], None]] = []
+
+
+def add_invalidation_publisher(publisher: Callable[[Tuple[str, ...]], None]) -> None:
+    """Register a callable that forwards invalidations to other workers."""
+    if publisher not in _invalidation_publishers:
+        _invalidation_publishers.append(publisher)
+
+
+def remove_invalidation_publisher(publisher: Callable[[Tuple[str, ...]], None]) -> None:
+    """Unregister a previously added invalidation publisher."""
+    if publisher in _invalidation_publishers:
+        _invalidation_publishers.remove(publisher)
+
+
+# Callables told the tags of invalidations received from other workers, for
+# per-worker state kept outside the cache (see app.jobs.search_index).
+_remote_invalidation_handlers: List[Callable[[Tuple[str, ...]], None]] = []
+
+
+def add_remote_invalidation_handler(handler: Callable[[Tuple[str, ...]], None]) -> None:
+    """Register a callable applying invalidations received from other workers."""
+    if handler not in _remote_invalidation_handlers:
+        _remote_invalidation_handlers.append(handler)
+
+
+def remove_remote_invalidation_handler(handler: Callable[[Tuple[str, ...]], None]) -> None:
+    """Unregister a previously added remote invalidation handler."""
+    if handler in _remote_invalidation_handlers:
+        _remote_invalidation_handlers.remove(handler)
+
+
+def apply_invalidation(tags: Iterable[str], local_only: bool = False) -> None:
     """
-    Invalidate all cache entries with given prefix.
+    Apply an invalidation to this worker's cache (no publishing).
 
     Args:
-        key_prefix: Prefix of cache keys to invalidate
+        tags: Tags to invalidate; ALL_TAGS clears everything
+        local_only: Skip shared cache levels, used for messages received
+            from other workers that already updated them
+    """
+    tags = tuple(tags)
+    if ALL_TAGS in tags:
+        if local_only:
+            cache.clear_local()
+        else:
+            cache.clear()
+    elif local_only:
+        cache.invalidate_local_tags(*tags)
+    else:
+        cache.invalidate_tags(*tags)
+
+    if local_only:
+        for handler in list(_remote_invalidation_handlers):
+            try:
+                handler(tags)
+            except Exception:
+                logger.exception("Remote invalidation handler failed")
+
+
+def invalidate_cache(*tags: str):
+    """
+    Invalidate all cache entries registered under the given tags.
+
+    The invalidation is applied locally and forwarded to every registered
+    publisher so other workers drop the same entries.
+
+    Args:
+        tags: Tags to invalidate. With no tags the whole cache is cleared.
 
     Example:
         invalidate_cache("companies")  # Clear all company-related cache
+        invalidate_cache("jobs", f"company:{company_id}")
+    """
+    if not tags or tags == ("",):
+        tags = (ALL_TAGS,)
+
+    apply_invalidation(tags)
+    publish_invalidation(*tags)
+
+
+def publish_invalidation(*tags: str) -> None:
+    """
+    Forward tags to other workers without touching this worker's cache.
+
+    For per-worker state that the caller has already updated itself.
     """
-    if not key_prefix:
-        cache.clear()
-        return
-
-    # Remove all keys with matching prefix
-    keys_to_delete = [
-        key for key in cache._cache.keys()
-        if key.startswith(key_prefix)
-    ]
-    for key in keys_to_delete:
-        cache.delete(key)
+    for publisher in list(_invalidation_publishers):
+        try:
+            publisher(tags)
+        except Exception:
+            # The local cache is already consistent; remote workers fall
+            # back to TTL expiry if the message cannot be delivered.
+            logger.exception("Failed to publish cache invalidation")
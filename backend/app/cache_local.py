@@ -0,0 +1,330 @@
+"""
+In-process (L1) cache level and the interface shared by all cache levels.
+"""
+from typing import Any, Optional, Dict, Iterable, Set
+from collections import OrderedDict
+import logging
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Wildcard tag meaning "clear everything"
+ALL_TAGS = "*"
+
+
+# Objects inspected per value by _estimate_size; beyond that, containers
+# are extrapolated from the items already measured
+SIZE_ESTIMATE_BUDGET = 128
+
+# Assumed size of a container item when the budget ran out before any was measured
+_UNMEASURED_ITEM_BYTES = 64
+
+_SCALARS = (str, bytes, bytearray, int, float, bool, type(None))
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Approximate the memory footprint of a cached value in bytes.
+
+    Sums sys.getsizeof over the value and a bounded sample of what it
+    contains (container items, object attributes), scaling each container
+    by its length. Nothing is serialised, so the cost stays small and
+    fixed however large the value is.
+    """
+    return _measure(value, [SIZE_ESTIMATE_BUDGET])
+
+
+def _measure(value: Any, budget: list) -> int:
+    budget[0] -= 1
+    size = sys.getsizeof(value, _UNMEASURED_ITEM_BYTES)
+    if isinstance(value, _SCALARS):
+        return size
+
+    if isinstance(value, dict):
+        items: Iterable = value.items()
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        items = value
+    else:
+        # Plain objects and Pydantic models keep their fields in __dict__
+        attrs = getattr(value, "__dict__", None)
+        if isinstance(attrs, dict) and budget[0] > 0:
+            size += _measure(attrs, budget)
+        return size
+
+    measured = sampled = 0
+    for item in items:
+        if budget[0] <= 0:
+            break
+        if isinstance(value, dict):
+            key, item = item
+            # String keys are usually shared between records (field names)
+            if not isinstance(key, str):
+                measured += _measure(key, budget)
+            measured += _measure(item, budget)
+        else:
+            measured += _measure(item, budget)
+        sampled += 1
+    if sampled:
+        size += measured * len(value) // sampled
+    else:
+        size += _UNMEASURED_ITEM_BYTES * len(value)
+    return size
+
+
+class CacheBackend:
+    """Interface shared by all cache levels."""
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Return the cached values for the keys that are present."""
+        found = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 300,
+        tags: Optional[Iterable[str]] = None,
+        generations: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Store value under key.
+
+        Args:
+            generations: Result of tag_generations() taken before the value
+                was computed; shared levels drop it if a tag was
+                invalidated in between.
+        """
+        raise NotImplementedError
+
+    def tag_generations(self, tags: Iterable[str]) -> Optional[Dict[str, int]]:
+        """Snapshot of the shared tag generations, or None if not shared."""
+        return None
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def invalidate_tags(self, *tags: str) -> int:
+        raise NotImplementedError
+
+    def invalidate_local_tags(self, *tags: str) -> int:
+        """Invalidate tags in this process only (shared levels untouched)."""
+        return self.invalidate_tags(*tags)
+
+    def clear(self):
+        raise NotImplementedError
+
+    def clear_local(self):
+        """Clear this process only (shared levels untouched)."""
+        self.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    def start_sweeper(self) -> None:
+        pass
+
+    def stop_sweeper(self) -> None:
+        pass
+
+
+class LRUCache(CacheBackend):
+    """Thread-safe, bounded in-memory cache with TTL and LRU eviction."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        sweep_interval: int = 60,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+
+        # key -> (value, expires_at, size, tags); order is recency of use
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        # tag -> keys registered under it
+        self._tags: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._sweeper: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    # --------------------------------------------------
+    # Internal helpers (caller holds the lock)
+    # --------------------------------------------------
+    def _untag(self, key: str, tags: frozenset) -> None:
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _remove(self, key: str) -> None:
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+            self._untag(key, entry[3])
+
+    def _evict_overflow(self) -> None:
+        while self._cache and (
+            len(self._cache) > self.max_entries or self._bytes > self.max_bytes
+        ):
+            key, entry = self._cache.popitem(last=False)
+            self._bytes -= entry[2]
+            self._untag(key, entry[3])
+            self.evictions += 1
+
+    # --------------------------------------------------
+    # Public API
+    # --------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache if not expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            if now >= entry[1]:
+                # Expired, remove from cache
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 300,
+        tags: Optional[Iterable[str]] = None,
+        generations: Optional[Dict[str, int]] = None,
+    ):
+        """Set value in cache with TTL, optionally registered under tags."""
+        size = _estimate_size(value)
+        expires_at = time.monotonic() + ttl_seconds
+        tags = frozenset(tags or ())
+
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                # Never let a single oversized value flush the whole cache
+                return
+            self._cache[key] = (value, expires_at, size, tags)
+            self._bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            self._evict_overflow()
+
+    def delete(self, key: str):
+        """Delete specific key from cache."""
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        """
+        Remove every entry registered under any of the given tags.
+
+        Cost is proportional to the number of matching entries, not to
+        the size of the cache. Returns the number of entries removed.
+        """
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                keys = self._tags.pop(tag, None)
+                if not keys:
+                    continue
+                for key in keys:
+                    if key in self._cache:
+                        self._remove(key)
+                        removed += 1
+        return removed
+
+    def clear(self):
+        """Clear entire cache."""
+        with self._lock:
+            self._cache.clear()
+            self._tags.clear()
+            self._bytes = 0
+
+    def cleanup_expired(self) -> int:
+        """Remove all expired entries. Returns the number removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired_keys = [
+                key for key, entry in self._cache.items()
+                if now >= entry[1]
+            ]
+            for key in expired_keys:
+                self._remove(key)
+            self.expirations += len(expired_keys)
+        return len(expired_keys)
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of cache counters."""
+        with self._lock:
+            return {
+                "entries": len(self._cache),
+                "tags": len(self._tags),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    # --------------------------------------------------
+    # Background expiry sweeper
+    # --------------------------------------------------
+    def _sweep_loop(self) -> None:
+        while not self._stop_event.wait(self.sweep_interval):
+            try:
+                self.cleanup_expired()
+            except Exception:
+                logger.exception("Cache sweep failed")
+
+    def start_sweeper(self) -> None:
+        """Start the daemon thread that periodically drops expired entries."""
+        if self._sweeper is not None and self._sweeper.is_alive():
+            return
+        self._stop_event.clear()
+        self._sweeper = threading.Thread(
+            target=self._sweep_loop,
+            name="cache-sweeper",
+            daemon=True,
+        )
+        self._sweeper.start()
+
+    def stop_sweeper(self) -> None:
+        """Stop the background sweeper thread."""
+        self._stop_event.set()
+        if self._sweeper is not None:
+            self._sweeper.join(timeout=1)
+            self._sweeper = None
@@ -0,0 +1,485 @@
+"""
+Shared second-level cache over the Redis protocol.
+
+Values are pickled (protocol 5) together with their expiry and the
+generation of each tag they were stored under. Invalidating a tag bumps
+its generation, so stale entries are rejected on read by every worker and
+host without scanning keys. Reads are pipelined in batches.
+
+The generations stored with a value are the ones read before it was
+computed (see tag_generations), so a value computed from data that was
+invalidated meanwhile is rejected like any other stale entry.
+
+Payloads carry an HMAC-SHA256 keyed from SECRET_KEY and are only
+unpickled after it verifies, so whoever can write to the Redis instance
+cannot make workers unpickle arbitrary data.
+
+InMemoryRedisServer implements the small subset of RESP used here and can
+stand in for a real Redis in tests and local development.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import hmac
+import logging
+import pickle
+import socketserver
+import threading
+import time
+
+from app.cache_local import ALL_TAGS, CacheBackend, LRUCache
+from app.config import settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+PICKLE_PROTOCOL = 5
+
+_SIGNATURE_SIZE = hashlib.sha256().digest_size
+
+
+def _signing_key(secret: str) -> bytes:
+    # Derived, so the cache never holds the key that signs auth tokens
+    return hmac.new(secret.encode(), b"cache-redis", hashlib.sha256).digest()
+
+
+class RedisCache(CacheBackend):
+    """Cache level stored in Redis, shared by all workers and hosts."""
+
+    def __init__(
+        self,
+        client: "redis.Redis",
+        namespace: str = "cache",
+        batch_size: int = 100,
+        secret: Optional[str] = None,
+    ):
+        self.client = client
+        self.namespace = namespace
+        self.batch_size = batch_size
+        self._key = _signing_key(secret if secret is not None else settings.SECRET_KEY)
+
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisCache":
+        if redis is None:
+            raise RuntimeError("CACHE_REDIS_URL is set but the 'redis' package is not installed")
+        client = redis.Redis.from_url(
+            url,
+            socket_timeout=0.5,
+            socket_connect_timeout=0.5,
+        )
+        return cls(client, batch_size=settings.CACHE_REDIS_BATCH_SIZE)
+
+    # --------------------------------------------------
+    # Key layout
+    # --------------------------------------------------
+    def _entry_key(self, key: str) -> str:
+        return f"{self.namespace}:entry:{key}"
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.namespace}:tag:{tag}"
+
+    def _tag_generations(self, tags: List[str]) -> Dict[str, int]:
+        if not tags:
+            return {}
+        values = self.client.mget([self._tag_key(tag) for tag in tags])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    def tag_generations(self, tags: Iterable[str]) -> Optional[Dict[str, int]]:
+        """
+        Current generations of the tags an entry will be stored under.
+
+        Read before computing the value and pass the result to set().
+        Returns None if Redis is unreachable.
+        """
+        # Every entry implicitly carries ALL_TAGS so clear() is one INCR
+        try:
+            return self._tag_generations(sorted(set(tags) | {ALL_TAGS}))
+        except Exception:
+            self.errors += 1
+            logger.warning("Redis cache read failed", exc_info=True)
+            return None
+
+    # --------------------------------------------------
+    # Payload signing
+    # --------------------------------------------------
+    def _sign(self, data: bytes) -> bytes:
+        return hmac.new(self._key, data, hashlib.sha256).digest() + data
+
+    def _verify(self, payload: bytes) -> Optional[bytes]:
+        signature, data = payload[:_SIGNATURE_SIZE], payload[_SIGNATURE_SIZE:]
+        expected = hmac.new(self._key, data, hashlib.sha256).digest()
+        return data if hmac.compare_digest(signature, expected) else None
+
+    # --------------------------------------------------
+    # Reads
+    # --------------------------------------------------
+    def get_entries(self, keys: List[str]) -> Dict[str, Tuple[Any, float, List[str]]]:
+        """
+        Fetch live entries as key -> (value, expires_at, tags).
+
+        One pipelined round trip reads every batch of entries, and one more
+        reads the generations of all tags they reference.
+        """
+        if not keys:
+            return {}
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for start in range(0, len(keys), self.batch_size):
+                batch = keys[start:start + self.batch_size]
+                pipe.mget([self._entry_key(key) for key in batch])
+            raw_values = [value for batch in pipe.execute() for value in batch]
+
+            now = time.time()
+            decoded = {}
+            rejected = 0
+            for key, raw in zip(keys, raw_values):
+                if raw is None:
+                    continue
+                data = self._verify(raw)
+                if data is None:
+                    # Written with another SECRET_KEY, or not by us at all
+                    rejected += 1
+                    continue
+                value, expires_at, generations = pickle.loads(data)
+                if now < expires_at:
+                    decoded[key] = (value, expires_at, generations)
+
+            tags = sorted({tag for _, _, gens in decoded.values() for tag in gens})
+            current = self._tag_generations(tags)
+        except Exception:
+            self.errors += 1
+            logger.warning("Redis cache read failed", exc_info=True)
+            self.misses += len(keys)
+            return {}
+
+        if rejected:
+            self.errors += rejected
+            logger.warning("Rejected %d Redis cache entries with a bad signature", rejected)
+
+        found = {
+            key: (value, expires_at, [tag for tag in generations if tag != ALL_TAGS])
+            for key, (value, expires_at, generations) in decoded.items()
+            if all(current.get(tag, 0) == gen for tag, gen in generations.items())
+        }
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entries([key]).get(key)
+        return entry[0] if entry is not None else None
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        return {key: entry[0] for key, entry in self.get_entries(list(keys)).items()}
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 300,
+        tags: Optional[Iterable[str]] = None,
+        generations: Optional[Dict[str, int]] = None,
+    ):
+        if generations is None:
+            # Callers that did not snapshot before computing
+            generations = self.tag_generations(tags or ())
+            if generations is None:
+                return
+
+        try:
+            payload = self._sign(pickle.dumps(
+                (value, time.time() + ttl_seconds, generations),
+                protocol=PICKLE_PROTOCOL,
+            ))
+        except Exception:
+            # Not shareable (e.g. ORM instances); it stays in L1 only
+            return
+
+        try:
+            self.client.set(self._entry_key(key), payload, px=max(int(ttl_seconds * 1000), 1))
+        except Exception:
+            self.errors += 1
+            logger.warning("Redis cache write failed", exc_info=True)
+
+    def delete(self, key: str):
+        try:
+            self.client.delete(self._entry_key(key))
+        except Exception:
+            self.errors += 1
+            logger.warning("Redis cache delete failed", exc_info=True)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        if not tags:
+            return 0
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for tag in tags:
+                pipe.incr(self._tag_key(tag))
+            pipe.execute()
+        except Exception:
+            self.errors += 1
+            logger.warning("Redis cache invalidation failed", exc_info=True)
+        return 0
+
+    def clear(self):
+        self.invalidate_tags(ALL_TAGS)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+
+class TieredCache(CacheBackend):
+    """In-process L1 in front of a shared L2."""
+
+    def __init__(self, local: LRUCache, shared: RedisCache):
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.local.get(key)
+        if value is not None:
+            return value
+
+        return self._get_shared([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        found = self.local.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            found.update(self._get_shared(missing))
+        return found
+
+    def _get_shared(self, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        now = time.time()
+        for key, (value, expires_at, tags) in self.shared.get_entries(keys).items():
+            # Promote into L1 for the remainder of the shared TTL, keeping
+            # the tags so bus invalidations still reach the promoted entry
+            self.local.set(key, value, ttl_seconds=max(expires_at - now, 0), tags=tags)
+            found[key] = value
+        return found
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl_seconds: int = 300,
+        tags: Optional[Iterable[str]] = None,
+        generations: Optional[Dict[str, int]] = None,
+    ):
+        tags = list(tags or ())
+        self.local.set(key, value, ttl_seconds, tags=tags)
+        self.shared.set(key, value, ttl_seconds, tags=tags, generations=generations)
+
+    def tag_generations(self, tags: Iterable[str]) -> Optional[Dict[str, int]]:
+        return self.shared.tag_generations(tags)
+
+    def delete(self, key: str):
+        self.local.delete(key)
+        self.shared.delete(key)
+
+    def invalidate_tags(self, *tags: str) -> int:
+        self.shared.invalidate_tags(*tags)
+        return self.local.invalidate_tags(*tags)
+
+    def invalidate_local_tags(self, *tags: str) -> int:
+        return self.local.invalidate_tags(*tags)
+
+    def clear(self):
+        self.shared.clear()
+        self.local.clear()
+
+    def clear_local(self):
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"l1": self.local.stats(), "l2": self.shared.stats()}
+
+    def start_sweeper(self) -> None:
+        self.local.start_sweeper()
+
+    def stop_sweeper(self) -> None:
+        self.local.stop_sweeper()
+
+
+# --------------------------------------------------
+# Local stand-in server
+# --------------------------------------------------
+class _RESPHandler(socketserver.StreamRequestHandler):
+    """Speaks enough RESP2 for RedisCache and basic redis-py usage."""
+
+    def _read_command(self) -> Optional[List[bytes]]:
+        line = self.rfile.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            # Inline command (e.g. from telnet / redis-cli)
+            return line.strip().split()
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+    def _encode(self, value: Any) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, Exception):
+            return b"-ERR " + str(value).encode() + b"\r\n"
+        if value is True:
+            return b"+OK\r\n"
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(self._encode(v) for v in value)
+        if isinstance(value, str):
+            return b"+" + value.encode() + b"\r\n"
+        return b"$%d\r\n" % len(value) + value + b"\r\n"
+
+    def handle(self):
+        while True:
+            try:
+                args = self._read_command()
+            except (ConnectionError, ValueError):
+                return
+            if args is None:
+                return
+            if not args:
+                continue
+            try:
+                reply = self.server.store.execute(args)
+            except Exception as exc:
+                reply = exc
+            self.wfile.write(self._encode(reply))
+
+
+class _MemoryStore:
+    def __init__(self):
+        self._data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+
+    def _live(self, key: bytes) -> Optional[bytes]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self._data[key]
+            return None
+        return value
+
+    def execute(self, args: List[bytes]) -> Any:
+        command = args[0].upper()
+        with self._lock:
+            if command == b"PING":
+                return "PONG"
+            if command in (b"CLIENT", b"SELECT"):
+                return True
+            if command == b"GET":
+                return self._live(args[1])
+            if command == b"MGET":
+                return [self._live(key) for key in args[1:]]
+            if command == b"SET":
+                expires_at = None
+                options = [a.upper() for a in args[3:]]
+                if b"NX" in options and self._live(args[1]) is not None:
+                    return None
+                for flag, scale in ((b"PX", 0.001), (b"EX", 1.0)):
+                    if flag in options:
+                        ttl = float(args[3 + options.index(flag) + 1])
+                        expires_at = time.monotonic() + ttl * scale
+                self._data[args[1]] = (args[2], expires_at)
+                return True
+            if command == b"DEL":
+                removed = 0
+                for key in args[1:]:
+                    if self._live(key) is not None:
+                        del self._data[key]
+                        removed += 1
+                return removed
+            if command == b"EXISTS":
+                return sum(self._live(key) is not None for key in args[1:])
+            if command in (b"INCR", b"INCRBY"):
+                step = int(args[2]) if command == b"INCRBY" else 1
+                current = self._live(args[1])
+                expires_at = self._data[args[1]][1] if current is not None else None
+                value = int(current or 0) + step
+                self._data[args[1]] = (str(value).encode(), expires_at)
+                return value
+            if command in (b"EXPIRE", b"PEXPIRE"):
+                current = self._live(args[1])
+                if current is None:
+                    return 0
+                scale = 1.0 if command == b"EXPIRE" else 0.001
+                self._data[args[1]] = (current, time.monotonic() + int(args[2]) * scale)
+                return 1
+            if command == b"PTTL":
+                if self._live(args[1]) is None:
+                    return -2
+                expires_at = self._data[args[1]][1]
+                if expires_at is None:
+                    return -1
+                return int((expires_at - time.monotonic()) * 1000)
+            if command in (b"FLUSHDB", b"FLUSHALL"):
+                self._data.clear()
+                return True
+            if command == b"DBSIZE":
+                return len(self._data)
+        raise ValueError(f"unknown command '{command.decode()}'")
+
+
+class InMemoryRedisServer(socketserver.ThreadingTCPServer):
+    """
+    Minimal in-memory Redis-protocol server.
+
+    Example:
+        server = InMemoryRedisServer()
+        server.start()
+        cache = RedisCache(redis.Redis.from_url(server.url))
+        ...
+        server.stop()
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _RESPHandler)
+        self.store = _MemoryStore()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self.serve_forever,
+            name="inmemory-redis",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
@@ -0,0 +1,335 @@
+"""
+Cross-worker cache coherence.
+
+Every gunicorn worker owns its own in-process cache. Invalidations made in
+one worker are broadcast on a Postgres NOTIFY channel and a listener thread
+in every worker applies them to its local cache. On databases without
+LISTEN/NOTIFY (SQLite in development) an in-process bus is used instead.
+
+LISTEN needs a session-level connection, which PgBouncer in transaction
+pooling mode cannot provide, so the listener connects to
+CACHE_SYNC_LISTEN_URL (a direct Postgres URL) when set. NOTIFY is sent
+within a transaction and works through PgBouncer.
+
+Publishing only queues the tags: a publisher thread sends everything
+queued since its last send in one transaction, so a burst of writes costs
+one pooled connection checkout and commit rather than one per write, and
+request threads never wait on it. Failed sends are retried until
+delivered.
+
+cache_sync_healthy() reports whether this worker both receives and
+delivers invalidations; long-lived cache entries that rely on eviction
+(AUTH_USER_CACHE_TTL) fall back to a short TTL when it is False.
+"""
+from typing import Callable, List, Optional, Set, Tuple
+import json
+import logging
+import os
+import select
+import threading
+import uuid
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from app.cache import (
+    ALL_TAGS,
+    add_invalidation_publisher,
+    apply_invalidation,
+    remove_invalidation_publisher,
+)
+from app.config import settings
+from app.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+# Queued tags kept for sending; beyond this, send a full clear instead
+MAX_UNDELIVERED_TAGS = 1000
+
+# Longest wait between attempts to send after a failure, in seconds
+MAX_PUBLISH_BACKOFF = 30.0
+
+
+def _encode_messages(origin: str, tags: Tuple[str, ...]) -> List[str]:
+    """Split tags into NOTIFY payloads that fit under the size limit."""
+    messages: List[str] = []
+    batch: List[str] = []
+    for tag in tags:
+        candidate = json.dumps({"origin": origin, "tags": batch + [tag]})
+        if batch and len(candidate.encode()) > MAX_PAYLOAD_BYTES:
+            messages.append(json.dumps({"origin": origin, "tags": batch}))
+            batch = []
+        batch.append(tag)
+    if batch:
+        messages.append(json.dumps({"origin": origin, "tags": batch}))
+    return messages
+
+
+class InvalidationBus:
+    """Transport for cache invalidation messages between workers."""
+
+    def __init__(self):
+        # Unique per process so a worker can skip its own messages
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+    def publish(self, tags: Tuple[str, ...]) -> None:
+        raise NotImplementedError
+
+    @property
+    def healthy(self) -> bool:
+        """Whether invalidations are currently received and delivered."""
+        return True
+
+    def start(self) -> None:
+        add_invalidation_publisher(self.publish)
+
+    def stop(self) -> None:
+        remove_invalidation_publisher(self.publish)
+
+    def handle_message(self, payload: str) -> None:
+        """Apply a received message to the local cache."""
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed cache invalidation message")
+            return
+
+        if message.get("origin") == self.origin:
+            return
+        apply_invalidation(message.get("tags") or (), local_only=True)
+
+
+class LocalInvalidationBus(InvalidationBus):
+    """
+    In-process bus.
+
+    Used when the database has no LISTEN/NOTIFY support, and as a stand-in
+    for Postgres in tests: every subscriber registered on the same bus
+    receives the messages published by the others.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._subscribers: List[Callable[[str], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def healthy(self) -> bool:
+        # Messages never leave this process
+        return settings.WEB_CONCURRENCY <= 1
+
+    def subscribe(self, handler: Callable[[str], None]) -> None:
+        with self._lock:
+            self._subscribers.append(handler)
+
+    def publish(self, tags: Tuple[str, ...]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for payload in _encode_messages(self.origin, tags):
+            for handler in subscribers:
+                handler(payload)
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """Bus backed by Postgres LISTEN/NOTIFY."""
+
+    def __init__(
+        self,
+        publish_engine: Engine,
+        channel: str,
+        listen_url: Optional[str] = None,
+        poll_timeout: float = 5.0,
+    ):
+        super().__init__()
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+
+        # Publishing borrows a pooled connection; the listener gets its own
+        # unpooled one because it holds it for the lifetime of the worker.
+        self._publish_engine = publish_engine
+        self._engine: Optional[Engine] = (
+            create_engine(listen_url, poolclass=NullPool, future=True) if listen_url else None
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._listening = False
+
+        self._pending: Set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._publish_wakeup = threading.Event()
+        self._publisher: Optional[threading.Thread] = None
+        self._delivery_failed = False
+
+    @property
+    def healthy(self) -> bool:
+        return self._listening and not self._delivery_failed
+
+    def publish(self, tags: Tuple[str, ...]) -> None:
+        """Queue tags for the publisher thread."""
+        with self._pending_lock:
+            self._pending.update(tags)
+            if len(self._pending) > MAX_UNDELIVERED_TAGS:
+                self._pending = {ALL_TAGS}
+        self._publish_wakeup.set()
+
+    def flush(self) -> bool:
+        """Send every queued tag in one transaction; False if that failed."""
+        with self._pending_lock:
+            tags = tuple(sorted(self._pending))
+            self._pending.clear()
+        if not tags:
+            return True
+        try:
+            with self._publish_engine.begin() as conn:
+                for payload in _encode_messages(self.origin, tags):
+                    conn.execute(
+                        text("SELECT pg_notify(:channel, :payload)"),
+                        {"channel": self.channel, "payload": payload},
+                    )
+        except Exception:
+            with self._pending_lock:
+                self._pending.update(tags)
+                if len(self._pending) > MAX_UNDELIVERED_TAGS:
+                    self._pending = {ALL_TAGS}
+            self._delivery_failed = True
+            logger.warning("Cache invalidations undelivered; retrying", exc_info=True)
+            return False
+        if self._delivery_failed:
+            logger.info("Delivered previously failed cache invalidations")
+        self._delivery_failed = False
+        return True
+
+    def _publish_forever(self) -> None:
+        backoff = 1.0
+        while True:
+            self._publish_wakeup.wait()
+            self._publish_wakeup.clear()
+            # Queued tags still go out once when stopping
+            delivered = self.flush()
+            if self._stop_event.is_set():
+                return
+            if delivered:
+                backoff = 1.0
+            elif not self._stop_event.wait(backoff):
+                backoff = min(backoff * 2, MAX_PUBLISH_BACKOFF)
+                self._publish_wakeup.set()
+
+    def start(self) -> None:
+        super().start()
+        if self._publisher is None or not self._publisher.is_alive():
+            self._stop_event.clear()
+            self._publisher = threading.Thread(
+                target=self._publish_forever,
+                name="cache-invalidation-publisher",
+                daemon=True,
+            )
+            self._publisher.start()
+        if self._engine is None:
+            logger.error(
+                "Cache invalidation listener disabled: PgBouncer cannot LISTEN, "
+                "set CACHE_SYNC_LISTEN_URL to a direct Postgres URL"
+            )
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._listen_forever,
+            name="cache-invalidation-listener",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        super().stop()
+        self._stop_event.set()
+        self._publish_wakeup.set()
+        if self._publisher is not None:
+            self._publisher.join(timeout=5)
+            self._publisher = None
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_timeout + 1)
+            self._thread = None
+        if self._engine is not None:
+            self._engine.dispose()
+
+    def _listen_forever(self) -> None:
+        backoff = 1.0
+        while not self._stop_event.is_set():
+            try:
+                self._listen()
+                backoff = 1.0
+            except Exception:
+                self._listening = False
+                logger.exception("Cache invalidation listener disconnected")
+                # Messages may have been missed while disconnected
+                apply_invalidation((ALL_TAGS,), local_only=True)
+                self._stop_event.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def _listen(self) -> None:
+        raw = self._engine.raw_connection()
+        try:
+            conn = raw.driver_connection
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+
+            # Anything cached before LISTEN took effect may be stale
+            apply_invalidation((ALL_TAGS,), local_only=True)
+            self._listening = True
+            logger.info(f"Listening for cache invalidations on '{self.channel}'")
+
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([conn], [], [], self.poll_timeout)
+                if not readable:
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    self.handle_message(notify.payload)
+        finally:
+            self._listening = False
+            raw.close()
+
+
+# --------------------------------------------------
+# Process-wide bus
+# --------------------------------------------------
+_bus: Optional[InvalidationBus] = None
+
+
+def create_bus(db_engine: Engine) -> InvalidationBus:
+    """Pick the bus implementation supported by the database behind db_engine."""
+    if db_engine.dialect.name == "postgresql":
+        listen_url = settings.CACHE_SYNC_LISTEN_URL
+        if not listen_url and not settings.DB_PGBOUNCER:
+            listen_url = db_engine.url.render_as_string(hide_password=False)
+        return PostgresInvalidationBus(db_engine, settings.CACHE_SYNC_CHANNEL, listen_url)
+    return LocalInvalidationBus()
+
+
+def start_cache_sync() -> Optional[InvalidationBus]:
+    """Start broadcasting and receiving invalidations for this worker."""
+    global _bus
+    if not settings.CACHE_SYNC_ENABLED:
+        return None
+    if _bus is None:
+        _bus = create_bus(engine)
+    _bus.start()
+    return _bus
+
+
+def cache_sync_healthy() -> bool:
+    """True while invalidations reach and come from the other workers."""
+    return _bus is not None and _bus.healthy
+
+
+def stop_cache_sync() -> None:
+    global _bus
+    if _bus is not None:
+        _bus.stop()
+        _bus = None
@@ -1,14 +1,18 @@
-from fastapi import APIRouter, Depends, status, Request
+from fastapi import APIRouter, Depends, status, Request, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Union
 
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db, get_async_read_db
 from app.models import User, Company, UserRole
-from app.companies.schemas import CompanyCreate, CompanyUpdate, CompanyResponse
+from app.companies.schemas import CompanyCreate, CompanyUpdate, CompanyResponse, CompanyPage
 from app.auth.permissions import require_roles
 from app.middleware.rate_limiter import limiter
 from app.middleware.rate_limits import COMPANY_CREATE_LIMIT, PUBLIC_READ_LIMIT
 from app.cache import invalidate_cache
+from app.pagination import order_newest_first, paginate_keyset, paginate_keyset_async
 
 router = APIRouter(prefix="/companies", tags=["Companies"])
 
@@ -32,22 +36,69 @@ def create_company(
     db.commit()
     db.refresh(new_company)
 
-    invalidate_cache("companies")
+    invalidate_cache("companies", f"company:{new_company.id}")
     return new_company
 
 
 # --------------------------------------------------
 # List companies (RATE LIMITED)
 # --------------------------------------------------
-@router.get("", response_model=List[CompanyResponse])
 @limiter.limit(PUBLIC_READ_LIMIT)
 def list_companies(
     request: Request,   # ✅ REQUIRED for SlowAPI
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor; pass an empty value for the first page",
+    ),
+    db: Session = Depends(get_read_db),
 ):
-    return db.query(Company).offset(skip).limit(limit).all()
+    """
+    List companies, newest first.
+
+    Without `cursor` this returns a plain list paged by skip/limit. With
+    `cursor` it returns `{items, next_cursor}`.
+    """
+    query = db.query(Company)
+
+    if cursor is not None:
+        items, next_cursor = paginate_keyset(query, Company.created_at, Company.id, cursor, limit)
+        return CompanyPage(items=items, next_cursor=next_cursor)
+
+    return order_newest_first(query, Company.created_at, Company.id).offset(skip).limit(limit).all()
+
+
+@limiter.limit(PUBLIC_READ_LIMIT)
+async def list_companies_async(
+    request: Request,   # ✅ REQUIRED for SlowAPI
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor; pass an empty value for the first page",
+    ),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """list_companies on the async engine (DATABASE_MODE=async)."""
+    stmt = select(Company)
+
+    if cursor is not None:
+        items, next_cursor = await paginate_keyset_async(
+            db, stmt, Company.created_at, Company.id, cursor, limit
+        )
+        return CompanyPage(items=items, next_cursor=next_cursor)
+
+    stmt = order_newest_first(stmt, Company.created_at, Company.id).offset(skip).limit(limit)
+    return list(await db.scalars(stmt))
+
+
+router.add_api_route(
+    "",
+    list_companies_async if settings.use_async_db else list_companies,
+    methods=["GET"],
+    response_model=Union[List[CompanyResponse], CompanyPage],
+)
 
 
 # --------------------------------------------------
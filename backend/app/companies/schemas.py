@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
+from app.pagination import CursorPage
 
 
 class CompanyCreate(BaseModel):
@@ -22,3 +23,7 @@ class CompanyResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class CompanyPage(CursorPage[CompanyResponse]):
+    pass
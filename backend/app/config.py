@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List, Optional
+from typing import List, Literal, Optional
 import logging
 
 
@@ -8,6 +8,25 @@ class Settings(BaseSettings):
     # Database
     # ======================
     DATABASE_URL: str
+    # "async" serves the hot read routes from an asyncpg AsyncEngine
+    DATABASE_MODE: Literal["sync", "async"] = "sync"
+
+    # Connections all workers may hold together; keep below Postgres
+    # max_connections (default 100) to leave room for admin sessions
+    DB_CONNECTION_BUDGET: int = 80
+    WEB_CONCURRENCY: int = 2  # gunicorn workers; also read by gunicorn
+    DB_POOL_SIZE: Optional[int] = None  # override the budget-derived size
+    DB_MAX_OVERFLOW: Optional[int] = None
+    DB_POOL_TIMEOUT: int = 30  # seconds
+    # Connect through PgBouncer (transaction pooling): no app-side pool
+    DB_PGBOUNCER: bool = False
+
+    # Comma-separated read replica URLs for read-only routes
+    DATABASE_REPLICA_URLS: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CHECK_INTERVAL: float = 5.0  # seconds between lag checks
+    # Reads stay on the primary this long after a client's write
+    READ_YOUR_WRITES_SECONDS: int = 10
 
     # ======================
     # Security (CRITICAL)
@@ -16,6 +35,12 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # bcrypt worker processes per app process (0 = hash in the request thread)
+    PASSWORD_HASH_WORKERS: int = 1
+    # Queued + running bcrypt calls per app process before logins get 503
+    PASSWORD_HASH_MAX_PENDING: int = 16
+    # Verified access tokens remembered per process (0 = verify every request)
+    AUTH_TOKEN_CACHE_SIZE: int = 10000
 
     # ======================
     # Application
@@ -37,6 +62,17 @@ class Settings(BaseSettings):
         "application/msword,"
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
     )
+    # Seconds between sweeps deleting resume blobs no application references
+    RESUME_GC_INTERVAL: int = 3600
+    # Files on disk without a blob row (rolled back or crashed uploads) are
+    # deleted by the same sweep once older than this many seconds
+    RESUME_ORPHAN_MIN_AGE: int = 3600
+    # Internal nginx location aliasing UPLOAD_DIR; when set, resume downloads
+    # are handed to nginx with X-Accel-Redirect instead of streamed by the app
+    RESUME_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+    # Extract resume text in the background (see app.storage.resume_text)
+    RESUME_TEXT_EXTRACTION_ENABLED: bool = True
+    RESUME_EXTRACT_WORKERS: int = 2  # worker processes per app process
 
     # ======================
     # CORS
@@ -59,12 +95,60 @@ class Settings(BaseSettings):
     RATE_LIMIT_ENABLED: bool = True
     RATE_LIMIT_PER_MINUTE: int = 60
 
+    # ======================
+    # Cache
+    # ======================
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # 64MB
+    CACHE_SWEEP_INTERVAL: int = 60  # seconds
+    CACHE_SYNC_ENABLED: bool = True
+    CACHE_SYNC_CHANNEL: str = "cache_invalidation"
+    # Direct Postgres URL for the LISTEN connection (PgBouncer transaction
+    # pooling cannot LISTEN); defaults to DATABASE_URL without DB_PGBOUNCER
+    CACHE_SYNC_LISTEN_URL: Optional[str] = None
+    CACHE_REDIS_URL: Optional[str] = None  # shared L2, e.g. redis://redis:6379/0
+    CACHE_REDIS_BATCH_SIZE: int = 100
+    # Authenticated principals (user:{id}); evicted on every user change
+    AUTH_USER_CACHE_TTL: int = 6 * 3600  # seconds
+    # Used instead while cache sync is disabled or unhealthy
+    AUTH_USER_CACHE_FALLBACK_TTL: int = 300  # seconds
+
+    # ======================
+    # Search
+    # ======================
+    # Serve GET /jobs?q= from an in-process inverted index of jobs
+    JOB_SEARCH_INDEX_ENABLED: bool = False
+
+    # ======================
+    # Admin statistics
+    # ======================
+    # off | incremental | scheduled (see app.admin.stats)
+    STATS_COUNTERS_MODE: Literal["off", "incremental", "scheduled"] = "off"
+    STATS_REFRESH_INTERVAL: int = 300  # seconds
+    # Rows per counter that incremental deltas are spread over
+    STATS_COUNTER_SHARDS: int = 8
+
     # ======================
     # Logging
     # ======================
     LOG_LEVEL: str = "INFO"
     LOG_FILE: Optional[str] = "./logs/app.log"
 
+    # ======================
+    # Diagnostics
+    # ======================
+    # Fail any request issuing more SQL statements (tests / development)
+    QUERY_GUARD_MAX_QUERIES: Optional[int] = None
+    # Statements at least this slow are logged with their SQL and parameters
+    SLOW_QUERY_THRESHOLD_MS: float = 200
+    # Log parameter values instead of their types (may expose personal data)
+    SLOW_QUERY_LOG_PARAMETERS: bool = False
+    # Report per-request query count and DB time in Server-Timing headers
+    SERVER_TIMING_ENABLED: bool = True
+    # Prometheus metrics at GET /metrics (see app.metrics)
+    METRICS_ENABLED: bool = True
+    EVENT_LOOP_LAG_INTERVAL: float = 0.5  # seconds between lag samples
+
     # ======================
     # Error Tracking
     # ======================
@@ -93,6 +177,14 @@ class Settings(BaseSettings):
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
+    @property
+    def database_replica_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+
+    @property
+    def use_async_db(self) -> bool:
+        return self.DATABASE_MODE == "async"
+
     @property
     def is_production(self) -> bool:
         return self.ENVIRONMENT.lower() == "production"
@@ -1,10 +1,17 @@
+from fastapi import Request
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.pool import QueuePool
 from app.config import settings
+from app.db_pool import engine_pool_options, instrument_engine
+from app.db_replicas import ReplicaSet, wants_primary
 
 DATABASE_URL = settings.DATABASE_URL
 
+# Engines each worker opens; they share its slice of the connection budget
+ENGINES_PER_WORKER = 2 if settings.use_async_db else 1
+
 # --------------------------------------------------
 # SQLAlchemy Engine (PRODUCTION SAFE)
 # --------------------------------------------------
@@ -12,17 +19,13 @@ engine = create_engine(
     DATABASE_URL,
 
     # 🔥 CONNECTION POOL SETTINGS (CRITICAL)
-    poolclass=QueuePool,
-
-    pool_size=20,
-    max_overflow=30,
-    pool_timeout=30,
-    pool_recycle=1800,
-    pool_pre_ping=True,
+    # Sized from DB_CONNECTION_BUDGET / WEB_CONCURRENCY (see app.db_pool)
+    **engine_pool_options("primary", engines_per_worker=ENGINES_PER_WORKER),
 
     echo=False,
     future=True,
 )
+instrument_engine("primary", engine)
 
 # --------------------------------------------------
 # Session factory
@@ -33,6 +36,76 @@ SessionLocal = sessionmaker(
     bind=engine,
 )
 
+# --------------------------------------------------
+# Async engine (DATABASE_MODE=async)
+# --------------------------------------------------
+# Async drivers for the sync URLs in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "asyncpg",
+    "sqlite": "aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Same database as url, through its asyncio driver."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    return parsed.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(
+        hide_password=False
+    )
+
+
+def _create_async_engine(url: str, name: str):
+    async_engine = create_async_engine(
+        async_database_url(url),
+        **engine_pool_options(name, is_async=True, engines_per_worker=ENGINES_PER_WORKER),
+        echo=False,
+    )
+    instrument_engine(name, async_engine.sync_engine)
+    return async_engine
+
+
+# Only built in async mode, so the sync deployment needs no asyncpg
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.use_async_db:
+    async_engine = _create_async_engine(DATABASE_URL, "primary_async")
+
+    # Objects stay readable after commit; routes return them directly
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+
+# --------------------------------------------------
+# Read replicas (DATABASE_REPLICA_URLS)
+# --------------------------------------------------
+# Each replica is a separate server with its own connection budget
+replicas = ReplicaSet(
+    max_lag_seconds=settings.REPLICA_MAX_LAG_SECONDS,
+    check_interval=settings.REPLICA_CHECK_INTERVAL,
+)
+
+for index, replica_url in enumerate(settings.database_replica_urls_list):
+    name = f"replica_{index}"
+    replica_engine = create_engine(
+        replica_url,
+        **engine_pool_options(name, engines_per_worker=ENGINES_PER_WORKER),
+        echo=False,
+        future=True,
+    )
+    instrument_engine(name, replica_engine)
+    replicas.add(
+        name,
+        replica_engine,
+        _create_async_engine(replica_url, f"{name}_async") if settings.use_async_db else None,
+    )
+
 # --------------------------------------------------
 # Base model
 # --------------------------------------------------
@@ -47,3 +120,42 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# --------------------------------------------------
+# Read-only dependencies (replica routing)
+# --------------------------------------------------
+def _pick_replica(request: Request):
+    """Replica for this read, or None to stay on the primary."""
+    if not replicas or wants_primary(request.cookies):
+        request.state.db_route = "primary"
+        return None
+    replica = replicas.pick()
+    request.state.db_route = replica.name if replica else "primary"
+    return replica
+
+
+def get_read_db(request: Request):
+    """
+    Session for read-only routes: a healthy replica when one is available,
+    otherwise the primary. Never write through it.
+    """
+    replica = _pick_replica(request)
+    db = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(request: Request):
+    """get_read_db for async routes (DATABASE_MODE=async)."""
+    replica = _pick_replica(request)
+    session = AsyncSessionLocal(bind=replica.async_engine) if replica else AsyncSessionLocal()
+    async with session as db:
+        yield db
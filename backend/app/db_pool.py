@@ -0,0 +1,229 @@
+"""
+Connection pool sizing and telemetry.
+
+Sizing: every gunicorn worker owns its own pools, so per-worker limits are
+derived from one global budget (DB_CONNECTION_BUDGET) divided by the worker
+count (WEB_CONCURRENCY), minus connections held outside the pools, and
+split between the engines a worker opens. pool_size + max_overflow across
+all workers therefore never exceeds the budget, which should stay below
+Postgres max_connections.
+
+PgBouncer: with DB_PGBOUNCER the app opens a fresh connection per checkout
+(NullPool) and leaves pooling to PgBouncer in transaction mode; asyncpg's
+prepared statement caches are disabled because server-side statements do
+not survive a transaction-pooled backend switch.
+
+Telemetry: the pool classes below time every checkout and count checkout
+timeouts; in-use connections are tracked with pool events. Snapshots are
+available per engine through pool_stats() and the same observations feed
+the db_pool_* Prometheus metrics (app.metrics).
+"""
+from typing import Any, Dict, NamedTuple, Optional
+import bisect
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+from app.config import settings
+from app.metrics import (
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_IN_USE,
+    DB_POOL_TIMEOUTS,
+    POOL_WAIT_BUCKETS as WAIT_BUCKETS,
+)
+
+
+# --------------------------------------------------
+# Sizing
+# --------------------------------------------------
+class PoolLimits(NamedTuple):
+    pool_size: int
+    max_overflow: int
+
+
+def pool_limits(engines_per_worker: int = 1) -> PoolLimits:
+    """
+    Per-engine pool limits for this worker.
+
+    DB_POOL_SIZE / DB_MAX_OVERFLOW override the computed values. Otherwise
+    two thirds of the engine's share are kept open and the rest may be
+    opened as overflow under bursts.
+    """
+    workers = max(1, settings.WEB_CONCURRENCY)
+    # The cache invalidation listener holds one connection per worker
+    reserved = 1 if settings.CACHE_SYNC_ENABLED else 0
+    per_worker = settings.DB_CONNECTION_BUDGET // workers - reserved
+    per_engine = max(2, per_worker // max(1, engines_per_worker))
+
+    pool_size = settings.DB_POOL_SIZE or max(1, per_engine * 2 // 3)
+    max_overflow = (
+        settings.DB_MAX_OVERFLOW
+        if settings.DB_MAX_OVERFLOW is not None
+        else max(0, per_engine - pool_size)
+    )
+    return PoolLimits(pool_size, max_overflow)
+
+
+# --------------------------------------------------
+# Metrics
+# --------------------------------------------------
+class PoolMetrics:
+    """Checkout counters for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._wait_histogram = DB_POOL_CHECKOUT_WAIT.labels(name)
+        self._timeout_counter = DB_POOL_TIMEOUTS.labels(name)
+        self._in_use_gauge = DB_POOL_IN_USE.labels(name)
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.in_use = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        # Checkouts per WAIT_BUCKETS interval (upper bound inclusive), plus +Inf
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            if seconds > self.wait_seconds_max:
+                self.wait_seconds_max = seconds
+            self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+        self._wait_histogram.observe(seconds)
+
+    def observe_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+        self._timeout_counter.inc()
+
+    def connection_checked_out(self) -> None:
+        with self._lock:
+            self.in_use += 1
+            self._in_use_gauge.set(self.in_use)
+
+    def connection_checked_in(self) -> None:
+        with self._lock:
+            self.in_use = max(0, self.in_use - 1)
+            self._in_use_gauge.set(self.in_use)
+
+    def snapshot(self, pool: Optional[Pool] = None) -> Dict[str, Any]:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "in_use": self.in_use,
+                "wait_seconds_total": round(self.wait_seconds_total, 6),
+                "wait_seconds_max": round(self.wait_seconds_max, 6),
+                "wait_seconds_avg": round(self.wait_seconds_total / self.checkouts, 6)
+                if self.checkouts else 0.0,
+                "wait_buckets": dict(zip([*map(str, WAIT_BUCKETS), "+Inf"], self.wait_buckets)),
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                pool_class=type(pool).__name__,
+                size=pool.size(),
+                idle=pool.checkedin(),
+                # Negative while the pool has not opened pool_size connections yet
+                overflow=max(0, pool.overflow()),
+                max_overflow=pool._max_overflow,
+            )
+        elif pool is not None:
+            stats["pool_class"] = type(pool).__name__
+        return stats
+
+
+_metrics: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Engine] = {}
+
+
+def metrics_for(name: str) -> PoolMetrics:
+    metrics = _metrics.get(name)
+    if metrics is None:
+        metrics = _metrics.setdefault(name, PoolMetrics(name))
+    return metrics
+
+
+# --------------------------------------------------
+# Instrumented pools
+# --------------------------------------------------
+class _TimedCheckout:
+    """
+    Mixin timing Pool._do_get, the step that waits for a free connection
+    (or opens a new one) and raises TimeoutError when the pool stays
+    exhausted for pool_timeout seconds.
+
+    Metrics are looked up by the pool's logging name, which survives
+    Pool.recreate() on engine.dispose().
+    """
+
+    def _do_get(self):
+        metrics = metrics_for(self._orig_logging_name or "default")
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            metrics.observe_timeout()
+            raise
+        finally:
+            metrics.observe_wait(time.perf_counter() - started)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+class InstrumentedNullPool(_TimedCheckout, NullPool):
+    pass
+
+
+def engine_pool_options(name: str, is_async: bool = False, engines_per_worker: int = 1) -> Dict[str, Any]:
+    """create_engine / create_async_engine keyword arguments for a pool."""
+    options: Dict[str, Any] = {
+        "pool_logging_name": name,
+        "pool_pre_ping": True,
+    }
+
+    if settings.DB_PGBOUNCER:
+        options["poolclass"] = InstrumentedNullPool
+        if is_async:
+            # PgBouncer transaction pooling cannot keep prepared statements
+            options["connect_args"] = {
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+            }
+        return options
+
+    limits = pool_limits(engines_per_worker)
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=limits.pool_size,
+        max_overflow=limits.max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=1800,
+    )
+    return options
+
+
+def instrument_engine(name: str, engine: Engine) -> None:
+    """Track in-use connections of a sync engine (or AsyncEngine.sync_engine)."""
+    metrics = metrics_for(name)
+    _engines[name] = engine
+    event.listen(engine, "checkout", lambda *args: metrics.connection_checked_out())
+    event.listen(engine, "checkin", lambda *args: metrics.connection_checked_in())
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Snapshot of every instrumented engine's pool in this worker."""
+    return {
+        name: metrics_for(name).snapshot(engine.pool)
+        for name, engine in _engines.items()
+    }
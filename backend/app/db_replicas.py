@@ -0,0 +1,177 @@
+"""
+Read-replica selection.
+
+Read-only routes take their session from get_read_db (app.database), which
+asks the ReplicaSet for an engine. A replica is only handed out after a
+lag check has passed: a monitor thread measures each replica's replay lag
+every REPLICA_CHECK_INTERVAL seconds and replicas lagging more than
+REPLICA_MAX_LAG_SECONDS, disconnected from the primary, or failing the
+check are skipped until they catch up. With no usable replica, reads go to the primary.
+
+Read-your-writes: after a successful write request the client receives a
+short-lived cookie (READ_YOUR_WRITES_COOKIE) and its reads stay on the
+primary until it expires, so e.g. a job list fetched right after
+create_job includes the new job.
+"""
+from typing import Any, Dict, List, Optional
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+
+# Whether the replica is streaming from the primary, and the seconds it is
+# behind. Lag is zero when it has replayed everything it received, so an
+# idle primary does not look like lag; that only holds while a WAL receiver
+# is connected, otherwise received == replayed just means nothing arrives.
+# Without pg_read_all_stats the receiver's status reads as NULL, and the
+# row's presence alone is checked.
+POSTGRES_LAG_SQL = """
+SELECT
+    NOT pg_is_in_recovery() OR EXISTS (
+        SELECT 1 FROM pg_stat_wal_receiver WHERE status IS NULL OR status = 'streaming'
+    ),
+    CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+def measure_lag(engine: Engine) -> float:
+    """
+    Replication lag of engine's database in seconds.
+
+    Raises:
+        RuntimeError: if a Postgres replica has no streaming WAL receiver
+    """
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            streaming, lag = connection.execute(text(POSTGRES_LAG_SQL)).one()
+            if not streaming:
+                raise RuntimeError("no WAL receiver streaming from the primary")
+            return float(lag or 0)
+        # Other databases (e.g. a SQLite copy used locally) have no
+        # replication to measure; a successful query means usable
+        connection.execute(text("SELECT 1"))
+        return 0.0
+
+
+class Replica:
+    def __init__(self, name: str, engine: Engine, async_engine: Any = None):
+        self.name = name
+        self.engine = engine
+        self.async_engine = async_engine
+        self.lag_seconds: Optional[float] = None
+        self.healthy = False
+        self.checked_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+
+class ReplicaSet:
+    """Replicas with their last lag check, picked round-robin."""
+
+    def __init__(self, max_lag_seconds: float, check_interval: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.replicas: List[Replica] = []
+        self._cycle = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, engine: Engine, async_engine: Any = None) -> None:
+        self.replicas.append(Replica(name, engine, async_engine))
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    # --------------------------------------------------
+    # Lag checks
+    # --------------------------------------------------
+    def check(self) -> None:
+        """Measure every replica's lag and update its health."""
+        for replica in self.replicas:
+            try:
+                lag = measure_lag(replica.engine)
+                healthy = lag <= self.max_lag_seconds
+                replica.error = None if healthy else f"lag {lag:.1f}s over limit"
+            except Exception as e:
+                lag, healthy = None, False
+                replica.error = str(e)
+
+            if healthy and not replica.healthy:
+                logger.info(f"Read replica {replica.name} in rotation (lag {lag:.1f}s)")
+            elif replica.healthy and not healthy:
+                logger.warning(f"Read replica {replica.name} removed from rotation: {replica.error}")
+            replica.lag_seconds = lag
+            replica.healthy = healthy
+            replica.checked_at = time.time()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception:
+                logger.exception("Replica lag check failed")
+
+    def start_monitor(self) -> None:
+        """Check once now, then keep checking in a daemon thread."""
+        if not self.replicas or (self._thread and self._thread.is_alive()):
+            return
+        self.check()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-monitor", daemon=True)
+        self._thread.start()
+
+    def stop_monitor(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    # --------------------------------------------------
+    # Selection
+    # --------------------------------------------------
+    def pick(self) -> Optional[Replica]:
+        """
+        Next healthy replica, or None when reads must use the primary.
+
+        A replica whose last check is older than a few intervals (monitor
+        stopped or stuck) is treated as unchecked.
+        """
+        now = time.time()
+        fresh_for = self.check_interval * 3
+        usable = [
+            replica for replica in self.replicas
+            if replica.healthy and replica.checked_at and now - replica.checked_at <= fresh_for
+        ]
+        if not usable:
+            return None
+        return usable[next(self._cycle) % len(usable)]
+
+    def status(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "name": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag_seconds,
+                "checked_at": replica.checked_at,
+                "error": replica.error,
+            }
+            for replica in self.replicas
+        ]
+
+
+def wants_primary(cookies: Dict[str, str]) -> bool:
+    """True while the client's read-your-writes window is open."""
+    try:
+        return float(cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
@@ -1,4 +1,4 @@
-from typing import Optional, Any
+from typing import Any, Dict, Optional
 from fastapi import status
 
 
@@ -9,8 +9,10 @@ class APIError(Exception):
         message: str,
         status_code: int = status.HTTP_400_BAD_REQUEST,
         details: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
     ):
         self.code = code
         self.message = message
         self.status_code = status_code
         self.details = details
+        self.headers = headers
@@ -6,7 +6,8 @@ from typing import Dict, Any, List
 from sqlalchemy.orm import Session
 from sqlalchemy import text, inspect
 from app.database import SessionLocal, engine
-from app.models import User, Job, Company, Application, Profile, UserRole, ApplicationStatus, JobStatus
+from app.models import UserRole, ApplicationStatus, JobStatus
+from app.admin.stats import get_counts
 import hashlib
 import json
 from datetime import datetime
@@ -124,23 +125,25 @@ class HealthChecker:
         """Verify seed data exists."""
         try:
             db = SessionLocal()
+            try:
+                stats = get_counts(db)
+            finally:
+                db.close()
 
             counts = {
-                "users": db.query(User).count(),
-                "companies": db.query(Company).count(),
-                "jobs": db.query(Job).count(),
-                "applications": db.query(Application).count(),
-                "profiles": db.query(Profile).count()
+                "users": stats["users_total"],
+                "companies": stats["companies_total"],
+                "jobs": stats["jobs_total"],
+                "applications": stats["applications_total"],
+                "profiles": stats["profiles_total"]
             }
 
             role_counts = {
-                "admin": db.query(User).filter(User.role == UserRole.admin).count(),
-                "employer": db.query(User).filter(User.role == UserRole.employer).count(),
-                "seeker": db.query(User).filter(User.role == UserRole.seeker).count()
+                "admin": stats["users_admins"],
+                "employer": stats["users_employers"],
+                "seeker": stats["users_seekers"]
             }
 
-            db.close()
-
             warnings = []
             if counts["users"] == 0:
                 warnings.append("No users found - seed data may be missing")
@@ -0,0 +1,219 @@
+"""
+Facet counts for the job board.
+
+GET /jobs/facets returns, for the current filter set, how many jobs fall
+under each employment type, location, salary bucket and company.
+
+SQL path: a single statement. Postgres evaluates all four facets with
+GROUPING SETS in one scan; other databases group by the combined key and
+the combinations are folded in Python.
+
+Index path: text queries are counted in one pass over the
+in-process search index (JOB_SEARCH_INDEX_ENABLED).
+
+Results are cached per normalized filter signature and dropped whenever
+the "jobs" tag is invalidated.
+"""
+from typing import Any, Dict, List, Optional
+from collections import Counter
+from decimal import Decimal
+
+from sqlalchemy import case, func, literal_column, tuple_
+from sqlalchemy.orm import Session
+
+from app.models import Job, Company, EmploymentType, JobStatus
+from app.cache import cached
+from app.jobs.search import apply_job_filters, apply_text_search
+from app.jobs.search_index import job_search_index
+
+# Upper salary bound edges; bucket i covers [edges[i-1], edges[i])
+SALARY_BUCKET_EDGES = [30000, 60000, 100000, 150000]
+
+FACETS_CACHE_TTL = 60
+
+# Bucket value for jobs without any salary bound
+_NO_SALARY_BUCKET = -1
+
+
+def normalize_filters(
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    employment_type: Optional[EmploymentType] = None,
+    status: Optional[JobStatus] = None,
+    salary_min: Optional[Decimal] = None,
+    salary_max: Optional[Decimal] = None,
+) -> Dict[str, Any]:
+    """
+    Canonical form of a filter set, used as the facet cache key.
+
+    Filters that match the same jobs map to the same signature: text is
+    lowercased with whitespace collapsed, locations are compared
+    case-insensitively, and equal salaries (60000 vs 60000.00) coincide.
+    """
+    return {
+        "q": " ".join((q or "").lower().split()) or None,
+        "location": (location or "").strip().lower() or None,
+        "employment_type": EmploymentType(employment_type).value if employment_type is not None else None,
+        "status": JobStatus(status).value if status is not None else None,
+        "salary_min": str(salary_min.normalize()) if salary_min is not None else None,
+        "salary_max": str(salary_max.normalize()) if salary_max is not None else None,
+    }
+
+
+def _salary_bucket_column():
+    # Constants are inlined so the SELECT and GROUP BY expressions are
+    # textually identical (bound parameters would differ)
+    def const(value):
+        return literal_column(str(value))
+
+    upper = func.coalesce(Job.salary_max, Job.salary_min)
+    whens = [(upper.is_(None), const(_NO_SALARY_BUCKET))]
+    whens += [(upper < const(edge), const(i)) for i, edge in enumerate(SALARY_BUCKET_EDGES)]
+    return case(*whens, else_=const(len(SALARY_BUCKET_EDGES)))
+
+
+def _sql_counts(db: Session, filters: Dict[str, Any]) -> Dict[str, Any]:
+    """All four facets from one grouped query."""
+    location_key = func.lower(func.trim(Job.location))
+    bucket = _salary_bucket_column()
+    dialect_name = db.get_bind().dialect.name
+
+    columns = [
+        Job.employment_type,
+        location_key,
+        bucket,
+        Job.company_id,
+        Company.name,
+        func.min(Job.location),
+        func.count(Job.id),
+    ]
+    grouped = dialect_name == "postgresql"
+    if grouped:
+        # 1 when the column is rolled up in a row's grouping set
+        columns += [
+            func.grouping(Job.employment_type),
+            func.grouping(location_key),
+            func.grouping(bucket),
+            func.grouping(Job.company_id),
+        ]
+
+    query = db.query(*columns).join(Company, Company.id == Job.company_id)
+    query = apply_job_filters(
+        query,
+        location=filters["location"],
+        employment_type=filters["employment_type"] and EmploymentType(filters["employment_type"]),
+        status=filters["status"] and JobStatus(filters["status"]),
+        salary_min=filters["salary_min"] and Decimal(filters["salary_min"]),
+        salary_max=filters["salary_max"] and Decimal(filters["salary_max"]),
+    )
+    if filters["q"]:
+        query = apply_text_search(query, filters["q"], dialect_name, ranked=False)
+
+    if grouped:
+        query = query.group_by(
+            func.grouping_sets(
+                tuple_(Job.employment_type),
+                tuple_(location_key),
+                tuple_(bucket),
+                tuple_(Job.company_id, Company.name),
+            )
+        )
+    else:
+        query = query.group_by(Job.employment_type, location_key, bucket, Job.company_id, Company.name)
+
+    employment: Counter = Counter()
+    locations: Counter = Counter()
+    location_labels: Dict[str, str] = {}
+    salary: Counter = Counter()
+    companies: Counter = Counter()
+    company_names: Dict[int, str] = {}
+
+    for row in query:
+        employment_type, key, bucket_value, company_id, company_name, label, count = row[:7]
+        # Without grouping sets every row carries all four facets
+        rolled_up = row[7:] if grouped else (0, 0, 0, 0)
+
+        if not rolled_up[0]:
+            employment[EmploymentType(employment_type).value] += count
+        if not rolled_up[1] and key:
+            locations[key] += count
+            location_labels.setdefault(key, label.strip())
+        if not rolled_up[2] and bucket_value != _NO_SALARY_BUCKET:
+            salary[bucket_value] += count
+        if not rolled_up[3]:
+            companies[company_id] += count
+            company_names[company_id] = company_name
+
+    return {
+        "total": sum(employment.values()),
+        "employment_type": dict(employment),
+        "location": {location_labels[key]: count for key, count in locations.items()},
+        "salary": dict(salary),
+        "company": dict(companies),
+        "company_names": company_names,
+    }
+
+
+def _index_counts(db: Session, filters: Dict[str, Any]) -> Dict[str, Any]:
+    counts = job_search_index.facet_counts(
+        filters["q"],
+        SALARY_BUCKET_EDGES,
+        location=filters["location"],
+        employment_type=filters["employment_type"],
+        salary_min=filters["salary_min"] and Decimal(filters["salary_min"]),
+        salary_max=filters["salary_max"] and Decimal(filters["salary_max"]),
+        status=filters["status"] and JobStatus(filters["status"]),
+    )
+    # The index only stores company ids
+    counts["company_names"] = dict(
+        db.query(Company.id, Company.name).filter(Company.id.in_(list(counts["company"])))
+    ) if counts["company"] else {}
+    return counts
+
+
+def _top(counts: Dict[Any, int], limit: int) -> List[tuple]:
+    """Most common values first, ties broken by value for stable output."""
+    return sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))[:limit]
+
+
+@cached(ttl_seconds=FACETS_CACHE_TTL, key_prefix="job_facets", tags=["jobs"])
+def get_job_facets(
+    filters: Dict[str, Any],
+    limit: int,
+    use_index: bool,
+    db: Session,
+) -> Dict[str, Any]:
+    """
+    Facet counts for a normalized filter set (see normalize_filters).
+
+    Args:
+        filters: Output of normalize_filters
+        limit: Maximum values returned for the location and company facets
+        use_index: Count from the in-process search index instead of SQL
+        db: Database session
+
+    Returns:
+        Plain dict matching JobFacetsResponse
+    """
+    counts = _index_counts(db, filters) if use_index else _sql_counts(db, filters)
+
+    edges = [None] + SALARY_BUCKET_EDGES + [None]
+    return {
+        "total": counts["total"],
+        "employment_type": [
+            {"value": value, "count": count}
+            for value, count in _top(counts["employment_type"], len(EmploymentType))
+        ],
+        "location": [
+            {"value": value, "count": count}
+            for value, count in _top(counts["location"], limit)
+        ],
+        "salary": [
+            {"min": edges[bucket], "max": edges[bucket + 1], "count": counts["salary"][bucket]}
+            for bucket in sorted(counts["salary"])
+        ],
+        "company": [
+            {"id": company_id, "name": counts["company_names"].get(company_id, ""), "count": count}
+            for company_id, count in _top(counts["company"], limit)
+        ],
+    }
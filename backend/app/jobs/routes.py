@@ -1,10 +1,20 @@
-from fastapi import APIRouter, Depends, status, Request
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, status, Request, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from typing import Any, List, Optional, Union
+from decimal import Decimal
 
-from app.database import get_db
-from app.models import Job, User, UserRole
-from app.jobs.schemas import JobCreate, JobUpdate, JobResponse
+from app.database import get_db, get_read_db, get_async_read_db
+from app.models import Job, User, UserRole, EmploymentType, JobStatus
+from app.jobs.schemas import (
+    JobCreate,
+    JobUpdate,
+    JobResponse,
+    JobPage,
+    JobFacetsResponse,
+    JobWithCompanyResponse,
+)
 from app.auth.permissions import require_roles
 from app.middleware.rate_limiter import limiter
 from app.middleware.rate_limits import (
@@ -12,9 +22,20 @@ from app.middleware.rate_limits import (
     PUBLIC_READ_LIMIT,
 )
 from app.cache import invalidate_cache
+from app.pagination import order_newest_first, paginate_keyset, paginate_keyset_async
+from app.jobs.search import apply_job_filters, apply_text_search
+from app.jobs.search_index import job_search_index
+from app.jobs.facets import get_job_facets, normalize_filters
+from app.config import settings
+from app.errors import APIError
+from app.serialization import json_response, model_columns, row_dicts
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+# Job lists are read as column tuples and serialized without ORM instances
+JOB_COLUMNS = model_columns(Job, JobResponse)
+JobList = List[JobResponse]
+
 
 # --------------------------------------------------
 # Create job (RATE LIMITED)
@@ -35,22 +56,212 @@ def create_job(
     db.commit()
     db.refresh(new_job)
 
-    invalidate_cache("jobs")
+    invalidate_cache("jobs", f"company:{new_job.company_id}")
     return new_job
 
 
 # --------------------------------------------------
 # List jobs (RATE LIMITED)
 # --------------------------------------------------
-@router.get("", response_model=List[JobResponse])
+def _index_available() -> bool:
+    return settings.JOB_SEARCH_INDEX_ENABLED and job_search_index.ready
+
+
+def _search_index(
+    text_query: str,
+    status: Optional[JobStatus],
+    limit: int,
+    skip: int,
+    location: Optional[str],
+    employment_type: Optional[EmploymentType],
+    salary_min: Optional[Decimal],
+    salary_max: Optional[Decimal],
+) -> Optional[List[int]]:
+    """Ranked job ids from the in-process index, or None when it does not apply."""
+    if not (text_query and _index_available()):
+        return None
+    return job_search_index.search(
+        text_query,
+        limit=limit,
+        offset=skip,
+        location=location,
+        employment_type=employment_type,
+        salary_min=salary_min,
+        salary_max=salary_max,
+        status=status,
+    )
+
+
+def _in_index_order(job_ids: List[int], jobs: List[Any]) -> List[Any]:
+    rows = {job.id: job for job in jobs}
+    return [rows[job_id] for job_id in job_ids if job_id in rows]
+
+
 @limiter.limit(PUBLIC_READ_LIMIT)
 def list_jobs(
     request: Request,  # ✅ REQUIRED for SlowAPI
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor; pass an empty value for the first page",
+    ),
+    q: Optional[str] = Query(None, max_length=200, description="Full-text query"),
+    search: Optional[str] = Query(None, max_length=200, description="Alias of q"),
+    location: Optional[str] = Query(None, max_length=150),
+    employment_type: Optional[EmploymentType] = None,
+    status: Optional[JobStatus] = None,
+    salary_min: Optional[Decimal] = Query(None, ge=0),
+    salary_max: Optional[Decimal] = Query(None, ge=0),
+    db: Session = Depends(get_read_db),
+):
+    """
+    Search and list jobs.
+
+    With a text query results are ranked by relevance over title, skills
+    and description; otherwise they are newest first. Filters are applied
+    in the same SQL query. When JOB_SEARCH_INDEX_ENABLED is set, text
+    queries are answered from the in-process index.
+
+    Without `cursor` this returns a plain list paged by skip/limit. With
+    `cursor` it returns `{items, next_cursor}` ordered newest first (text
+    matches are filtered, not ranked); pass `next_cursor` back to fetch
+    the following page.
+    """
+    text_query = (q or search or "").strip()
+    dialect_name = db.get_bind().dialect.name
+
+    query = apply_job_filters(
+        db.query(*JOB_COLUMNS),
+        location=location,
+        employment_type=employment_type,
+        status=status,
+        salary_min=salary_min,
+        salary_max=salary_max,
+    )
+
+    if cursor is not None:
+        if text_query:
+            query = apply_text_search(query, text_query, dialect_name, ranked=False)
+        items, next_cursor = paginate_keyset(query, Job.created_at, Job.id, cursor, limit)
+        return json_response(JobPage, {"items": row_dicts(items), "next_cursor": next_cursor})
+
+    # Match and rank in memory, then load just this page by primary key
+    job_ids = _search_index(
+        text_query, status, limit, skip, location, employment_type, salary_min, salary_max
+    )
+    if job_ids is not None:
+        if not job_ids:
+            return []
+        jobs = db.query(*JOB_COLUMNS).filter(Job.id.in_(job_ids)).all()
+        return json_response(JobList, row_dicts(_in_index_order(job_ids, jobs)))
+
+    if text_query:
+        query = apply_text_search(query, text_query, dialect_name)
+    else:
+        query = order_newest_first(query, Job.created_at, Job.id)
+
+    return json_response(JobList, row_dicts(query.offset(skip).limit(limit)))
+
+
+@limiter.limit(PUBLIC_READ_LIMIT)
+async def list_jobs_async(
+    request: Request,  # ✅ REQUIRED for SlowAPI
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = Query(
+        None,
+        description="Keyset pagination cursor; pass an empty value for the first page",
+    ),
+    q: Optional[str] = Query(None, max_length=200, description="Full-text query"),
+    search: Optional[str] = Query(None, max_length=200, description="Alias of q"),
+    location: Optional[str] = Query(None, max_length=150),
+    employment_type: Optional[EmploymentType] = None,
+    status: Optional[JobStatus] = None,
+    salary_min: Optional[Decimal] = Query(None, ge=0),
+    salary_max: Optional[Decimal] = Query(None, ge=0),
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """list_jobs on the async engine (DATABASE_MODE=async)."""
+    text_query = (q or search or "").strip()
+    dialect_name = db.bind.dialect.name
+
+    stmt = apply_job_filters(
+        select(*JOB_COLUMNS),
+        location=location,
+        employment_type=employment_type,
+        status=status,
+        salary_min=salary_min,
+        salary_max=salary_max,
+    )
+
+    if cursor is not None:
+        if text_query:
+            stmt = apply_text_search(stmt, text_query, dialect_name, ranked=False)
+        items, next_cursor = await paginate_keyset_async(
+            db, stmt, Job.created_at, Job.id, cursor, limit, rows=True
+        )
+        return json_response(JobPage, {"items": row_dicts(items), "next_cursor": next_cursor})
+
+    job_ids = _search_index(
+        text_query, status, limit, skip, location, employment_type, salary_min, salary_max
+    )
+    if job_ids is not None:
+        if not job_ids:
+            return []
+        jobs = await db.execute(select(*JOB_COLUMNS).where(Job.id.in_(job_ids)))
+        return json_response(JobList, row_dicts(_in_index_order(job_ids, jobs.all())))
+
+    if text_query:
+        stmt = apply_text_search(stmt, text_query, dialect_name)
+    else:
+        stmt = order_newest_first(stmt, Job.created_at, Job.id)
+
+    result = await db.execute(stmt.offset(skip).limit(limit))
+    return json_response(JobList, row_dicts(result))
+
+
+router.add_api_route(
+    "",
+    list_jobs_async if settings.use_async_db else list_jobs,
+    methods=["GET"],
+    response_model=Union[List[JobResponse], JobPage],
+)
+
+
+# --------------------------------------------------
+# Facet counts (RATE LIMITED)
+# --------------------------------------------------
+@router.get("/facets", response_model=JobFacetsResponse)
+@limiter.limit(PUBLIC_READ_LIMIT)
+def job_facets(
+    request: Request,  # ✅ REQUIRED for SlowAPI
+    q: Optional[str] = Query(None, max_length=200, description="Full-text query"),
+    search: Optional[str] = Query(None, max_length=200, description="Alias of q"),
+    location: Optional[str] = Query(None, max_length=150),
+    employment_type: Optional[EmploymentType] = None,
+    status: Optional[JobStatus] = None,
+    salary_min: Optional[Decimal] = Query(None, ge=0),
+    salary_max: Optional[Decimal] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100, description="Max location/company values"),
+    # Primary, not a replica: the counts are cached under the "jobs" tag
+    # and a lagging replica would re-cache pre-invalidation counts
     db: Session = Depends(get_db),
 ):
-    return db.query(Job).offset(skip).limit(limit).all()
+    """
+    Counts per employment type, location, salary bucket and company for
+    the same filters GET /jobs accepts.
+    """
+    filters = normalize_filters(
+        q=q or search,
+        location=location,
+        employment_type=employment_type,
+        status=status,
+        salary_min=salary_min,
+        salary_max=salary_max,
+    )
+    use_index = bool(filters["q"]) and _index_available()
+    return get_job_facets(filters, limit, use_index, db)
 
 
 # --------------------------------------------------
@@ -62,3 +273,29 @@ def my_jobs(
     db: Session = Depends(get_db),
 ):
     return db.query(Job).filter(Job.employer_id == current_user.id).all()
+
+
+# --------------------------------------------------
+# Job detail (RATE LIMITED)
+# --------------------------------------------------
+@router.get("/{job_id}", response_model=JobWithCompanyResponse)
+@limiter.limit(PUBLIC_READ_LIMIT)
+def get_job(
+    request: Request,  # ✅ REQUIRED for SlowAPI
+    job_id: int,
+    db: Session = Depends(get_read_db),
+):
+    """Job with its company, loaded in one joined query."""
+    job = (
+        db.query(Job)
+        .options(joinedload(Job.company))
+        .filter(Job.id == job_id)
+        .first()
+    )
+    if not job:
+        raise APIError(
+            code="JOB_NOT_FOUND",
+            message="Job not found",
+            status_code=status.HTTP_404_NOT_FOUND,
+        )
+    return job
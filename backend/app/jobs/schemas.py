@@ -1,8 +1,9 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 from app.models import EmploymentType, JobStatus
+from app.pagination import CursorPage
 
 
 class JobCreate(BaseModel):
@@ -44,6 +45,35 @@ class JobResponse(BaseModel):
         from_attributes = True
 
 
+class JobPage(CursorPage[JobResponse]):
+    pass
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class SalaryBucketCount(BaseModel):
+    min: Optional[Decimal] = None
+    max: Optional[Decimal] = None
+    count: int
+
+
+class CompanyFacetCount(BaseModel):
+    id: int
+    name: str
+    count: int
+
+
+class JobFacetsResponse(BaseModel):
+    total: int
+    employment_type: List[FacetCount]
+    location: List[FacetCount]
+    salary: List[SalaryBucketCount]
+    company: List[CompanyFacetCount]
+
+
 class CompanyInfo(BaseModel):
     id: int
     name: str
@@ -0,0 +1,201 @@
+"""
+Full-text job search.
+
+Postgres: a generated, weighted `tsvector` column on jobs with a GIN index,
+queried with websearch_to_tsquery and ranked by ts_rank_cd.
+
+SQLite: an external-content FTS5 table kept in sync by triggers, ranked by
+bm25.
+
+The search column / virtual table is created by migration 005, or by
+ensure_search_index() for databases built with Base.metadata.create_all.
+Structured filters are applied to the same query so the database can
+combine them with the text match in one plan.
+"""
+from typing import List, Optional, TypeVar
+from decimal import Decimal
+import re
+
+from sqlalchemy import Float, Integer, Select, func, literal_column, or_, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Query
+
+from app.models import Job, EmploymentType, JobStatus
+
+TS_CONFIG = "english"
+
+# Helpers accept legacy Query objects and 2.0 select() statements alike
+QueryT = TypeVar("QueryT", Query, Select)
+
+# Title matches weigh most, then skills, then the description
+POSTGRES_DDL = [
+    f"""
+    ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(required_skills, '')), 'B') ||
+        setweight(to_tsvector('{TS_CONFIG}', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_jobs_search_vector ON jobs USING GIN (search_vector)",
+]
+
+POSTGRES_DROP_DDL = [
+    "DROP INDEX IF EXISTS idx_jobs_search_vector",
+    "ALTER TABLE jobs DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+        title, description, required_skills,
+        content='jobs', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ai AFTER INSERT ON jobs BEGIN
+        INSERT INTO jobs_fts(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_ad AFTER DELETE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS jobs_fts_au AFTER UPDATE ON jobs BEGIN
+        INSERT INTO jobs_fts(jobs_fts, rowid, title, description, required_skills)
+        VALUES ('delete', old.id, old.title, old.description, old.required_skills);
+        INSERT INTO jobs_fts(rowid, title, description, required_skills)
+        VALUES (new.id, new.title, new.description, new.required_skills);
+    END
+    """,
+    "INSERT INTO jobs_fts(jobs_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DROP_DDL = [
+    "DROP TRIGGER IF EXISTS jobs_fts_au",
+    "DROP TRIGGER IF EXISTS jobs_fts_ad",
+    "DROP TRIGGER IF EXISTS jobs_fts_ai",
+    "DROP TABLE IF EXISTS jobs_fts",
+]
+
+
+def search_ddl(dialect_name: str, drop: bool = False) -> List[str]:
+    """DDL statements that create (or drop) the search index for a dialect."""
+    if dialect_name == "postgresql":
+        return POSTGRES_DROP_DDL if drop else POSTGRES_DDL
+    if dialect_name == "sqlite":
+        return SQLITE_DROP_DDL if drop else SQLITE_DDL
+    return []
+
+
+def ensure_search_index(connection: Connection) -> None:
+    """Idempotently create the search column / virtual table."""
+    for statement in search_ddl(connection.dialect.name):
+        connection.execute(text(statement))
+
+
+# --------------------------------------------------
+# Query building
+# --------------------------------------------------
+def _fts5_match_expression(q: str) -> Optional[str]:
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Each word becomes a quoted prefix term, ANDed together, so user input
+    can never inject FTS5 syntax.
+    """
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def apply_job_filters(
+    query: QueryT,
+    location: Optional[str] = None,
+    employment_type: Optional[EmploymentType] = None,
+    status: Optional[JobStatus] = None,
+    salary_min: Optional[Decimal] = None,
+    salary_max: Optional[Decimal] = None,
+) -> QueryT:
+    """
+    Apply structured job filters.
+
+    The salary filters select jobs whose advertised range overlaps
+    [salary_min, salary_max]; a job with only one bound is compared on it.
+    """
+    if location:
+        query = query.filter(Job.location.ilike(f"%{location}%"))
+
+    if employment_type is not None:
+        query = query.filter(Job.employment_type == employment_type)
+
+    if status is not None:
+        query = query.filter(Job.status == status)
+
+    if salary_min is not None:
+        query = query.filter(func.coalesce(Job.salary_max, Job.salary_min) >= salary_min)
+
+    if salary_max is not None:
+        query = query.filter(func.coalesce(Job.salary_min, Job.salary_max) <= salary_max)
+
+    return query
+
+
+def apply_text_search(query: QueryT, q: str, dialect_name: str, ranked: bool = True) -> QueryT:
+    """
+    Restrict query to jobs matching q.
+
+    With ranked=True the query is ordered by relevance (best first, newest
+    as tie-breaker); otherwise ordering is left to the caller, e.g. keyset
+    pagination.
+    """
+    if dialect_name == "postgresql":
+        ts_query = func.websearch_to_tsquery(TS_CONFIG, q)
+        vector = literal_column("jobs.search_vector")
+        query = query.filter(vector.op("@@")(ts_query))
+        if ranked:
+            query = query.order_by(
+                func.ts_rank_cd(vector, ts_query).desc(),
+                Job.created_at.desc(),
+                Job.id.desc(),
+            )
+        return query
+
+    if dialect_name == "sqlite":
+        match = _fts5_match_expression(q)
+        if match is None:
+            return query
+        # bm25 column weights follow the Postgres setweight order
+        fts = (
+            text(
+                "SELECT rowid AS job_id, bm25(jobs_fts, 10.0, 1.0, 4.0) AS rank "
+                "FROM jobs_fts WHERE jobs_fts MATCH :match"
+            )
+            .bindparams(match=match)
+            .columns(job_id=Integer, rank=Float)
+            .subquery("fts")
+        )
+        query = query.join(fts, fts.c.job_id == Job.id)
+        if ranked:
+            # bm25 scores are lower for better matches
+            query = query.order_by(fts.c.rank.asc(), Job.created_at.desc(), Job.id.desc())
+        return query
+
+    # Other databases: unindexed substring match
+    pattern = f"%{q}%"
+    query = query.filter(
+        or_(
+            Job.title.ilike(pattern),
+            Job.description.ilike(pattern),
+            Job.required_skills.ilike(pattern),
+        )
+    )
+    if ranked:
+        query = query.order_by(Job.created_at.desc(), Job.id.desc())
+    return query
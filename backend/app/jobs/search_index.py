@@ -0,0 +1,705 @@
+"""
+In-process inverted index over jobs.
+
+Optional fast path for GET /jobs?q= (JOB_SEARCH_INDEX_ENABLED). Titles,
+skills and descriptions are tokenized into posting lists stored in compact
+typed arrays and ranked with BM25, so matching and ranking never touch the
+database; the route only loads the final page of rows by primary key.
+
+Like the SQLite FTS5 path, every query word matches as a prefix ("dev"
+finds "developer") and all words must match. Unlike FTS5 (porter) and
+Postgres (english), words are not stemmed, so "developers" does not find
+"developer", and stopwords in the query are ignored rather than matched.
+
+Every job is indexed with its status, so a status filter (or none) matches
+the same rows as the SQL path. Deleted jobs are removed.
+
+Each worker builds its own copy at startup and keeps it current from
+SQLAlchemy session events: Job rows flushed in a session are snapshotted and
+applied once the transaction commits. The changed job ids are then published
+on the cache invalidation bus (app.cache_sync); every other worker reloads
+those rows in a background thread. When the bus may have dropped messages
+(listener reconnect) or an admin rebuilds the index, workers rebuild in full.
+Changes applied while a rebuild reads the table are journaled and replayed
+onto the new index before it replaces the old one.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter, OrderedDict
+from decimal import Decimal
+import heapq
+import logging
+import math
+import re
+import sys
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import (
+    ALL_TAGS,
+    add_remote_invalidation_handler,
+    publish_invalidation,
+    remove_remote_invalidation_handler,
+)
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Job, JobStatus, EmploymentType
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Field weights folded into term frequencies
+TITLE_WEIGHT = 3
+SKILLS_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+# Compact once this fraction of document slots are tombstones
+COMPACT_RATIO = 0.25
+
+MAX_TF = 65535
+
+# Recently answered searches kept until the next index write
+RESULT_CACHE_SIZE = 1024
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from in is it of on or the to with".split()
+)
+
+_TOKEN_RE = re.compile(r"\w+")
+
+_EMPLOYMENT_TYPES = list(EmploymentType)
+_EMPLOYMENT_CODES = {value: code for code, value in enumerate(_EMPLOYMENT_TYPES)}
+_STATUS_CODES = {value: code for code, value in enumerate(JobStatus)}
+
+# Sentinel for missing salary bounds in the float arrays
+_NO_SALARY = float("nan")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Lowercase word tokens without stopwords."""
+    if not text:
+        return []
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def snapshot_job(job: Job) -> Dict[str, Any]:
+    """Plain copy of the indexed fields, safe to use after the session closes."""
+    return {
+        "id": job.id,
+        "title": job.title,
+        "description": job.description,
+        "required_skills": job.required_skills,
+        "location": job.location,
+        "employment_type": job.employment_type,
+        "salary_min": job.salary_min,
+        "salary_max": job.salary_max,
+        "company_id": job.company_id,
+        "status": job.status,
+    }
+
+
+def _salary(value: Optional[Decimal]) -> float:
+    return _NO_SALARY if value is None else float(value)
+
+
+class JobSearchIndex:
+    """
+    BM25 inverted index with array-backed posting lists.
+
+    Documents are numbered in insertion order, so every posting list is
+    sorted by document number and appends are O(1). Removing a job marks
+    its slot dead; dead slots are dropped by periodic compaction.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.ready = False
+        # One job id -> snapshot (None if removed) journal per running rebuild
+        self._journals: List[Dict[int, Optional[Dict[str, Any]]]] = []
+        self._reset()
+
+    @property
+    def building(self) -> bool:
+        return bool(self._journals)
+
+    def _reset(self) -> None:
+        # term -> (doc numbers, weighted term frequencies)
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        # Every term in _postings, sorted for prefix lookups
+        self._vocabulary: List[str] = []
+
+        # Per-document columns, indexed by document number
+        self._job_ids = array("I")
+        self._lengths = array("I")
+        # K1 * (1 - B + B * length / avg_length), fixed when the doc is
+        # added so queries do not recompute it per posting
+        self._norms = array("f")
+        self._alive = bytearray()
+        self._employment = array("B")
+        self._status = array("B")
+        self._location = array("I")
+        self._company = array("I")
+        self._salary_min = array("d")
+        self._salary_max = array("d")
+
+        self._doc_by_job: Dict[int, int] = {}
+        # Normalized location names and the first spelling seen of each
+        self._locations: List[str] = [""]
+        self._location_labels: List[str] = [""]
+        self._location_ids: Dict[str, int] = {"": 0}
+
+        self._live_docs = 0
+        self._total_length = 0
+        # Average length used for norms; refreshed by rebuild/compaction
+        self._avg_length = 0.0
+
+        self._results: "OrderedDict[tuple, List[int]]" = OrderedDict()
+
+    # --------------------------------------------------
+    # Writes
+    # --------------------------------------------------
+    def add(self, job: Dict[str, Any]) -> None:
+        """Index (or re-index) a job snapshot."""
+        with self._lock:
+            for journal in self._journals:
+                journal[job["id"]] = job
+            # Re-indexing leaves a dead slot behind, just like remove()
+            self._remove_locked(job["id"])
+            self._maybe_compact()
+
+            counts: Dict[str, int] = {}
+            for field, weight in (
+                ("title", TITLE_WEIGHT),
+                ("required_skills", SKILLS_WEIGHT),
+                ("description", DESCRIPTION_WEIGHT),
+            ):
+                for token in tokenize(job.get(field)):
+                    counts[token] = counts.get(token, 0) + weight
+
+            doc = len(self._job_ids)
+            length = sum(counts.values())
+            for term, tf in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = (array("I"), array("H"))
+                    insort(self._vocabulary, term)
+                postings[0].append(doc)
+                postings[1].append(min(tf, MAX_TF))
+
+            label = (job["location"] or "").strip()
+            location = label.lower()
+            location_id = self._location_ids.get(location)
+            if location_id is None:
+                location_id = self._location_ids[location] = len(self._locations)
+                self._locations.append(location)
+                self._location_labels.append(label)
+
+            avg_length = self._avg_length or (
+                (self._total_length + length) / (self._live_docs + 1)
+            )
+
+            self._job_ids.append(job["id"])
+            self._lengths.append(length)
+            self._norms.append(K1 * (1 - B + B * length / max(avg_length, 1.0)))
+            self._alive.append(1)
+            self._employment.append(_EMPLOYMENT_CODES[EmploymentType(job["employment_type"])])
+            self._status.append(_STATUS_CODES[JobStatus(job["status"])])
+            self._location.append(location_id)
+            self._company.append(job["company_id"])
+            self._salary_min.append(_salary(job["salary_min"]))
+            self._salary_max.append(_salary(job["salary_max"]))
+
+            self._doc_by_job[job["id"]] = doc
+            self._live_docs += 1
+            self._total_length += length
+            self._results.clear()
+
+    def remove(self, job_id: int) -> None:
+        with self._lock:
+            for journal in self._journals:
+                journal[job_id] = None
+            self._remove_locked(job_id)
+            self._maybe_compact()
+
+    def _remove_locked(self, job_id: int) -> None:
+        doc = self._doc_by_job.pop(job_id, None)
+        if doc is None:
+            return
+        self._alive[doc] = 0
+        self._live_docs -= 1
+        self._total_length -= self._lengths[doc]
+        self._results.clear()
+
+    def _maybe_compact(self) -> None:
+        dead = len(self._job_ids) - self._live_docs
+        if dead > 1000 and dead > COMPACT_RATIO * len(self._job_ids):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drop dead document slots and renumber the survivors."""
+        started = time.perf_counter()
+        remap = array("i", [-1]) * len(self._job_ids)
+        next_doc = 0
+        for doc, alive in enumerate(self._alive):
+            if alive:
+                remap[doc] = next_doc
+                next_doc += 1
+
+        postings = {}
+        for term, (docs, tfs) in self._postings.items():
+            new_docs, new_tfs = array("I"), array("H")
+            for doc, tf in zip(docs, tfs):
+                mapped = remap[doc]
+                if mapped >= 0:
+                    new_docs.append(mapped)
+                    new_tfs.append(tf)
+            if new_docs:
+                postings[term] = (new_docs, new_tfs)
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+
+        keep = [doc for doc, alive in enumerate(self._alive) if alive]
+        for name, typecode in (
+            ("_job_ids", "I"), ("_lengths", "I"), ("_norms", "f"), ("_employment", "B"),
+            ("_status", "B"), ("_location", "I"), ("_company", "I"),
+            ("_salary_min", "d"), ("_salary_max", "d"),
+        ):
+            column = getattr(self, name)
+            setattr(self, name, array(typecode, (column[doc] for doc in keep)))
+        self._alive = bytearray(b"\x01") * len(keep)
+        self._doc_by_job = {job_id: doc for doc, job_id in enumerate(self._job_ids)}
+        self._refresh_norms()
+
+        logger.info(
+            f"Job search index compacted to {len(keep)} docs "
+            f"in {time.perf_counter() - started:.3f}s"
+        )
+
+    def _refresh_norms(self) -> None:
+        """Recompute length norms against the current average length."""
+        self._avg_length = max(self._total_length / max(self._live_docs, 1), 1.0)
+        scale = K1 * B / self._avg_length
+        base = K1 * (1 - B)
+        self._norms = array("f", (base + scale * length for length in self._lengths))
+        self._results.clear()
+
+    def rebuild(self, jobs: Iterable[Dict[str, Any]]) -> None:
+        """
+        Replace the whole index with the given job snapshots.
+
+        jobs may be a lazy query: changes applied to this index while it is
+        consumed are replayed onto the new index before the swap, so a
+        commit the query did not see is not lost.
+        """
+        journal: Dict[int, Optional[Dict[str, Any]]] = {}
+        with self._lock:
+            self._journals.append(journal)
+        try:
+            fresh = JobSearchIndex()
+            for job in jobs:
+                fresh.add(job)
+            with self._lock:
+                for job_id, job in journal.items():
+                    if job is None:
+                        fresh.remove(job_id)
+                    else:
+                        fresh.add(job)
+                fresh._refresh_norms()
+                self.__dict__.update(
+                    {k: v for k, v in fresh.__dict__.items() if k not in ("_lock", "_journals")}
+                )
+                self.ready = True
+        finally:
+            with self._lock:
+                self._journals.remove(journal)
+
+    def rebuild_from_db(self, db: Session, batch_size: int = 5000) -> Dict[str, Any]:
+        """Rebuild from all jobs, streaming rows in batches."""
+        started = time.perf_counter()
+        rows = db.query(Job).yield_per(batch_size)
+        self.rebuild(snapshot_job(job) for job in rows)
+        stats = self.stats()
+        stats["build_seconds"] = round(time.perf_counter() - started, 3)
+        logger.info(f"Job search index built: {stats}")
+        return stats
+
+    # --------------------------------------------------
+    # Reads
+    # --------------------------------------------------
+    def _filter_docs(
+        self,
+        location: Optional[str],
+        employment_type: Optional[EmploymentType],
+        salary_min: Optional[Decimal],
+        salary_max: Optional[Decimal],
+        status: Optional[JobStatus] = None,
+        company_id: Optional[int] = None,
+    ):
+        """Build a per-document predicate for the structured filters."""
+        location_ids: Optional[Set[int]] = None
+        if location:
+            needle = location.strip().lower()
+            location_ids = {
+                i for i, name in enumerate(self._locations) if needle in name
+            }
+        employment_code = (
+            _EMPLOYMENT_CODES[EmploymentType(employment_type)]
+            if employment_type is not None else None
+        )
+        status_code = _STATUS_CODES[JobStatus(status)] if status is not None else None
+        low = float(salary_min) if salary_min is not None else None
+        high = float(salary_max) if salary_max is not None else None
+
+        def accept(doc: int) -> bool:
+            if location_ids is not None and self._location[doc] not in location_ids:
+                return False
+            if employment_code is not None and self._employment[doc] != employment_code:
+                return False
+            if status_code is not None and self._status[doc] != status_code:
+                return False
+            if company_id is not None and self._company[doc] != company_id:
+                return False
+            if low is not None or high is not None:
+                job_min, job_max = self._salary_min[doc], self._salary_max[doc]
+                upper = job_max if job_max == job_max else job_min
+                lower = job_min if job_min == job_min else job_max
+                # NaN comparisons are False, so jobs without salary drop out
+                if low is not None and not upper >= low:
+                    return False
+                if high is not None and not lower <= high:
+                    return False
+            return True
+
+        return accept
+
+    def _prefix_postings(self, prefix: str) -> Optional[Tuple[array, array]]:
+        """Postings of every term starting with prefix, merged per doc."""
+        start = bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in self._vocabulary[start:]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        if len(terms) <= 1:
+            return self._postings[terms[0]] if terms else None
+
+        merged: Dict[int, int] = {}
+        for term in terms:
+            docs, tfs = self._postings[term]
+            for doc, tf in zip(docs, tfs):
+                merged[doc] = merged.get(doc, 0) + tf
+        docs = array("I", sorted(merged))
+        return docs, array("H", (min(merged[doc], MAX_TF) for doc in docs))
+
+    def _matching_docs(self, terms: List[str]) -> Dict[int, float]:
+        """BM25 scores of live docs matching every term as a prefix."""
+        lists = []
+        for term in set(terms):
+            postings = self._prefix_postings(term)
+            if postings is None:
+                return {}
+            lists.append(postings)
+        if not lists:
+            return {}
+
+        # Intersect starting from the rarest term
+        lists.sort(key=lambda postings: len(postings[0]))
+        n = max(self._live_docs, 1)
+        alive, norms = self._alive, self._norms
+        k1_plus_1 = K1 + 1
+
+        docs, tfs = lists[0]
+        idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+        scores = {
+            doc: idf * tf * k1_plus_1 / (tf + norms[doc])
+            for doc, tf in zip(docs, tfs)
+            if alive[doc]
+        }
+
+        for docs, tfs in lists[1:]:
+            if not scores:
+                break
+            idf = math.log(1 + (n - len(docs) + 0.5) / (len(docs) + 0.5))
+            narrowed = {}
+            if len(scores) * 16 < len(docs):
+                # Few candidates: binary search the longer, sorted list
+                size = len(docs)
+                for doc, score in scores.items():
+                    pos = bisect_left(docs, doc)
+                    if pos < size and docs[pos] == doc:
+                        tf = tfs[pos]
+                        narrowed[doc] = score + idf * tf * k1_plus_1 / (tf + norms[doc])
+            else:
+                for doc, tf in zip(docs, tfs):
+                    score = scores.get(doc)
+                    if score is not None:
+                        narrowed[doc] = score + idf * tf * k1_plus_1 / (tf + norms[doc])
+            scores = narrowed
+        return scores
+
+    def search(
+        self,
+        q: str,
+        limit: int = 100,
+        offset: int = 0,
+        location: Optional[str] = None,
+        employment_type: Optional[EmploymentType] = None,
+        salary_min: Optional[Decimal] = None,
+        salary_max: Optional[Decimal] = None,
+        status: Optional[JobStatus] = None,
+    ) -> List[int]:
+        """Job ids matching every query term, best BM25 score first."""
+        terms = tokenize(q)
+        cache_key = (
+            tuple(sorted(set(terms))), limit, offset, location,
+            employment_type, salary_min, salary_max, status,
+        )
+        with self._lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                return list(cached)
+
+            scores = self._matching_docs(terms)
+            candidates = scores.items()
+            if (location or employment_type is not None or salary_min is not None
+                    or salary_max is not None or status is not None):
+                accept = self._filter_docs(location, employment_type, salary_min, salary_max, status)
+                candidates = [(doc, score) for doc, score in candidates if accept(doc)]
+            # Newer documents (higher numbers) win ties
+            top = heapq.nlargest(offset + limit, ((score, doc) for doc, score in candidates))
+            result = [self._job_ids[doc] for _, doc in top[offset:]]
+
+            self._results[cache_key] = result
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+            return list(result)
+
+    def facet_counts(
+        self,
+        q: str,
+        salary_edges: List[float],
+        location: Optional[str] = None,
+        employment_type: Optional[EmploymentType] = None,
+        salary_min: Optional[Decimal] = None,
+        salary_max: Optional[Decimal] = None,
+        status: Optional[JobStatus] = None,
+    ) -> Dict[str, Any]:
+        """
+        Count matching jobs per employment type, location, salary bucket
+        and company in one pass over the matching documents.
+
+        Salary buckets are numbered by bisect_right(salary_edges, upper
+        bound); jobs without a salary are not bucketed.
+        """
+        with self._lock:
+            docs = self._matching_docs(tokenize(q))
+            if (location or employment_type is not None or salary_min is not None
+                    or salary_max is not None or status is not None):
+                accept = self._filter_docs(location, employment_type, salary_min, salary_max, status)
+                docs = [doc for doc in docs if accept(doc)]
+
+            employment: Counter = Counter()
+            locations: Counter = Counter()
+            salary: Counter = Counter()
+            companies: Counter = Counter()
+            for doc in docs:
+                employment[self._employment[doc]] += 1
+                locations[self._location[doc]] += 1
+                companies[self._company[doc]] += 1
+                job_min, job_max = self._salary_min[doc], self._salary_max[doc]
+                upper = job_max if job_max == job_max else job_min
+                if upper == upper:
+                    salary[bisect_right(salary_edges, upper)] += 1
+
+            return {
+                "total": len(docs),
+                "employment_type": {
+                    _EMPLOYMENT_TYPES[code].value: count for code, count in employment.items()
+                },
+                "location": {
+                    self._location_labels[location_id]: count
+                    for location_id, count in locations.items()
+                    if location_id
+                },
+                "salary": dict(salary),
+                "company": dict(companies),
+            }
+
+    # --------------------------------------------------
+    # Accounting
+    # --------------------------------------------------
+    def memory_bytes(self) -> int:
+        """Approximate heap usage of the index structures."""
+        with self._lock:
+            total = sys.getsizeof(self._postings) + sys.getsizeof(self._vocabulary)
+            for term, (docs, tfs) in self._postings.items():
+                total += sys.getsizeof(term) + sys.getsizeof(docs) + sys.getsizeof(tfs) + 64
+            for column in (
+                self._job_ids, self._lengths, self._norms, self._alive, self._employment,
+                self._status, self._location, self._company, self._salary_min, self._salary_max,
+            ):
+                total += sys.getsizeof(column)
+            total += sys.getsizeof(self._doc_by_job) + 28 * len(self._doc_by_job)
+            total += sum(sys.getsizeof(name) for name in self._locations)
+            total += sum(sys.getsizeof(name) for name in self._location_labels)
+            return total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "ready": self.ready,
+                "documents": self._live_docs,
+                "slots": len(self._job_ids),
+                "terms": len(self._postings),
+                "postings": sum(len(docs) for docs, _ in self._postings.values()),
+                "memory_bytes": self.memory_bytes(),
+            }
+
+
+# Process-wide index
+job_search_index = JobSearchIndex()
+
+
+# --------------------------------------------------
+# Incremental updates from the ORM
+# --------------------------------------------------
+_PENDING_KEY = "job_search_index_pending"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_job_changes(session: Session, flush_context) -> None:
+    # Collected before the first build completes too: a commit landing
+    # after the build's query read the table must still reach it
+    if not (settings.JOB_SEARCH_INDEX_ENABLED or job_search_index.ready):
+        return
+    pending = session.info.setdefault(_PENDING_KEY, {})
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Job):
+            pending[obj.id] = snapshot_job(obj)
+    for obj in session.deleted:
+        if isinstance(obj, Job):
+            pending[obj.id] = None
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_job_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    # Before any build started there is nothing to update: it reads the row
+    if job_search_index.ready or job_search_index.building:
+        for job_id, job in pending.items():
+            if job is None:
+                job_search_index.remove(job_id)
+            else:
+                job_search_index.add(job)
+    publish_invalidation(*(f"{JOB_TAG_PREFIX}{job_id}" for job_id in pending))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_job_changes(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# --------------------------------------------------
+# Updates from other workers
+# --------------------------------------------------
+# Invalidation bus tags: one job changed, or rebuild the whole index
+JOB_TAG_PREFIX = "search-index:job:"
+REBUILD_TAG = "search-index:rebuild"
+
+SYNC_RETRY_SECONDS = 5.0
+
+_sync_lock = threading.Lock()
+_sync_pending: Set[int] = set()
+_sync_rebuild = False
+_sync_wakeup = threading.Event()
+_sync_stop = threading.Event()
+_sync_thread: Optional[threading.Thread] = None
+
+
+def _queue_remote_changes(tags: Tuple[str, ...]) -> None:
+    """Remote invalidation handler; runs on the bus listener thread."""
+    global _sync_rebuild
+    with _sync_lock:
+        for tag in tags:
+            if tag in (ALL_TAGS, REBUILD_TAG):
+                # ALL_TAGS after a listener reconnect: job messages may be lost
+                _sync_rebuild = True
+            elif tag.startswith(JOB_TAG_PREFIX):
+                _sync_pending.add(int(tag[len(JOB_TAG_PREFIX):]))
+    _sync_wakeup.set()
+
+
+def _sync_once() -> bool:
+    """Apply the queued changes; False if that failed."""
+    global _sync_rebuild
+    with _sync_lock:
+        job_ids = list(_sync_pending)
+        rebuild = _sync_rebuild
+        _sync_pending.clear()
+        _sync_rebuild = False
+    if not (job_search_index.ready or job_search_index.building) or not (job_ids or rebuild):
+        # No build started yet: it will read current rows anyway
+        return True
+
+    db = SessionLocal()
+    try:
+        if rebuild:
+            job_search_index.rebuild_from_db(db)
+            return True
+        jobs = {job.id: snapshot_job(job) for job in db.query(Job).filter(Job.id.in_(job_ids))}
+        for job_id in job_ids:
+            if job_id in jobs:
+                job_search_index.add(jobs[job_id])
+            else:
+                job_search_index.remove(job_id)
+        return True
+    except Exception:
+        logger.exception("Job search index sync failed; rebuilding")
+        with _sync_lock:
+            _sync_rebuild = True
+        return False
+    finally:
+        db.close()
+
+
+def _sync_loop() -> None:
+    while True:
+        _sync_wakeup.wait()
+        _sync_wakeup.clear()
+        if _sync_stop.is_set():
+            return
+        if not _sync_once() and not _sync_stop.wait(SYNC_RETRY_SECONDS):
+            _sync_wakeup.set()
+
+
+def start_search_index_sync() -> None:
+    """Apply job changes published by other workers in a daemon thread."""
+    global _sync_thread
+    if not settings.JOB_SEARCH_INDEX_ENABLED:
+        return
+    if _sync_thread and _sync_thread.is_alive():
+        return
+    _sync_stop.clear()
+    add_remote_invalidation_handler(_queue_remote_changes)
+    _sync_thread = threading.Thread(target=_sync_loop, name="search-index-sync", daemon=True)
+    _sync_thread.start()
+
+
+def stop_search_index_sync() -> None:
+    global _sync_thread
+    remove_remote_invalidation_handler(_queue_remote_changes)
+    _sync_stop.set()
+    _sync_wakeup.set()
+    if _sync_thread:
+        _sync_thread.join(timeout=5)
+        _sync_thread = None
@@ -18,6 +18,11 @@ class JsonFormatter(logging.Formatter):
         if hasattr(record, "request_id"):
             log["request_id"] = record.request_id
 
+        # Slow-query log fields (app.query_counter)
+        for field in ("duration_ms", "sql", "params"):
+            if hasattr(record, field):
+                log[field] = getattr(record, field)
+
         if record.exc_info:
             log["exception"] = self.formatException(record.exc_info)
 
@@ -1,9 +1,7 @@
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from fastapi.staticfiles import StaticFiles
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
-from pathlib import Path
 import time
 import logging
 from sqlalchemy import text
@@ -19,7 +17,16 @@ setup_logging()
 # --------------------------------------------------
 from app.errors import APIError
 from app.config import settings
-from app.database import engine
+from app.database import engine, async_engine, replicas
+from app.cache import cache
+from app.cache_sync import start_cache_sync, stop_cache_sync
+from app.database import SessionLocal
+from app.jobs.search_index import job_search_index, start_search_index_sync, stop_search_index_sync
+from app.admin.stats import start_stats_refresher, stop_stats_refresher
+from app.storage.file_handler import start_resume_gc, stop_resume_gc
+from app.storage.resume_text import stop_resume_extraction
+from app.auth.password_pool import start_password_pool, stop_password_pool
+from app.metrics import render_metrics, start_event_loop_monitor, stop_event_loop_monitor
 from app.auth.routes import router as auth_router
 from app.users.routes import router as users_router
 from app.companies.routes import router as companies_router
@@ -37,8 +44,7 @@ from app.middleware.rate_limiter import limiter, rate_limit_exceeded_handler
 # --------------------------------------------------
 # Security & tracing
 # --------------------------------------------------
-from app.middleware.security_headers import SecurityHeadersMiddleware
-from app.middleware.request_id import request_id_middleware
+from app.middleware.request_context import RequestContextMiddleware
 
 # --------------------------------------------------
 # Create FastAPI app
@@ -49,6 +55,7 @@ app = FastAPI(
     docs_url="/api/docs",
     redoc_url="/api/redoc",
     openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
 logger = logging.getLogger(__name__)
@@ -68,12 +75,6 @@ app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 # Middleware (ORDER MATTERS)
 # --------------------------------------------------
 
-# ✅ BLOCKER 5.1.3 — Request ID FIRST
-app.middleware("http")(request_id_middleware)
-
-# Security headers
-app.add_middleware(SecurityHeadersMiddleware)
-
 # CORS
 app.add_middleware(
     CORSMiddleware,
@@ -83,13 +84,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Request timing
-@app.middleware("http")
-async def add_process_time_header(request: Request, call_next):
-    start_time = time.time()
-    response = await call_next(request)
-    response.headers["X-Process-Time"] = str(time.time() - start_time)
-    return response
+# ✅ BLOCKER 5.1.3 — Request ID, security headers, timing, SQL stats,
+# metrics and (with replicas) the read-your-writes cookie in one pure ASGI
+# layer; added last so it runs first
+app.add_middleware(RequestContextMiddleware, read_your_writes=bool(replicas))
 
 # --------------------------------------------------
 # Exception handlers
@@ -106,6 +104,7 @@ async def api_error_handler(request: Request, exc: APIError):
                 "details": exc.details,
             }
         },
+        headers=exc.headers,
     )
 
 
@@ -192,6 +191,16 @@ def detailed_health_check():
     from app.health_check import get_health_report
     return get_health_report()
 
+
+# --------------------------------------------------
+# Prometheus metrics
+# --------------------------------------------------
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["System"], include_in_schema=False)
+    def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
 # --------------------------------------------------
 # Root
 # --------------------------------------------------
@@ -203,13 +212,6 @@ def root():
         "version": "1.0.0",
     }
 
-# --------------------------------------------------
-# Static files
-# --------------------------------------------------
-upload_dir = Path(settings.UPLOAD_DIR)
-upload_dir.mkdir(parents=True, exist_ok=True)
-app.mount("/uploads", StaticFiles(directory=str(upload_dir)), name="uploads")
-
 # --------------------------------------------------
 # Routers
 # --------------------------------------------------
@@ -232,6 +234,8 @@ def startup_event():
     logger.info("🚀 Starting Job Marketplace")
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.DEBUG}")
+    logger.info(f"Database mode: {settings.DATABASE_MODE}")
+    logger.info(f"Database pool ({type(engine.pool).__name__}): {engine.pool.status()}")
 
     for attempt in range(1, MAX_RETRIES + 1):
         try:
@@ -248,8 +252,40 @@ def startup_event():
         logger.critical("❌ Database connection failed")
         raise RuntimeError("Database is not reachable")
 
+    cache.start_sweeper()
+    start_cache_sync()
+    replicas.start_monitor()
+    start_stats_refresher()
+    start_resume_gc()
+    start_password_pool()
+    if settings.METRICS_ENABLED:
+        start_event_loop_monitor()
+
+    if settings.JOB_SEARCH_INDEX_ENABLED:
+        db = SessionLocal()
+        try:
+            job_search_index.rebuild_from_db(db)
+        finally:
+            db.close()
+        start_search_index_sync()
+
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info(f"🛑 Shutting down {settings.PROJECT_NAME}")
+    stop_cache_sync()
+    stop_search_index_sync()
+    replicas.stop_monitor()
+    stop_stats_refresher()
+    stop_resume_gc()
+    stop_resume_extraction()
+    stop_password_pool()
+    stop_event_loop_monitor()
+    cache.stop_sweeper()
     engine.dispose()
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in replicas.replicas:
+        replica.engine.dispose()
+        if replica.async_engine is not None:
+            await replica.async_engine.dispose()
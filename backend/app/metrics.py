@@ -0,0 +1,191 @@
+"""
+Prometheus metrics, served by GET /metrics.
+
+Exported series:
+
+    http_requests_total / http_request_duration_seconds
+                                  per route template, method and status
+    cache_lookups_total           @cached and user cache lookups per key
+                                  prefix and result
+    db_pool_*                     checkout waits, timeouts, connections in use
+    rate_limit_rejections_total   429s per route template
+    event_loop_lag_seconds        how late the event loop wakes up
+    resume_extraction_*           text extraction backlog, results, duration
+    password_hash_*               bcrypt calls pending in the pool, shed calls
+
+Multiprocess: with PROMETHEUS_MULTIPROC_DIR set (the Docker image sets it)
+every gunicorn worker writes its samples to files in that directory and a
+scrape of any worker aggregates all of them. gunicorn.conf.py empties the
+directory on start and marks exited workers dead, so live gauges drop
+their samples. Without it the metrics cover the serving process only.
+"""
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import os
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+
+from app.config import settings
+
+# Request latency bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+
+# Pool checkout wait bucket upper bounds, in seconds (also app.db_pool.WAIT_BUCKETS)
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+EXTRACTION_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Label for requests no route matched, so 404 scans cannot grow the series count
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+# --------------------------------------------------
+# Metrics
+# --------------------------------------------------
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests served",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by result (hit, stale, miss)",
+    ["prefix", "result"],
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["pool"],
+    buckets=POOL_WAIT_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after DB_POOL_TIMEOUT",
+    ["pool"],
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter",
+    ["route"],
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay of the event loop waking up from a timed sleep",
+    buckets=LOOP_LAG_BUCKETS,
+)
+EVENT_LOOP_LAG_LAST = Gauge(
+    "event_loop_lag_last_seconds",
+    "Most recent event loop lag sample (max across workers)",
+    multiprocess_mode="livemax",
+)
+
+RESUME_EXTRACTION_BACKLOG = Gauge(
+    "resume_extraction_backlog",
+    "Resumes waiting for or undergoing text extraction",
+    multiprocess_mode="livesum",
+)
+RESUME_EXTRACTIONS = Counter(
+    "resume_extractions_total",
+    "Finished resume text extractions by result (extracted, unsupported, skipped, failed)",
+    ["result"],
+)
+RESUME_EXTRACTION_DURATION = Histogram(
+    "resume_extraction_duration_seconds",
+    "Time from submitting a resume to the process pool to getting its text",
+    buckets=EXTRACTION_BUCKETS,
+)
+
+PASSWORD_HASH_PENDING = Gauge(
+    "password_hash_pending",
+    "Password hash/verify calls queued or running in the process pool",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTIONS = Counter(
+    "password_hash_rejections_total",
+    "Password hash/verify calls shed because PASSWORD_HASH_MAX_PENDING was reached",
+)
+
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Path template of the route that matched an ASGI scope, e.g. /api/v1/jobs/{job_id}."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def observe_request(scope: Dict[str, Any], status_code: int, seconds: float) -> None:
+    labels = (scope["method"], route_template(scope), str(status_code))
+    HTTP_REQUESTS.labels(*labels).inc()
+    HTTP_REQUEST_DURATION.labels(*labels).observe(seconds)
+
+
+# --------------------------------------------------
+# Exposition
+# --------------------------------------------------
+def render_metrics() -> Tuple[bytes, str]:
+    """Exposition body and content type; aggregates all workers when multiprocess."""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+# --------------------------------------------------
+# Event loop lag
+# --------------------------------------------------
+_loop_monitor: Optional["asyncio.Task"] = None
+
+
+async def _watch_event_loop(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
+
+
+def start_event_loop_monitor() -> None:
+    """Sample event loop lag every EVENT_LOOP_LAG_INTERVAL seconds (call on the loop)."""
+    global _loop_monitor
+    if _loop_monitor and not _loop_monitor.done():
+        return
+    _loop_monitor = asyncio.get_running_loop().create_task(
+        _watch_event_loop(settings.EVENT_LOOP_LAG_INTERVAL)
+    )
+
+
+def stop_event_loop_monitor() -> None:
+    global _loop_monitor
+    if _loop_monitor:
+        _loop_monitor.cancel()
+        _loop_monitor = None
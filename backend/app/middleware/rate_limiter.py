@@ -7,6 +7,8 @@ from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
+from app.config import settings
+from app.metrics import RATE_LIMIT_REJECTIONS, route_template
 import logging
 
 logger = logging.getLogger(__name__)
@@ -28,9 +30,12 @@ def rate_limit_key(request: Request) -> str:
 # --------------------------------------------------
 # Initialize limiter
 # --------------------------------------------------
+# Counters live in the shared cache store when one is configured so that
+# limits hold across all workers and hosts, not per process.
 limiter = Limiter(
     key_func=rate_limit_key,
     enabled=True,
+    storage_uri=settings.CACHE_REDIS_URL or "memory://",
 )
 
 
@@ -47,6 +52,7 @@ async def rate_limit_exceeded_handler(
         f"Rate limit exceeded | key={key} | "
         f"{request.method} {request.url.path}"
     )
+    RATE_LIMIT_REJECTIONS.labels(route_template(request.scope)).inc()
 
     return JSONResponse(
         status_code=429,
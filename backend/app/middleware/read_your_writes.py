@@ -0,0 +1,32 @@
+from http.cookies import SimpleCookie
+import time
+
+from app.config import settings
+from app.db_replicas import READ_YOUR_WRITES_COOKIE
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def pins_reads_to_primary(method: str, status_code: int) -> bool:
+    """Whether a response should carry the read-your-writes cookie."""
+    return method not in SAFE_METHODS and status_code < 400
+
+
+def read_your_writes_cookie() -> bytes:
+    """
+    Set-Cookie value pinning the client's reads to the primary for
+    READ_YOUR_WRITES_SECONDS, so replica lag cannot hide its own changes.
+
+    Added after successful writes by RequestContextMiddleware.
+    """
+    primary_until = time.time() + settings.READ_YOUR_WRITES_SECONDS
+    cookie: SimpleCookie = SimpleCookie()
+    cookie[READ_YOUR_WRITES_COOKIE] = f"{primary_until:.3f}"
+    morsel = cookie[READ_YOUR_WRITES_COOKIE]
+    morsel["max-age"] = settings.READ_YOUR_WRITES_SECONDS
+    morsel["path"] = "/"
+    morsel["httponly"] = True
+    morsel["samesite"] = settings.SESSION_COOKIE_SAMESITE.lower()
+    if settings.SESSION_COOKIE_SECURE:
+        morsel["secure"] = True
+    return cookie.output(header="").strip().encode("latin-1")
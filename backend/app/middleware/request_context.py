@@ -0,0 +1,127 @@
+"""
+Per-request context and response headers, as one pure ASGI middleware.
+
+For every HTTP request it:
+- assigns request.state.request_id and returns it as X-Request-ID
+- counts and times SQL statements (app.query_counter), enforcing
+  QUERY_GUARD_MAX_QUERIES when set
+- adds the security headers, X-Process-Time and Server-Timing
+- with read replicas, sets the read-your-writes cookie after successful
+  writes (app.middleware.read_your_writes)
+- records Prometheus request metrics (app.metrics)
+
+Headers are added to the raw http.response.start message, so the body is
+passed through untouched and streaming responses keep streaming. The
+security header bytes are built once when the middleware is created.
+X-Process-Time and Server-Timing therefore measure the time until the
+response starts, not until its last body chunk.
+"""
+from typing import List, Tuple
+import time
+import uuid
+
+from app.config import settings
+from app.metrics import observe_request
+from app.middleware.read_your_writes import pins_reads_to_primary, read_your_writes_cookie
+from app.query_counter import track_queries
+
+Header = Tuple[bytes, bytes]
+
+# Content Security Policy: controls which resources the frontend may load
+CONTENT_SECURITY_POLICY = "; ".join([
+    "default-src 'self'",
+    "script-src 'self' 'unsafe-inline' 'unsafe-eval'",  # Inline scripts for React
+    "style-src 'self' 'unsafe-inline'",
+    "img-src 'self' data: https:",
+    "font-src 'self' data:",
+    "connect-src 'self' http://localhost:* http://backend:8000",  # API connections
+    "frame-ancestors 'none'",  # Anti-clickjacking
+    "base-uri 'self'",
+    "form-action 'self'",
+])
+
+# Browser features the app never uses
+PERMISSIONS_POLICY = ", ".join(
+    f"{feature}=()"
+    for feature in (
+        "geolocation", "microphone", "camera", "payment",
+        "usb", "magnetometer", "gyroscope", "accelerometer",
+    )
+)
+
+# Response headers removed to avoid fingerprinting the stack
+STRIPPED_HEADERS = {b"server", b"x-powered-by"}
+
+
+def build_security_headers() -> List[Header]:
+    """Security headers as raw (name, value) bytes, from current settings."""
+    if not settings.ENABLE_SECURITY_HEADERS:
+        return []
+
+    headers = [
+        ("Content-Security-Policy", CONTENT_SECURITY_POLICY),
+        ("X-Content-Type-Options", "nosniff"),  # No MIME sniffing
+        ("X-Frame-Options", "DENY"),
+        ("X-XSS-Protection", "1; mode=block"),  # Older browsers' XSS filter
+        ("Referrer-Policy", "strict-origin-when-cross-origin"),
+        ("Permissions-Policy", PERMISSIONS_POLICY),
+        ("X-Permitted-Cross-Domain-Policies", "none"),
+    ]
+    if settings.is_production:
+        # Browsers must use HTTPS only
+        headers.append(("Strict-Transport-Security", "max-age=31536000; includeSubDomains; preload"))
+    return [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+
+
+class RequestContextMiddleware:
+    def __init__(self, app, read_your_writes: bool = False):
+        self.app = app
+        self.read_your_writes = read_your_writes
+        self.security_headers = build_security_headers()
+        # Headers set by this middleware replace any the app already set
+        self.replaced_headers = STRIPPED_HEADERS | {name for name, _ in self.security_headers}
+        self.server_timing = settings.SERVER_TIMING_ENABLED
+        self.record_metrics = settings.METRICS_ENABLED
+        self.query_limit = settings.QUERY_GUARD_MAX_QUERIES
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        request_id = str(uuid.uuid4())
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        status_code = 500
+
+        with track_queries(self.query_limit, request_id) as stats:
+            state["query_stats"] = stats
+
+            async def send_with_headers(message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    elapsed = time.perf_counter() - started
+                    headers = [
+                        header for header in message.get("headers", ())
+                        if header[0].lower() not in self.replaced_headers
+                    ]
+                    headers.extend(self.security_headers)
+                    headers.append((b"x-request-id", request_id.encode("latin-1")))
+                    headers.append((b"x-process-time", str(elapsed).encode("latin-1")))
+                    if self.read_your_writes and pins_reads_to_primary(scope["method"], status_code):
+                        headers.append((b"set-cookie", read_your_writes_cookie()))
+                    if self.server_timing:
+                        headers.append((
+                            b"server-timing",
+                            f"{stats.server_timing()}, total;dur={elapsed * 1000:.1f}".encode("latin-1"),
+                        ))
+                    message["headers"] = headers
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_headers)
+            finally:
+                if self.record_metrics:
+                    observe_request(scope, status_code, time.perf_counter() - started)
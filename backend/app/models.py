@@ -1,4 +1,5 @@
 from sqlalchemy import (
+    BigInteger,
     Column,
     Integer,
     String,
@@ -220,3 +221,45 @@ class Application(Base):
 
     job = relationship("Job", back_populates="applications")
     user = relationship("User", back_populates="applications")
+
+
+class StatCounter(Base):
+    """
+    Materialized platform counters (see app.admin.stats). Each counter is
+    the sum of its shard rows.
+    """
+    __tablename__ = "stat_counters"
+
+    name = Column(String(64), primary_key=True)
+    shard = Column(Integer, primary_key=True, default=0)
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class ResumeBlob(Base):
+    """
+    A stored resume file, addressed by the SHA-256 of its content and shared
+    by every application that uploaded the same bytes (see app.storage).
+    """
+    __tablename__ = "resume_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    content_type = Column(String(100), nullable=False)
+    # Applications referencing the blob; unreferenced blobs are garbage collected
+    ref_count = Column(Integer, nullable=False, default=0, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class ResumeText(Base):
+    """Text extracted from a resume blob (see app.storage.resume_text)."""
+    __tablename__ = "resume_texts"
+
+    sha256 = Column(String(64), primary_key=True)
+    # Type detected from the content, not the one the client declared
+    detected_type = Column(String(100), nullable=False)
+    # Whitespace-normalized text; empty when the type is not extractable
+    text = Column(Text, nullable=False, default="")
+    # Distinct lowercase word tokens, space separated and sorted
+    tokens = Column(Text, nullable=False, default="")
+    extracted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,140 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Pages are ordered by (sort column DESC, id DESC) and the cursor encodes the
+last row's (sort value, id). The next page is fetched with a row-value
+comparison that walks the composite index instead of counting OFFSET rows,
+so deep pages cost the same as the first one and stay stable while new
+rows are inserted.
+
+SQLite stores timestamps as text in two formats: server defaults write
+"YYYY-MM-DD HH:MM:SS", bound datetimes "YYYY-MM-DD HH:MM:SS.ffffff". The
+same instant then compares unequal, so there both the ordering and the
+cursor comparison use a normalized strftime() form (millisecond precision,
+ties broken by id).
+"""
+from typing import Any, Generic, List, Optional, Tuple, TypeVar
+from datetime import datetime
+import base64
+import json
+
+from fastapi import status
+from pydantic import BaseModel
+from sqlalchemy import Select, func, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Query
+
+from app.errors import APIError
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the position after a row as an opaque, URL-safe token."""
+    raw = json.dumps([sort_value.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a token produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise APIError(
+            code="INVALID_CURSOR",
+            message="Invalid pagination cursor",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+
+def order_newest_first(query: Query, sort_column: Any, id_column: Any) -> Query:
+    """Deterministic newest-first ordering shared by both pagination modes."""
+    return query.order_by(sort_column.desc(), id_column.desc())
+
+
+def _sort_key(value: Any, dialect_name: str) -> Any:
+    """Expression the keyset is ordered and compared on (see module docstring)."""
+    if dialect_name == "sqlite":
+        return func.strftime("%Y-%m-%d %H:%M:%f", value)
+    return value
+
+
+def _page_query(
+    query: Any, sort_column: Any, id_column: Any, cursor: Optional[str], limit: int, dialect_name: str
+) -> Any:
+    """Query or Select for the rows after cursor, plus one lookahead row."""
+    sort_key = _sort_key(sort_column, dialect_name)
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        # Bound through the column type, so it is rendered like stored values
+        bound = literal(sort_value, type_=sort_column.type)
+        query = query.filter(
+            tuple_(sort_key, id_column) < tuple_(_sort_key(bound, dialect_name), last_id)
+        )
+
+    # One extra row tells us whether another page exists
+    return order_newest_first(query, sort_key, id_column).limit(limit + 1)
+
+
+def _split_page(
+    rows: List[Any], sort_column: Any, id_column: Any, limit: int
+) -> Tuple[List[Any], Optional[str]]:
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key),
+            getattr(last, id_column.key),
+        )
+    return rows, next_cursor
+
+
+def paginate_keyset(
+    query: Query,
+    sort_column: Any,
+    id_column: Any,
+    cursor: Optional[str],
+    limit: int,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page after cursor.
+
+    Args:
+        query: Base query (filters applied, no ordering)
+        sort_column: Timestamp column to page on, e.g. Job.created_at
+        id_column: Primary key column used as tie-breaker
+        cursor: Token from the previous page, or None/"" for the first page
+        limit: Page size
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+    """
+    dialect_name = query.session.get_bind().dialect.name
+    rows = _page_query(query, sort_column, id_column, cursor, limit, dialect_name).all()
+    return _split_page(rows, sort_column, id_column, limit)
+
+
+async def paginate_keyset_async(
+    db: AsyncSession,
+    stmt: Select,
+    sort_column: Any,
+    id_column: Any,
+    cursor: Optional[str],
+    limit: int,
+    rows: bool = False,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    paginate_keyset for a select() on an AsyncSession. Returns ORM entities,
+    or Row tuples with rows=True (a select() of columns).
+    """
+    dialect_name = db.bind.dialect.name
+    result = await db.execute(_page_query(stmt, sort_column, id_column, cursor, limit, dialect_name))
+    return _split_page(list(result if rows else result.scalars()), sort_column, id_column, limit)
@@ -0,0 +1,173 @@
+"""
+Per-request SQL query counting and timing.
+
+Statements executed by any engine in this process are attributed to the
+request being served through a context variable, which FastAPI copies into
+the threadpool running sync routes and dependencies. RequestContextMiddleware
+reports each request's count and database time in a Server-Timing header.
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are logged on the
+"app.sql" logger with their request id, normalized SQL and parameters,
+whether or not they run inside a request. Parameters are logged as type
+placeholders (<str>, <int>) since they carry emails, password hashes and
+tokens; SLOW_QUERY_LOG_PARAMETERS logs the values instead.
+
+With QUERY_GUARD_MAX_QUERIES set (tests, development) a request that issues
+more statements fails with QueryBudgetExceeded, so N+1 regressions surface
+as errors rather than slow pages. Tests can also wrap calls directly:
+
+    with track_queries(limit=3) as stats:
+        client.get("/api/v1/jobs/1")
+    assert stats.count <= 3
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Optional
+import logging
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+slow_query_logger = logging.getLogger("app.sql")
+
+# Longest SQL / parameter text written to the slow-query log
+MAX_LOGGED_SQL = 2000
+MAX_LOGGED_PARAMS = 500
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """A request issued more SQL statements than its budget allows."""
+
+
+class QueryStats:
+    __slots__ = ("count", "duration", "limit", "request_id", "parent")
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        request_id: Optional[str] = None,
+        parent: Optional["QueryStats"] = None,
+    ):
+        self.count = 0
+        # Seconds spent executing statements
+        self.duration = 0.0
+        self.limit = limit
+        self.request_id = request_id
+        # Enclosing tracker, which counts the same statements
+        self.parent = parent
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, e.g. 'db;dur=12.5;desc="4 queries"'."""
+        return f'db;dur={self.duration * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current.get()
+
+
+@contextmanager
+def track_queries(
+    limit: Optional[int] = None, request_id: Optional[str] = None
+) -> Iterator[QueryStats]:
+    """
+    Count and time statements executed in this context (and tasks/threads
+    it spawns). Trackers nest: a test tracking around client calls still
+    sees the statements counted by the per-request tracker inside them.
+    """
+    stats = QueryStats(limit, request_id, parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def normalize_sql(statement: str) -> str:
+    """Statement with whitespace collapsed, for one-line logging."""
+    return " ".join(statement.split())[:MAX_LOGGED_SQL]
+
+
+class _Redacted:
+    """Stands in for a parameter value; repr() shows only its type."""
+    __slots__ = ("type_name",)
+
+    def __init__(self, value: Any):
+        self.type_name = type(value).__name__
+
+    def __repr__(self) -> str:
+        return f"<{self.type_name}>"
+
+
+def _redact(parameters: Any) -> Any:
+    if isinstance(parameters, dict):
+        return {name: _redact_value(value) for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return type(parameters)(_redact_value(value) for value in parameters)
+    return _redact_value(parameters)
+
+
+def _redact_value(value: Any) -> Any:
+    return value if value is None else _Redacted(value)
+
+
+def _format_parameters(parameters: Any, executemany: bool) -> str:
+    if executemany and isinstance(parameters, (list, tuple)) and parameters:
+        first = parameters[0] if settings.SLOW_QUERY_LOG_PARAMETERS else _redact(parameters[0])
+        text = f"{len(parameters)} rows, first: {first!r}"
+    else:
+        text = repr(parameters if settings.SLOW_QUERY_LOG_PARAMETERS else _redact(parameters))
+    return text[:MAX_LOGGED_PARAMS]
+
+
+# --------------------------------------------------
+# Engine events (every engine, including async engines' sync_engine)
+# --------------------------------------------------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current.get()
+    while stats is not None:
+        stats.count += 1
+        if stats.limit is not None and stats.count > stats.limit:
+            raise QueryBudgetExceeded(
+                f"Query budget of {stats.limit} exceeded by: {statement[:200]}"
+            )
+        stats = stats.parent
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get("query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+
+    stats = tracker = _current.get()
+    while tracker is not None:
+        tracker.duration += elapsed
+        tracker = tracker.parent
+
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(
+            "Slow query",
+            extra={
+                "request_id": stats.request_id if stats else None,
+                "duration_ms": round(elapsed * 1000, 1),
+                "sql": normalize_sql(statement),
+                "params": _format_parameters(parameters, executemany),
+            },
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_timer(exception_context) -> None:
+    # after_cursor_execute does not run for statements that fail
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
@@ -0,0 +1,49 @@
+"""
+Response serialization fast path.
+
+ORJSONResponse is the app-wide default response class, so anything a
+handler returns after FastAPI's response_model pass is encoded by orjson.
+
+Large list endpoints can skip that pass (validate, dump to Python objects,
+encode) with json_response(): the value is validated through a cached
+TypeAdapter and encoded straight to JSON bytes by pydantic-core. Paired
+with model_columns() queries, which return rows of plain column values
+(passed through row_dicts()), no ORM instances are built either. The
+JSON is the same as the response_model output and the route keeps its
+response_model for the OpenAPI schema.
+"""
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row
+
+
+@lru_cache(maxsize=None)
+def type_adapter(schema: Any) -> TypeAdapter:
+    """One TypeAdapter per type; building one compiles its validator and serializer."""
+    return TypeAdapter(schema)
+
+
+def json_response(schema: Any, value: Any, status_code: int = 200) -> Response:
+    """
+    Validate value as schema (reading ORM objects and rows by attribute)
+    and return it as a JSON response.
+    """
+    adapter = type_adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def model_columns(model: Any, schema: Type[BaseModel]) -> List[Any]:
+    """Mapped columns of model named after schema's fields, for column-tuple queries."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def row_dicts(rows: Iterable[Row]) -> List[Dict[str, Any]]:
+    """
+    Rows as dicts for json_response; pydantic validates dicts about three
+    times faster than reading the same values from Row attributes.
+    """
+    return [row._asdict() for row in rows]
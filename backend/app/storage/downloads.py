@@ -0,0 +1,137 @@
+"""
+Resume downloads.
+
+With RESUME_ACCEL_REDIRECT_PREFIX set (the nginx deployment), a download
+response carries headers only plus X-Accel-Redirect to an internal nginx
+location aliasing UPLOAD_DIR: nginx sends the file with sendfile and
+answers Range requests itself, so no worker pushes resume bytes.
+
+Without it (development, no nginx) the file is streamed from disk here,
+with single-range Range / If-Range support.
+
+Either way responses carry a strong ETag, the content SHA-256 for blobs,
+and Cache-Control: private, immutable (a URL's content never changes);
+a matching If-None-Match gets a 304.
+"""
+from typing import AsyncIterator, Optional, Tuple
+import mimetypes
+import re
+from pathlib import Path
+
+import aiofiles
+from fastapi import Request, Response, status
+from fastapi.responses import StreamingResponse
+
+from app.config import settings
+from app.errors import APIError
+from app.storage.file_handler import UPLOAD_CHUNK_SIZE, file_handler
+
+# Private: resumes are only served to authorized users, never by shared caches
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Inclusive (start, end) of a single-range Range header, None to send the
+    whole file (absent, malformed or multi-range).
+
+    Raises:
+        APIError: 416 if the range lies beyond the end of the file
+    """
+    match = _RANGE.fullmatch(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size:
+        raise APIError(
+            code="RANGE_NOT_SATISFIABLE",
+            message="Requested range not satisfiable",
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
+
+
+async def _read_range(path: Path, start: int, length: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as src:
+        await src.seek(start)
+        while length > 0:
+            chunk = await src.read(min(UPLOAD_CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+def resume_response(request: Request, file_url: str, content_type: Optional[str] = None) -> Response:
+    """
+    Response serving a stored resume to an already authorized user.
+
+    Args:
+        request: Download request (for If-None-Match, Range, If-Range)
+        file_url: Application.resume_file_url
+        content_type: Stored content type; guessed from the name when None
+    """
+    not_found = APIError(
+        code="RESUME_NOT_FOUND",
+        message="Resume not found",
+        status_code=status.HTTP_404_NOT_FOUND,
+    )
+    path = file_handler.get_absolute_path(file_url)
+    upload_dir = file_handler.upload_dir.resolve()
+    if upload_dir not in path.resolve().parents:
+        raise not_found
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        raise not_found
+
+    sha256 = file_handler.blob_hash(file_url)
+    # Files from before content addressing are never rewritten either
+    etag = f'"{sha256}"' if sha256 else f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    content_type = content_type or mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    extension = mimetypes.guess_extension(content_type) or path.suffix
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "Content-Disposition": f'inline; filename="resume{extension}"',
+        "Accept-Ranges": "bytes",
+    }
+
+    if etag in (tag.strip() for tag in request.headers.get("if-none-match", "").split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if settings.RESUME_ACCEL_REDIRECT_PREFIX:
+        relative = path.resolve().relative_to(upload_dir).as_posix()
+        headers["X-Accel-Redirect"] = settings.RESUME_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + relative
+        return Response(media_type=content_type, headers=headers)
+
+    size = stat.st_size
+    byte_range = None
+    range_header = request.headers.get("range")
+    if range_header and request.headers.get("if-range", etag) == etag:
+        byte_range = _parse_range(range_header, size)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_read_range(path, 0, size), media_type=content_type, headers=headers)
+
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        _read_range(path, start, end - start + 1),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=content_type,
+        headers=headers,
+    )
@@ -1,8 +1,39 @@
-import os
+from typing import Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+import hashlib
+import logging
+import threading
+import time
 import uuid
 from pathlib import Path
+
+import aiofiles
+import aiofiles.os
 from fastapi import UploadFile, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import false, func, select, update
+from sqlalchemy.orm import Session
+
 from app.config import settings
+from app.database import SessionLocal
+from app.models import ResumeBlob, ResumeText
+from app.storage.resume_text import extract_after_commit
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the upload and written to disk per step; bounds the
+# memory one upload holds regardless of its size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Partial uploads, on the same filesystem as the final files so the
+# finishing rename is atomic
+TEMP_DIR_NAME = ".incoming"
+
+# Content-addressed resumes, stored as blobs/ab/cd/<sha256>
+BLOB_DIR_NAME = "blobs"
+
+# Blob files checked against resume_blobs per query by sweep_orphans()
+ORPHAN_SWEEP_BATCH = 500
 
 
 class FileHandler:
@@ -17,6 +48,10 @@ class FileHandler:
 
         # Create upload directory if it doesn't exist
         self.upload_dir.mkdir(parents=True, exist_ok=True)
+        self.temp_dir = self.upload_dir / TEMP_DIR_NAME
+        self.temp_dir.mkdir(exist_ok=True)
+        self.blob_dir = self.upload_dir / BLOB_DIR_NAME
+        self.blob_dir.mkdir(exist_ok=True)
 
     def validate_file(self, file: UploadFile) -> None:
         """
@@ -35,15 +70,65 @@ class FileHandler:
                 detail=f"Invalid file type. Allowed types: {', '.join(self.allowed_types)}"
             )
 
-        # File size will be validated during read
+        # Reject early when the client declared the size; the actual byte
+        # count is still enforced while streaming
+        if file.size is not None and file.size > self.max_size:
+            raise self._too_large()
+
+    def _too_large(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File too large. Maximum size: {self.max_size / 1024 / 1024:.1f}MB"
+        )
+
+    async def _stream_to_temp(self, file: UploadFile) -> Tuple[Path, str, int]:
+        """
+        Copy the upload to a temporary file chunk by chunk, hashing it on the
+        way and aborting as soon as it exceeds max_size. The temporary file
+        is removed on any failure.
+
+        Returns:
+            Temporary path, SHA-256 hex digest and size in bytes
+        """
+        temp_path = self.temp_dir / f"{uuid.uuid4()}.part"
+        digest = hashlib.sha256()
+        written = 0
+        try:
+            async with aiofiles.open(temp_path, "wb") as out:
+                while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                    written += len(chunk)
+                    if written > self.max_size:
+                        raise self._too_large()
+                    digest.update(chunk)
+                    await out.write(chunk)
+        except BaseException:
+            # Includes cancellation when the client disconnects mid-upload
+            await self._remove_quietly(temp_path)
+            raise
+        return temp_path, digest.hexdigest(), written
+
+    @staticmethod
+    async def _remove_quietly(path: Path) -> None:
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
 
-    async def save_resume(self, file: UploadFile, user_id: int) -> str:
+    def blob_path(self, sha256: str) -> Path:
+        """Sharded location of a blob: blobs/ab/cd/abcd..."""
+        return self.blob_dir / sha256[:2] / sha256[2:4] / sha256
+
+    async def save_resume(self, file: UploadFile, db: Session) -> str:
         """
-        Save resume file to local storage.
+        Store a resume by content and take a reference on it.
+
+        Identical uploads share one file. The reference is added in db's
+        transaction, so it commits or rolls back with the application that
+        uses the returned URL; text extraction starts once it commits.
 
         Args:
             file: Uploaded file
-            user_id: User ID for organizing files
+            db: Session the application row is written with
 
         Returns:
             Relative file path for storage in database
@@ -53,29 +138,24 @@ class FileHandler:
         """
         self.validate_file(file)
 
-        # Generate unique filename
-        file_ext = Path(file.filename).suffix
-        unique_filename = f"{user_id}_{uuid.uuid4()}{file_ext}"
-
-        # Create user-specific subdirectory
-        user_dir = self.upload_dir / str(user_id)
-        user_dir.mkdir(exist_ok=True)
-
-        file_path = user_dir / unique_filename
-
-        # Save file with size validation
         try:
-            content = await file.read()
-
-            # Validate file size
-            if len(content) > self.max_size:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File too large. Maximum size: {self.max_size / 1024 / 1024:.1f}MB"
-                )
+            temp_path, sha256, size = await self._stream_to_temp(file)
+            try:
+                # Reference first: it waits for a garbage collection of the
+                # same blob to finish, so a collected file is written again below
+                await run_in_threadpool(self._add_reference, db, sha256, size, file.content_type)
 
-            with open(file_path, "wb") as f:
-                f.write(content)
+                file_path = self.blob_path(sha256)
+                if await aiofiles.os.path.exists(file_path):
+                    await self._remove_quietly(temp_path)
+                else:
+                    await aiofiles.os.makedirs(file_path.parent, exist_ok=True)
+                    # Atomic, so a partial upload is never visible under the blob name
+                    await aiofiles.os.replace(temp_path, file_path)
+                extract_after_commit(db, sha256, file_path)
+            except BaseException:
+                await self._remove_quietly(temp_path)
+                raise
 
         except Exception as e:
             if isinstance(e, HTTPException):
@@ -86,15 +166,28 @@ class FileHandler:
             )
 
         # Return relative path for database storage
-        return f"/uploads/{user_id}/{unique_filename}"
+        return f"/uploads/{BLOB_DIR_NAME}/{sha256[:2]}/{sha256[2:4]}/{sha256}"
 
-    def delete_file(self, file_url: str) -> None:
+    def delete_file(self, file_url: str, db: Session) -> None:
         """
-        Delete a file from local storage.
+        Release a reference to a stored file.
+
+        Blob files are removed by collect_garbage() once nothing references
+        them; files from before content addressing are deleted directly.
 
         Args:
             file_url: Relative file path from database
+            db: Session the application delete is written with
         """
+        sha256 = self.blob_hash(file_url)
+        if sha256 is not None:
+            db.execute(
+                update(ResumeBlob)
+                .where(ResumeBlob.sha256 == sha256, ResumeBlob.ref_count > 0)
+                .values(ref_count=ResumeBlob.ref_count - 1)
+            )
+            return
+
         try:
             # Convert relative URL to absolute path
             file_path = self.upload_dir.parent / file_url.lstrip("/")
@@ -105,6 +198,163 @@ class FileHandler:
             # Silently fail on delete errors (file might already be deleted)
             pass
 
+    @staticmethod
+    def blob_hash(file_url: str) -> Optional[str]:
+        """SHA-256 of a blob URL returned by save_resume, None for other URLs."""
+        parts = file_url.strip("/").split("/")
+        if len(parts) == 5 and parts[:2] == ["uploads", BLOB_DIR_NAME] and len(parts[4]) == 64:
+            return parts[4]
+        return None
+
+    # --------------------------------------------------
+    # Blob locks
+    # --------------------------------------------------
+    # Postgres advisory locks per blob, so garbage collection can unlink a
+    # file after committing its row deletion without an upload of the same
+    # content finding the file in between. Uploads hold the lock shared
+    # until their transaction ends; collection holds it exclusively until
+    # the file is gone.
+    #
+    # SQLite has one database-wide write lock instead: uploads take it with
+    # their reference insert, and collection takes it before re-checking
+    # the row. It ends with the commit, so there the file is unlinked just
+    # before committing; a failed commit leaves an unreferenced row without
+    # a file, which the next collection deletes and an upload rewrites.
+    @staticmethod
+    def _blob_lock_key(sha256: str) -> int:
+        # 60 bits of the hash, within Postgres' signed bigint lock keys
+        return int(sha256[:15], 16)
+
+    @contextmanager
+    def _exclusive_blob_lock(self, db: Session, sha256: str) -> Iterator[None]:
+        bind = db.get_bind()
+        if bind.dialect.name != "postgresql":
+            # A write that matches nothing still takes SQLite's write lock
+            db.execute(update(ResumeBlob).where(false()).values(ref_count=ResumeBlob.ref_count))
+            yield
+            return
+        # Own connection and transaction, so the lock outlives db's commit
+        with bind.connect() as conn, conn.begin():
+            conn.execute(select(func.pg_advisory_xact_lock(self._blob_lock_key(sha256))))
+            yield
+
+    @staticmethod
+    def _commit_and_unlink(db: Session, path: Path) -> None:
+        """Commit a blob row deletion and remove its file, under the blob lock."""
+        if db.get_bind().dialect.name == "postgresql":
+            db.commit()
+            path.unlink(missing_ok=True)
+        else:
+            db.flush()
+            path.unlink(missing_ok=True)
+            db.commit()
+
+    # --------------------------------------------------
+    # Reference counts
+    # --------------------------------------------------
+    @classmethod
+    def _add_reference(cls, db: Session, sha256: str, size: int, content_type: str) -> None:
+        dialect_name = db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+            db.execute(select(func.pg_advisory_xact_lock_shared(cls._blob_lock_key(sha256))))
+        elif dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            raise RuntimeError(f"Unsupported database dialect: {dialect_name}")
+
+        stmt = insert(ResumeBlob).values(
+            sha256=sha256, size=size, content_type=content_type, ref_count=1,
+        )
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[ResumeBlob.sha256],
+            set_={"ref_count": ResumeBlob.ref_count + 1},
+        ))
+
+    def collect_garbage(self, db: Session) -> int:
+        """
+        Delete blobs no application references, with their files.
+
+        Each blob is handled under its exclusive blob lock and committed on
+        its own. An upload adding a reference meanwhile either comes first
+        and keeps the blob, or waits until the file is gone and writes it
+        again.
+
+        Returns:
+            Number of blobs deleted
+        """
+        candidates = db.scalars(
+            select(ResumeBlob.sha256).where(ResumeBlob.ref_count <= 0)
+        ).all()
+        db.rollback()
+
+        deleted = 0
+        for sha256 in candidates:
+            with self._exclusive_blob_lock(db, sha256):
+                blob = db.scalars(
+                    select(ResumeBlob)
+                    .where(ResumeBlob.sha256 == sha256, ResumeBlob.ref_count <= 0)
+                    .with_for_update()
+                ).first()
+                if blob is None:
+                    db.rollback()
+                    continue
+                db.delete(blob)
+                db.query(ResumeText).filter(ResumeText.sha256 == sha256).delete()
+                self._commit_and_unlink(db, self.blob_path(sha256))
+            deleted += 1
+        return deleted
+
+    def sweep_orphans(self, db: Session, min_age: float) -> int:
+        """
+        Delete files no resume_blobs row accounts for.
+
+        save_resume() writes the blob before the caller commits, so an
+        upload whose transaction rolls back leaves a file without a row;
+        a crash mid-upload leaves a partial file in the temporary directory.
+        Only files older than min_age seconds are considered, and each
+        blob is re-checked under its exclusive blob lock, so uploads still
+        waiting to commit keep their files.
+
+        Returns:
+            Number of files deleted
+        """
+        cutoff = time.time() - min_age
+        deleted = 0
+        for path in self.temp_dir.iterdir():
+            if path.is_file() and path.stat().st_mtime < cutoff:
+                path.unlink(missing_ok=True)
+                deleted += 1
+
+        batch = []
+        for path in self.blob_dir.glob("*/*/*"):
+            if path.is_file() and len(path.name) == 64 and path.stat().st_mtime < cutoff:
+                batch.append(path)
+            if len(batch) >= ORPHAN_SWEEP_BATCH:
+                deleted += self._delete_orphans(db, batch)
+                batch = []
+        if batch:
+            deleted += self._delete_orphans(db, batch)
+        return deleted
+
+    def _delete_orphans(self, db: Session, paths: List[Path]) -> int:
+        by_hash = {path.name: path for path in paths}
+        known = set(db.scalars(select(ResumeBlob.sha256).where(ResumeBlob.sha256.in_(list(by_hash)))))
+        db.rollback()
+
+        deleted = 0
+        for sha256, path in by_hash.items():
+            if sha256 in known:
+                continue
+            with self._exclusive_blob_lock(db, sha256):
+                if db.scalar(select(ResumeBlob.sha256).where(ResumeBlob.sha256 == sha256)):
+                    db.rollback()
+                    continue
+                db.query(ResumeText).filter(ResumeText.sha256 == sha256).delete()
+                self._commit_and_unlink(db, path)
+            deleted += 1
+        return deleted
+
     def get_absolute_path(self, file_url: str) -> Path:
         """
         Convert relative file URL to absolute filesystem path.
@@ -120,3 +370,49 @@ class FileHandler:
 
 # Singleton instance
 file_handler = FileHandler()
+
+
+# --------------------------------------------------
+# Periodic garbage collection
+# --------------------------------------------------
+_gc_stop = threading.Event()
+_gc_thread: Optional[threading.Thread] = None
+
+
+def _collect_once() -> None:
+    db = SessionLocal()
+    try:
+        deleted = file_handler.collect_garbage(db)
+        if deleted:
+            logger.info(f"Deleted {deleted} unreferenced resume blobs")
+        orphans = file_handler.sweep_orphans(db, settings.RESUME_ORPHAN_MIN_AGE)
+        if orphans:
+            logger.info(f"Deleted {orphans} orphaned resume files")
+    except Exception:
+        db.rollback()
+        logger.exception("Resume garbage collection failed")
+    finally:
+        db.close()
+
+
+def _gc_loop() -> None:
+    while not _gc_stop.wait(settings.RESUME_GC_INTERVAL):
+        _collect_once()
+
+
+def start_resume_gc() -> None:
+    """Delete unreferenced and orphaned resume files every RESUME_GC_INTERVAL seconds in a daemon thread."""
+    global _gc_thread
+    if _gc_thread and _gc_thread.is_alive():
+        return
+    _gc_stop.clear()
+    _gc_thread = threading.Thread(target=_gc_loop, name="resume-gc", daemon=True)
+    _gc_thread.start()
+
+
+def stop_resume_gc() -> None:
+    global _gc_thread
+    _gc_stop.set()
+    if _gc_thread:
+        _gc_thread.join(timeout=5)
+        _gc_thread = None
@@ -0,0 +1,153 @@
+"""
+Background resume text extraction.
+
+save_resume() calls extract_after_commit() for every stored blob; once the
+upload's transaction commits, schedule_extraction() creates an asyncio task
+on the uploading event loop, so uploads never wait on it and rolled back
+uploads are never extracted. The task:
+
+1. skips blobs whose text is already stored (identical uploads share a blob)
+2. runs app.storage.text_extraction.extract_resume in a process pool of
+   RESUME_EXTRACT_WORKERS spawned processes, keeping PDF parsing off the
+   event loop and out of this process's GIL
+3. stores the detected type, normalized text and tokens in resume_texts,
+   keyed by the blob SHA-256 (Application.resume_file_url names the blob)
+
+Blobs scheduled but not stored yet are exported as the
+resume_extraction_backlog gauge. Pending extractions are lost on restart.
+"""
+from typing import Optional, Set
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.metrics import RESUME_EXTRACTION_BACKLOG, RESUME_EXTRACTION_DURATION, RESUME_EXTRACTIONS
+from app.models import ResumeText
+from app.storage.text_extraction import Extraction, extract_resume
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_in_flight: Set[str] = set()
+# Strong references, so pending tasks are not garbage collected
+_tasks: Set["asyncio.Task"] = set()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a worker with a running event loop, threads and
+        # open database connections is unsafe
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.RESUME_EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def _is_extracted(sha256: str) -> bool:
+    db = SessionLocal()
+    try:
+        return db.get(ResumeText, sha256) is not None
+    finally:
+        db.close()
+
+
+def _store(sha256: str, extraction: Extraction) -> None:
+    db = SessionLocal()
+    try:
+        db.add(ResumeText(
+            sha256=sha256,
+            detected_type=extraction.detected_type,
+            text=extraction.text,
+            tokens=" ".join(extraction.tokens),
+        ))
+        db.commit()
+    except IntegrityError:
+        # Another worker stored the same content first
+        db.rollback()
+    finally:
+        db.close()
+
+
+async def _extract(sha256: str, path: Path) -> None:
+    result = "failed"
+    try:
+        if await run_in_threadpool(_is_extracted, sha256):
+            result = "skipped"
+            return
+        started = time.perf_counter()
+        extraction = await asyncio.get_running_loop().run_in_executor(
+            _get_pool(), extract_resume, str(path)
+        )
+        RESUME_EXTRACTION_DURATION.observe(time.perf_counter() - started)
+        await run_in_threadpool(_store, sha256, extraction)
+        result = "extracted" if extraction.text else "unsupported"
+    except Exception:
+        logger.exception(f"Resume text extraction failed for blob {sha256}")
+    finally:
+        _in_flight.discard(sha256)
+        RESUME_EXTRACTION_BACKLOG.dec()
+        RESUME_EXTRACTIONS.labels(result).inc()
+
+
+def schedule_extraction(sha256: str, path: Path) -> None:
+    """Extract the blob's text in the background (call on the event loop)."""
+    if not settings.RESUME_TEXT_EXTRACTION_ENABLED or sha256 in _in_flight:
+        return
+    _in_flight.add(sha256)
+    RESUME_EXTRACTION_BACKLOG.inc()
+    task = asyncio.get_running_loop().create_task(_extract(sha256, path))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+# --------------------------------------------------
+# Scheduling on commit
+# --------------------------------------------------
+_PENDING_KEY = "resume_extraction_pending"
+
+
+def extract_after_commit(db: Session, sha256: str, path: Path) -> None:
+    """Schedule extraction once db's transaction commits (call on the event loop)."""
+    if not settings.RESUME_TEXT_EXTRACTION_ENABLED:
+        return
+    loop = asyncio.get_running_loop()
+    db.info.setdefault(_PENDING_KEY, {})[sha256] = (path, loop)
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_committed(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    # Sync routes commit on a threadpool thread, not the loop's
+    for sha256, (path, loop) in pending.items():
+        try:
+            loop.call_soon_threadsafe(schedule_extraction, sha256, path)
+        except RuntimeError:
+            # Loop closed (shutdown); extractions are lost on restart anyway
+            logger.warning(f"Resume text extraction not scheduled for blob {sha256}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+def stop_resume_extraction() -> None:
+    """Stop the worker processes, dropping queued extractions."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
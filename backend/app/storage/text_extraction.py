@@ -0,0 +1,94 @@
+"""
+Resume text extraction, run in worker processes by app.storage.resume_text.
+
+Only the standard library, python-magic and pypdf are imported here, so
+spawned workers start quickly and never load the app, its settings or
+database engines.
+"""
+from typing import List, NamedTuple
+import re
+import unicodedata
+import zipfile
+from xml.etree import ElementTree
+
+import magic
+from pypdf import PdfReader
+
+PDF_TYPE = "application/pdf"
+DOCX_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+# Extracted text beyond this many characters is dropped
+MAX_TEXT_CHARS = 200_000
+
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_WHITESPACE = re.compile(r"\s+")
+_TOKEN = re.compile(r"[^\W_]{2,}")
+
+
+class Extraction(NamedTuple):
+    detected_type: str
+    text: str
+    tokens: List[str]
+
+
+def detect_type(path: str) -> str:
+    """MIME type from the file content (libmagic), not the client's claim."""
+    detected = magic.from_file(path, mime=True)
+    if detected in ("application/zip", "application/octet-stream") and zipfile.is_zipfile(path):
+        # Older libmagic reports DOCX as a plain zip
+        with zipfile.ZipFile(path) as archive:
+            if "word/document.xml" in archive.namelist():
+                return DOCX_TYPE
+    return detected
+
+
+def _pdf_text(path: str) -> str:
+    reader = PdfReader(path)
+    parts = []
+    length = 0
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        parts.append(text)
+        length += len(text)
+        if length >= MAX_TEXT_CHARS:
+            break
+    return "\n".join(parts)
+
+
+def _docx_text(path: str) -> str:
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read("word/document.xml"))
+    paragraphs = (
+        "".join(node.text or "" for node in paragraph.iter(f"{_WORD_NAMESPACE}t"))
+        for paragraph in root.iter(f"{_WORD_NAMESPACE}p")
+    )
+    return "\n".join(paragraphs)
+
+
+_EXTRACTORS = {
+    PDF_TYPE: _pdf_text,
+    DOCX_TYPE: _docx_text,
+}
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalized text with runs of whitespace collapsed to one space."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()[:MAX_TEXT_CHARS]
+
+
+def tokenize(text: str) -> List[str]:
+    """Distinct lowercase word tokens of at least two characters, sorted."""
+    return sorted(set(_TOKEN.findall(text.lower())))
+
+
+def extract_resume(path: str) -> Extraction:
+    """
+    Detect the type of the file at path and extract its text. Types without
+    an extractor (e.g. legacy .doc) yield empty text.
+    """
+    detected_type = detect_type(path)
+    extractor = _EXTRACTORS.get(detected_type)
+    if extractor is None:
+        return Extraction(detected_type, "", [])
+    text = normalize_text(extractor(path))
+    return Extraction(detected_type, text, tokenize(text))
@@ -1,6 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.config import settings
+from app.database import get_db, get_read_db, get_async_read_db
 from app.models import User, Profile
 from app.users.schemas import ProfileUpdate, ProfileResponse
 from app.auth.dependencies import get_current_user
@@ -57,10 +60,9 @@ def update_my_profile(
     return profile
 
 
-@router.get("/profile/{user_id}", response_model=ProfileResponse)
 def get_user_profile(
     user_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Get any user's public profile.
@@ -76,3 +78,29 @@ def get_user_profile(
         )
 
     return profile
+
+
+async def get_user_profile_async(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """
+    Get any user's public profile (async engine, DATABASE_MODE=async).
+    """
+    profile = await db.scalar(select(Profile).where(Profile.user_id == user_id))
+
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+
+    return profile
+
+
+router.add_api_route(
+    "/profile/{user_id}",
+    get_user_profile_async if settings.use_async_db else get_user_profile,
+    methods=["GET"],
+    response_model=ProfileResponse,
+)
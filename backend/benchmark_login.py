@@ -0,0 +1,98 @@
+"""
+Login Hashing Benchmark
+
+bcrypt verification dominates the cost of POST /auth/login. This measures
+verifications per second as login handlers run them, from a pool of
+request threads (like FastAPI's threadpool):
+
+    inline         bcrypt in the request threads (PASSWORD_HASH_WORKERS=0)
+    pool (N)       app.auth.password_pool with N worker processes
+
+and, for the pool, what a burst larger than PASSWORD_HASH_MAX_PENDING does:
+how many calls are shed with 503 and the latency of the admitted ones.
+
+Usage:
+    docker-compose exec backend python benchmark_login.py
+    python benchmark_login.py --logins 200 --threads 40 --workers 1 2 4
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from app.auth import password_pool
+from app.auth.hashing import get_password_hash
+from app.config import settings
+from app.errors import APIError
+
+PASSWORD = "correct horse battery staple"
+
+
+def login_once(hashed: str) -> Tuple[bool, float]:
+    """(admitted, seconds) for one verification."""
+    started = time.perf_counter()
+    try:
+        assert password_pool.verify_password(PASSWORD, hashed)
+        return True, time.perf_counter() - started
+    except APIError:
+        return False, time.perf_counter() - started
+
+
+def run(hashed: str, logins: int, threads: int) -> Tuple[float, List[float], int]:
+    """Throughput of admitted logins, their latencies and the shed count."""
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(lambda _: login_once(hashed), range(logins)))
+        elapsed = time.perf_counter() - started
+    latencies = sorted(seconds for admitted, seconds in results if admitted)
+    return len(latencies) / elapsed, latencies, logins - len(latencies)
+
+
+def report(name: str, hashed: str, args, cores: int) -> None:
+    password_pool.start_password_pool()
+    rate, latencies, shed = run(hashed, args.logins, args.threads)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else 0.0
+    print(
+        f"   {name:<10} {rate:>7.1f} logins/s   {rate / cores:>6.1f} /core   "
+        f"p50 {statistics.median(latencies) * 1000:>7.1f} ms   p95 {p95:>7.1f} ms   shed {shed}"
+    )
+    password_pool.stop_password_pool()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=40, help="concurrent request threads")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--max-pending", type=int, default=16, help="PASSWORD_HASH_MAX_PENDING for the burst run")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    hashed = get_password_hash(PASSWORD)
+
+    print("\n" + "=" * 60)
+    print("          LOGIN HASHING BENCHMARK")
+    print("=" * 60)
+    print(f"Logins: {args.logins}   Request threads: {args.threads}   Cores: {cores}\n")
+
+    # No shedding: every login is admitted
+    settings.PASSWORD_HASH_MAX_PENDING = args.logins
+    settings.PASSWORD_HASH_WORKERS = 0
+    report("inline", hashed, args, cores)
+    for workers in args.workers:
+        settings.PASSWORD_HASH_WORKERS = workers
+        report(f"pool ({workers})", hashed, args, cores)
+
+    print(f"\n📉 Burst of {args.threads} with PASSWORD_HASH_MAX_PENDING={args.max_pending}")
+    settings.PASSWORD_HASH_MAX_PENDING = args.max_pending
+    for workers in args.workers:
+        settings.PASSWORD_HASH_WORKERS = workers
+        report(f"pool ({workers})", hashed, args, cores)
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Middleware Benchmark
+
+Requests per second through the request/response middleware, measured by
+calling the ASGI app directly (no sockets, no server) so only framework
+and middleware overhead is timed.
+
+Stacks compared on the same trivial JSON and streaming endpoints:
+
+    none         no middleware
+    legacy       the previous stack: SecurityHeadersMiddleware
+                 (BaseHTTPMiddleware) plus the request ID and process time
+                 @app.middleware("http") functions, reproduced below
+    asgi         RequestContextMiddleware (app/middleware/request_context.py),
+                 which additionally tracks SQL stats and Prometheus metrics
+
+Usage:
+    docker-compose exec backend python benchmark_middleware.py
+    python benchmark_middleware.py --requests 20000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config import settings
+from app.middleware.request_context import CONTENT_SECURITY_POLICY, PERMISSIONS_POLICY, RequestContextMiddleware
+
+
+# --------------------------------------------------
+# Previous middleware stack
+# --------------------------------------------------
+class LegacySecurityHeadersMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if not settings.ENABLE_SECURITY_HEADERS:
+            return response
+        response.headers["Content-Security-Policy"] = CONTENT_SECURITY_POLICY
+        if settings.is_production:
+            response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains; preload"
+        response.headers["X-Content-Type-Options"] = "nosniff"
+        response.headers["X-Frame-Options"] = "DENY"
+        response.headers["X-XSS-Protection"] = "1; mode=block"
+        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
+        response.headers["Permissions-Policy"] = PERMISSIONS_POLICY
+        response.headers["X-Permitted-Cross-Domain-Policies"] = "none"
+        if "Server" in response.headers:
+            del response.headers["Server"]
+        if "X-Powered-By" in response.headers:
+            del response.headers["X-Powered-By"]
+        return response
+
+
+async def legacy_request_id(request: Request, call_next):
+    request_id = str(uuid.uuid4())
+    request.state.request_id = request_id
+    response = await call_next(request)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
+
+async def legacy_process_time(request: Request, call_next):
+    start_time = time.time()
+    response = await call_next(request)
+    response.headers["X-Process-Time"] = str(time.time() - start_time)
+    return response
+
+
+# --------------------------------------------------
+# Apps
+# --------------------------------------------------
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"status": "ok"}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(8):
+                yield b"x" * 1024
+        return StreamingResponse(chunks(), media_type="application/octet-stream")
+
+    if stack == "legacy":
+        app.middleware("http")(legacy_request_id)
+        app.add_middleware(LegacySecurityHeadersMiddleware)
+        app.middleware("http")(legacy_process_time)
+    elif stack == "asgi":
+        app.add_middleware(RequestContextMiddleware)
+    return app
+
+
+async def call(app, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    status = 0
+    request_sent = False
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+async def requests_per_second(app, path: str, count: int) -> float:
+    for _ in range(200):  # warm up
+        await call(app, path)
+    started = time.perf_counter()
+    for _ in range(count):
+        await call(app, path)
+    return count / (time.perf_counter() - started)
+
+
+async def run(count: int) -> None:
+    results = {}
+    for stack in ("none", "legacy", "asgi"):
+        app = build_app(stack)
+        results[stack] = {
+            path: await requests_per_second(app, path, count)
+            for path in ("/ping", "/stream")
+        }
+
+    for path in ("/ping", "/stream"):
+        print(f"\n📈 GET {path}")
+        for stack, by_path in results.items():
+            rps = by_path[path]
+            print(f"   {stack:<8} {rps:>9,.0f} req/s   {1e6 / rps:>7.1f} µs/req")
+        overhead_legacy = 1e6 / results["legacy"][path] - 1e6 / results["none"][path]
+        overhead_asgi = 1e6 / results["asgi"][path] - 1e6 / results["none"][path]
+        print(f"   middleware overhead: legacy {overhead_legacy:.1f} µs, asgi {overhead_asgi:.1f} µs")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=10_000)
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("          MIDDLEWARE BENCHMARK")
+    print("=" * 60)
+    print(f"Requests per scenario: {args.requests:,}")
+
+    asyncio.run(run(args.requests))
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Resume Extraction Benchmark
+
+Throughput of resume text extraction (type detection, PDF/DOCX parsing,
+normalization, tokenizing) over generated resumes:
+
+    inline         extract_resume() called in this process, one at a time,
+                   as an upload handler doing the work itself would
+    pool (N)       the same through a ProcessPoolExecutor with N spawned
+                   workers, as app.storage.resume_text runs it
+
+Usage:
+    docker-compose exec backend python benchmark_resume_extraction.py
+    python benchmark_resume_extraction.py --documents 400 --pages 3 --workers 1 2 4
+"""
+
+import argparse
+import io
+import multiprocessing
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List
+from xml.sax.saxutils import escape
+
+from app.storage.text_extraction import extract_resume
+
+SKILLS = ["python", "fastapi", "postgresql", "docker", "kubernetes", "react", "terraform", "aws"]
+
+
+def resume_lines(index: int, count: int) -> List[str]:
+    return [
+        f"Candidate {index} line {line}: {SKILLS[(index + line) % len(SKILLS)]} "
+        f"and {SKILLS[line % len(SKILLS)]} experience, {line % 12} years"
+        for line in range(count)
+    ]
+
+
+def build_pdf(pages: List[List[str]]) -> bytes:
+    """A minimal valid PDF with one text line per row, Helvetica."""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        text = "BT /F1 10 Tf 50 780 Td 12 TL " + " ".join(
+            "(" + line.replace("(", "").replace(")", "") + ") '" for line in lines
+        ) + " ET"
+        stream = text.encode("latin-1")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (len(objects))
+        )
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids).encode()
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def build_docx(lines: List[str]) -> bytes:
+    """A minimal DOCX: content types, package relationship and document.xml."""
+    body = "".join(f"<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>" for line in lines)
+    files = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType='
+            '"application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            "</Types>"
+        ),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>'
+        ),
+        "word/document.xml": (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>"
+        ),
+    }
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def generate(directory: Path, documents: int, pages: int) -> List[str]:
+    paths = []
+    for index in range(documents):
+        if index % 2:
+            path = directory / f"resume_{index}.docx"
+            path.write_bytes(build_docx(resume_lines(index, 60 * pages)))
+        else:
+            path = directory / f"resume_{index}.pdf"
+            path.write_bytes(build_pdf([resume_lines(index + page, 60) for page in range(pages)]))
+        paths.append(str(path))
+    return paths
+
+
+def run_inline(paths: List[str]) -> float:
+    started = time.perf_counter()
+    for path in paths:
+        extract_resume(path)
+    return len(paths) / (time.perf_counter() - started)
+
+
+def run_pool(paths: List[str], workers: int) -> float:
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        list(pool.map(extract_resume, paths[:workers]))  # start the workers
+        started = time.perf_counter()
+        list(pool.map(extract_resume, paths))
+        return len(paths) / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=2)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("          RESUME EXTRACTION BENCHMARK")
+    print("=" * 60)
+    print(f"Documents: {args.documents} (half PDF, half DOCX)   Pages: {args.pages}\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = generate(Path(directory), args.documents, args.pages)
+        sample = extract_resume(paths[0])
+        print(f"   sample: {sample.detected_type}, {len(sample.text)} chars, {len(sample.tokens)} tokens\n")
+
+        print(f"   {'inline':<12} {run_inline(paths):>8.1f} docs/s")
+        for workers in args.workers:
+            print(f"   {f'pool ({workers})':<12} {run_pool(paths, workers):>8.1f} docs/s")
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Job Search Benchmark
+
+Compares the in-process inverted index (app/jobs/search_index.py) with the
+SQL full-text path (app/jobs/search.py) on a synthetic job dataset.
+
+The SQL side runs against --database-url (default: a temporary SQLite file
+using FTS5). Point it at a scratch Postgres database to measure the
+tsvector/GIN path; the jobs table there is dropped and recreated.
+
+Usage:
+    docker-compose exec backend python benchmark_search.py
+    python benchmark_search.py --jobs 100000 --queries 200
+    python benchmark_search.py --skip-sql
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Job, Company, User, UserRole, JobStatus, EmploymentType
+from app.jobs.search import apply_job_filters, apply_text_search, ensure_search_index
+from app.jobs.search_index import JobSearchIndex
+
+ROLES = [
+    "engineer", "developer", "designer", "analyst", "manager", "scientist",
+    "architect", "consultant", "administrator", "specialist", "lead", "intern",
+]
+LEVELS = ["junior", "senior", "staff", "principal", "associate", "head"]
+SKILLS = [
+    "python", "java", "go", "rust", "react", "vue", "sql", "postgres", "docker",
+    "kubernetes", "aws", "gcp", "terraform", "fastapi", "django", "spark",
+    "pandas", "figma", "excel", "tableau", "linux", "graphql", "redis", "kafka",
+]
+LOCATIONS = ["Remote", "Berlin", "London", "New York", "Bangalore", "Toronto", "Paris", "Austin"]
+QUERIES = [
+    "python", "senior python engineer", "react developer", "data scientist",
+    "kubernetes aws", "go", "designer figma", "principal architect", "sql analyst",
+]
+
+
+def generate_jobs(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    employment_types = list(EmploymentType)
+    start = datetime(2024, 1, 1)
+    for job_id in range(1, count + 1):
+        skills = rng.sample(SKILLS, rng.randint(2, 6))
+        salary_min = rng.randrange(20000, 150000, 1000)
+        yield {
+            "id": job_id,
+            "title": f"{rng.choice(LEVELS)} {skills[0]} {rng.choice(ROLES)}",
+            "description": f"We are hiring. Stack: {', '.join(skills)}.",
+            "required_skills": ",".join(skills),
+            "location": rng.choice(LOCATIONS),
+            "employment_type": rng.choice(employment_types),
+            "salary_min": Decimal(salary_min),
+            "salary_max": Decimal(salary_min + rng.randrange(5000, 50000, 1000)),
+            "company_id": 1,
+            "status": JobStatus.open,
+            "created_at": start + timedelta(minutes=job_id),
+        }
+
+
+def timed(func, repeats):
+    samples = []
+    for i in range(repeats):
+        started = time.perf_counter()
+        func(i)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": round(statistics.median(samples), 3),
+        "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))], 3),
+        "qps": round(1000 / statistics.mean(samples), 1),
+    }
+
+
+def bench_index(count, repeats):
+    index = JobSearchIndex()
+    started = time.perf_counter()
+    index.rebuild(generate_jobs(count))
+    build_seconds = time.perf_counter() - started
+
+    stats = index.stats()
+    print(f"\n🧠 In-memory index: {stats['documents']:,} docs, "
+          f"{stats['terms']:,} terms, {stats['postings']:,} postings")
+    print(f"   built in {build_seconds:.1f}s, ~{stats['memory_bytes'] / 1024 / 1024:.1f} MB")
+
+    def run(i):
+        index.search(QUERIES[i % len(QUERIES)], limit=20)
+
+    def run_cold(i):
+        index._results.clear()
+        index.search(QUERIES[i % len(QUERIES)], limit=20)
+
+    def run_filtered(i):
+        index.search(QUERIES[i % len(QUERIES)], limit=20, location="remote",
+                     salary_min=Decimal(60000))
+
+    print(f"   search (cold):   {timed(run_cold, repeats)}")
+    print(f"   search:          {timed(run, repeats)}")
+    print(f"   search+filters:  {timed(run_filtered, repeats)}")
+
+
+def bench_sql(count, repeats, database_url):
+    engine = create_engine(database_url, future=True)
+    Base.metadata.drop_all(engine, tables=[Job.__table__])
+    Base.metadata.create_all(engine, tables=[User.__table__, Company.__table__, Job.__table__])
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        if not db.get(User, 1):
+            db.add(User(id=1, email="bench@example.com", password_hash="-", role=UserRole.employer))
+            db.add(Company(id=1, name="Bench Co", owner_id=1))
+            db.commit()
+
+    started = time.perf_counter()
+    batch = []
+    with engine.begin() as conn:
+        for job in generate_jobs(count):
+            batch.append(job)
+            if len(batch) == 10000:
+                conn.execute(Job.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Job.__table__.insert(), batch)
+    with engine.begin() as conn:
+        ensure_search_index(conn)
+    load_seconds = time.perf_counter() - started
+    print(f"\n🗄️  SQL ({engine.dialect.name}): loaded and indexed {count:,} jobs in {load_seconds:.1f}s")
+
+    dialect = engine.dialect.name
+    with Session() as db:
+        def run(i):
+            query = apply_text_search(db.query(Job), QUERIES[i % len(QUERIES)], dialect)
+            query.limit(20).all()
+
+        def run_filtered(i):
+            query = apply_job_filters(db.query(Job), location="remote", salary_min=Decimal(60000))
+            query = apply_text_search(query, QUERIES[i % len(QUERIES)], dialect)
+            query.limit(20).all()
+
+        print(f"   search:          {timed(run, repeats)}")
+        print(f"   search+filters:  {timed(run_filtered, repeats)}")
+    engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--database-url", default=None)
+    parser.add_argument("--skip-sql", action="store_true")
+    args = parser.parse_args()
+
+    print("\n" + "=" * 60)
+    print("          JOB SEARCH BENCHMARK")
+    print("=" * 60)
+    print(f"Jobs: {args.jobs:,}   Queries per scenario: {args.queries}")
+
+    bench_index(args.jobs, args.queries)
+
+    if not args.skip_sql:
+        if args.database_url:
+            bench_sql(args.jobs, args.queries, args.database_url)
+        else:
+            with tempfile.TemporaryDirectory() as tmp:
+                bench_sql(args.jobs, args.queries, f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Serialization Benchmark
+
+Time to turn a page of jobs into JSON bytes for GET /jobs, from the query
+to the encoded body, on an in-memory SQLite database.
+
+    response_model + json    ORM instances, FastAPI's response_model pass
+                             (validate, dump to Python) and stdlib json,
+                             the previous default
+    response_model + orjson  same with ORJSONResponse, the current default
+    adapter (ORM)            ORM instances through json_response()
+    adapter (columns)        column tuples through row_dicts() and
+                             json_response(), as GET /jobs does now
+
+Usage:
+    docker-compose exec backend python benchmark_serialization.py
+    python benchmark_serialization.py --page-size 100 --repeats 500
+"""
+
+import argparse
+import json
+import statistics
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import List
+
+import orjson
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Job, Company, User, UserRole, EmploymentType
+from app.jobs.schemas import JobResponse
+from app.serialization import json_response, model_columns, row_dicts, type_adapter
+
+JOB_COLUMNS = model_columns(Job, JobResponse)
+
+
+def seed(db, count: int) -> None:
+    owner = User(email="bench@example.com", password_hash="x", role=UserRole.employer)
+    db.add(owner)
+    db.flush()
+    company = Company(name="Bench Co", owner_id=owner.id)
+    db.add(company)
+    db.flush()
+    start = datetime(2024, 1, 1)
+    db.add_all(
+        Job(
+            title=f"Senior python engineer {i}",
+            description="Build and operate APIs. " * 20,
+            location="Remote",
+            employment_type=EmploymentType.full_time,
+            salary_min=Decimal("60000.00") + i,
+            salary_max=Decimal("90000.00") + i,
+            required_skills="python,sql,docker",
+            company_id=company.id,
+            created_at=start + timedelta(minutes=i),
+        )
+        for i in range(count)
+    )
+    db.commit()
+
+
+def timed(func, repeats: int) -> str:
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    p95 = samples[int(len(samples) * 0.95) - 1]
+    return f"p50 {statistics.median(samples):6.2f} ms   p95 {p95:6.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=300)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        seed(db, args.page_size)
+
+    adapter = type_adapter(List[JobResponse])
+
+    def orm_page(db):
+        return db.query(Job).order_by(Job.created_at.desc()).limit(args.page_size).all()
+
+    def column_page(db):
+        return db.query(*JOB_COLUMNS).order_by(Job.created_at.desc()).limit(args.page_size).all()
+
+    def response_model(encode):
+        def run():
+            with Session() as db:
+                jobs = adapter.validate_python(orm_page(db), from_attributes=True)
+                encode(adapter.dump_python(jobs, mode="json"))
+        return run
+
+    def orm_fast_path():
+        with Session() as db:
+            json_response(List[JobResponse], orm_page(db))
+
+    def column_fast_path():
+        with Session() as db:
+            json_response(List[JobResponse], row_dicts(column_page(db)))
+
+    scenarios = {
+        "response_model + json": response_model(
+            lambda content: json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+        ),
+        "response_model + orjson": response_model(orjson.dumps),
+        "adapter (ORM)": orm_fast_path,
+        "adapter (columns)": column_fast_path,
+    }
+
+    print("\n" + "=" * 60)
+    print("          SERIALIZATION BENCHMARK")
+    print("=" * 60)
+    print(f"Page size: {args.page_size}   Repeats: {args.repeats}\n")
+    for name, run in scenarios.items():
+        run()  # warm up
+        print(f"   {name:<24} {timed(run, args.repeats)}")
+    print("\n" + "=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""
+Gunicorn server hooks; worker and timeout flags are set in the Dockerfile.
+
+Keeps the Prometheus multiprocess directory (PROMETHEUS_MULTIPROC_DIR,
+see app.metrics) consistent across worker restarts.
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    # Samples left by a previous run would be added to this one's
+    directory = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (connections in use, loop lag)
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
@@ -3,6 +3,7 @@ Database Initialization Script
 """
 
 from app.database import engine, Base
+from app.jobs.search import ensure_search_index
 from app.models import (
     User,
     Profile,
@@ -19,6 +20,10 @@ print("=" * 60 + "\n")
 print("📊 Creating database tables...")
 Base.metadata.create_all(bind=engine)
 
+print("🔎 Creating job search index...")
+with engine.begin() as connection:
+    ensure_search_index(connection)
+
 print("\n📋 Tables registered in SQLAlchemy metadata:")
 for table in Base.metadata.sorted_tables:
     print(f"   - {table.name}")
@@ -0,0 +1,116 @@
+"""
+Shared test setup.
+
+The app reads its settings from the environment when app.config is first
+imported, so the test environment is forced here, before any test module
+imports app code: a throwaway SQLite database and upload directory.
+"""
+import os
+import tempfile
+
+_TMP = tempfile.mkdtemp(prefix="jobmarket-tests-")
+
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_TMP}/test.db",
+    DATABASE_MODE="sync",
+    DATABASE_REPLICA_URLS="",
+    SECRET_KEY="test-secret-key",
+    ENVIRONMENT="development",
+    UPLOAD_DIR=f"{_TMP}/uploads",
+    CACHE_REDIS_URL="",
+    STATS_COUNTERS_MODE="off",
+    JOB_SEARCH_INDEX_ENABLED="false",
+    RESUME_TEXT_EXTRACTION_ENABLED="false",
+)
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """Session on freshly created tables."""
+    from app.database import Base, SessionLocal, engine
+    from app.jobs.search import ensure_search_index
+    import app.models  # noqa: F401
+
+    Base.metadata.drop_all(engine)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP TABLE IF EXISTS jobs_fts")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        ensure_search_index(conn)
+
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def company(db):
+    """An employer with one company."""
+    from app.models import Company, User, UserRole
+
+    owner = User(email="owner@example.com", password_hash="x", role=UserRole.employer)
+    db.add(owner)
+    db.flush()
+    company = Company(name="Acme", owner_id=owner.id)
+    db.add(company)
+    db.commit()
+    return company
+
+
+@pytest.fixture
+def make_job(db, company):
+    """Factory adding a committed job to the company."""
+    from app.models import EmploymentType, Job
+
+    def make(**fields):
+        values = {
+            "title": "Python developer",
+            "description": "Build APIs",
+            "employment_type": EmploymentType.full_time,
+            "company_id": company.id,
+        }
+        values.update(fields)
+        job = Job(**values)
+        db.add(job)
+        db.commit()
+        return job
+
+    return make
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    from app.cache import cache
+
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def client(db):
+    """Client for the app, without running its startup handlers."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers():
+    """Builds an Authorization header for a user."""
+    from datetime import timedelta
+    from app.auth.jwt import create_token
+
+    def make(user):
+        token = create_token(
+            user_id=user.id, role=user.role.value, token_type="access",
+            expires_delta=timedelta(minutes=5),
+        )
+        return {"Authorization": f"Bearer {token}"}
+
+    return make
@@ -0,0 +1,79 @@
+import threading
+import time
+
+from app.cache_local import LRUCache, _estimate_size
+
+
+def test_expired_entries_are_misses():
+    cache = LRUCache()
+    cache.set("fresh", 1, ttl_seconds=60)
+    cache.set("stale", 2, ttl_seconds=0)
+    assert cache.get("fresh") == 1
+    assert cache.get("stale") is None
+    assert cache.stats()["expirations"] == 1
+    assert len(cache) == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_budget_is_enforced():
+    value = b"x" * 1000
+    cache = LRUCache(max_bytes=3 * _estimate_size(value))
+    for n in range(5):
+        cache.set(f"k{n}", value)
+    assert len(cache) == 3
+    assert cache.stats()["bytes"] <= cache.max_bytes
+
+    # A value larger than the whole budget is not stored and evicts nothing
+    cache.set("huge", b"x" * 10000)
+    assert cache.get("huge") is None
+    assert len(cache) == 3
+
+
+def test_tag_invalidation_removes_only_tagged_entries():
+    cache = LRUCache()
+    cache.set("company:1:jobs", [1], tags=["company:1"])
+    cache.set("company:2:jobs", [2], tags=["company:2"])
+    cache.set("both", [3], tags=["company:1", "company:2"])
+    assert cache.invalidate_tags("company:1") == 2
+    assert cache.get("company:2:jobs") == [2]
+    assert cache.get("both") is None
+
+    # Overwriting an entry drops its old tags
+    cache.set("company:2:jobs", [2])
+    assert cache.invalidate_tags("company:2") == 0
+    assert cache.stats()["tags"] == 0
+
+
+def test_size_estimate_is_cheap_and_scales_with_content():
+    class Unpicklable:
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.payload = "x" * 5000
+
+    assert _estimate_size(Unpicklable()) > 5000
+    small = [{"title": "engineer"}] * 10
+    large = [{"title": "engineer" * 100} for _ in range(10000)]
+    assert _estimate_size(large) > 100 * _estimate_size(small)
+
+
+def test_sweeper_drops_expired_entries():
+    cache = LRUCache(sweep_interval=0.01)
+    cache.set("stale", 1, ttl_seconds=0)
+    cache.start_sweeper()
+    try:
+        deadline = time.monotonic() + 5
+        while len(cache) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        cache.stop_sweeper()
+    assert len(cache) == 0
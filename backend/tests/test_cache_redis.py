@@ -0,0 +1,125 @@
+import pickle
+import threading
+
+import pytest
+import redis
+
+from app import cache as cache_module
+from app.cache import cached, invalidate_cache
+from app.cache_local import LRUCache
+from app.cache_redis import InMemoryRedisServer, RedisCache, TieredCache
+
+
+@pytest.fixture
+def server():
+    server = InMemoryRedisServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def shared(server):
+    return RedisCache(redis.Redis.from_url(server.url), secret="test-secret")
+
+
+@pytest.fixture
+def tiered(shared, monkeypatch):
+    tiered = TieredCache(LRUCache(), shared)
+    monkeypatch.setattr(cache_module, "cache", tiered)
+    return tiered
+
+
+def test_entries_are_shared_and_invalidated_by_tag(shared, server):
+    other = RedisCache(redis.Redis.from_url(server.url), secret="test-secret")
+    shared.set("k", {"v": 1}, ttl_seconds=60, tags=["jobs"])
+    assert other.get("k") == {"v": 1}
+
+    other.invalidate_tags("jobs")
+    assert shared.get("k") is None
+
+
+def test_clear_rejects_every_entry(shared):
+    shared.set("a", 1, tags=["jobs"])
+    shared.set("b", 2)
+    shared.clear()
+    assert shared.get_many(["a", "b"]) == {}
+
+
+def test_generations_from_before_compute_reject_raced_values(shared):
+    generations = shared.tag_generations(["jobs"])
+    # Invalidated while the value was being computed
+    shared.invalidate_tags("jobs")
+    shared.set("k", "stale", tags=["jobs"], generations=generations)
+    assert shared.get("k") is None
+
+    shared.set("k", "fresh", tags=["jobs"], generations=shared.tag_generations(["jobs"]))
+    assert shared.get("k") == "fresh"
+
+
+def test_cached_does_not_share_a_value_invalidated_during_compute(tiered):
+    calls = []
+
+    @cached(ttl_seconds=60, key_prefix="raced")
+    def load():
+        calls.append(1)
+        if len(calls) == 1:
+            invalidate_cache("raced")
+        return len(calls)
+
+    assert load() == 1
+    # Another worker has nothing in L1 and must not get the raced value
+    tiered.clear_local()
+    assert load() == 2
+
+
+def test_unsigned_payloads_are_never_unpickled(shared, server):
+    class Boom:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('unpickled')",))
+
+    client = redis.Redis.from_url(server.url)
+    client.set(shared._entry_key("evil"), pickle.dumps(Boom()))
+    assert shared.get("evil") is None
+    assert shared.errors == 1
+
+    forged = RedisCache(client, secret="another-secret")
+    forged.set("k", "v")
+    assert shared.get("k") is None
+
+
+def test_tiered_promotes_shared_entries_with_their_tags(tiered, shared):
+    shared.set("k", "v", ttl_seconds=60, tags=["company:1"])
+    assert tiered.get("k") == "v"
+    assert tiered.local.get("k") == "v"
+
+    tiered.invalidate_local_tags("company:1")
+    assert tiered.local.get("k") is None
+
+
+def test_unreachable_redis_degrades_to_misses():
+    client = redis.Redis(host="127.0.0.1", port=1, socket_connect_timeout=0.1)
+    unreachable = RedisCache(client, secret="test-secret")
+    unreachable.set("k", "v")
+    assert unreachable.get("k") is None
+    assert unreachable.tag_generations(["jobs"]) is None
+    assert unreachable.errors >= 2
+
+
+def test_concurrent_writers_and_readers(shared):
+    errors = []
+
+    def work(n):
+        try:
+            for i in range(50):
+                shared.set(f"k{n}:{i}", i, tags=[f"t{n}"])
+                assert shared.get(f"k{n}:{i}") == i
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
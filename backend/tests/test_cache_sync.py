@@ -0,0 +1,148 @@
+import json
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from app.cache import (
+    ALL_TAGS,
+    add_remote_invalidation_handler,
+    invalidate_cache,
+    remove_remote_invalidation_handler,
+)
+from app.cache_sync import (
+    MAX_PAYLOAD_BYTES,
+    LocalInvalidationBus,
+    PostgresInvalidationBus,
+    _encode_messages,
+)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def received():
+    tags = []
+    handler = tags.extend
+    add_remote_invalidation_handler(handler)
+    yield tags
+    remove_remote_invalidation_handler(handler)
+
+
+class NotifyEngine:
+    """SQLite engine with a pg_notify() recording each transaction's payloads."""
+
+    def __init__(self):
+        self.engine = create_engine("sqlite://", future=True)
+        self.transactions = []
+        self.failing = False
+        self.lock = threading.Lock()
+        self._current = None
+        event.listen(self.engine, "connect", self._register)
+        event.listen(self.engine, "begin", self._begin)
+        event.listen(self.engine, "commit", self._commit)
+
+    def _register(self, dbapi_connection, _record):
+        dbapi_connection.create_function("pg_notify", 2, self._notify)
+
+    def _notify(self, channel, payload):
+        if self.failing:
+            raise RuntimeError("connection refused")
+        self._current.append((channel, payload))
+
+    def _begin(self, _conn):
+        self._current = []
+
+    def _commit(self, _conn):
+        with self.lock:
+            self.transactions.append(self._current)
+
+    def tags(self, transaction):
+        return [tag for _, payload in transaction for tag in json.loads(payload)["tags"]]
+
+
+@pytest.fixture
+def notify():
+    engine = NotifyEngine()
+    yield engine
+    engine.engine.dispose()
+
+
+def test_messages_are_split_under_the_payload_limit():
+    tags = tuple(f"company:{n:06d}" for n in range(2000))
+    messages = _encode_messages("origin", tags)
+    assert len(messages) > 1
+    assert all(len(message.encode()) <= MAX_PAYLOAD_BYTES for message in messages)
+    assert tuple(tag for m in messages for tag in json.loads(m)["tags"]) == tags
+
+
+def test_local_bus_delivers_to_other_workers_only(received):
+    bus = LocalInvalidationBus()
+    other = LocalInvalidationBus()
+    bus.subscribe(bus.handle_message)
+    bus.subscribe(other.handle_message)
+
+    bus.publish(("company:1", "jobs"))
+    assert received == ["company:1", "jobs"]
+
+    other.handle_message("not json")
+    assert received == ["company:1", "jobs"]
+
+
+def test_publishes_are_batched_into_one_transaction(notify):
+    bus = PostgresInvalidationBus(notify.engine, "cache")
+    for n in range(50):
+        bus.publish((f"company:{n}", "jobs"))
+    assert notify.transactions == []
+
+    assert bus.flush()
+    assert len(notify.transactions) == 1
+    assert sorted(notify.tags(notify.transactions[0])) == sorted(
+        {f"company:{n}" for n in range(50)} | {"jobs"}
+    )
+    assert bus.flush()
+    assert len(notify.transactions) == 1
+
+
+def test_failed_sends_are_kept_and_retried(notify):
+    bus = PostgresInvalidationBus(notify.engine, "cache")
+    bus._listening = True
+    notify.failing = True
+    bus.publish(("company:1",))
+    assert not bus.flush()
+    assert not bus.healthy
+
+    notify.failing = False
+    bus.publish(("company:2",))
+    assert bus.flush()
+    assert bus.healthy
+    assert sorted(notify.tags(notify.transactions[-1])) == ["company:1", "company:2"]
+
+
+def test_queue_overflow_falls_back_to_a_full_clear(notify, monkeypatch):
+    monkeypatch.setattr("app.cache_sync.MAX_UNDELIVERED_TAGS", 10)
+    bus = PostgresInvalidationBus(notify.engine, "cache")
+    bus.publish(tuple(f"company:{n}" for n in range(11)))
+    assert bus.flush()
+    assert notify.tags(notify.transactions[-1]) == [ALL_TAGS]
+
+
+def test_publisher_thread_sends_off_the_request_path(notify):
+    bus = PostgresInvalidationBus(notify.engine, "cache")
+    bus.start()
+    try:
+        invalidate_cache("company:7")
+        wait_for(lambda: notify.transactions)
+        assert notify.tags(notify.transactions[0]) == ["company:7"]
+
+        # Whatever is queued at shutdown still goes out
+        bus.publish(("company:8",))
+    finally:
+        bus.stop()
+    assert notify.tags(notify.transactions[-1]) == ["company:8"]
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.cache import cached, invalidate_cache
+from app.database import SessionLocal
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_concurrent_misses_compute_once():
+    calls = []
+    started = threading.Event()
+    release = threading.Event()
+
+    @cached(ttl_seconds=60, key_prefix="flight")
+    def load(n):
+        calls.append(n)
+        started.set()
+        release.wait(5)
+        return n * 2
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(load(21))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(5)
+    # Let the followers reach the flight before the leader finishes
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert results == [42] * 8
+    assert calls == [21]
+
+
+def test_leader_errors_reach_followers_and_are_not_cached():
+    calls = []
+    release = threading.Event()
+
+    @cached(ttl_seconds=60, key_prefix="failing")
+    def load():
+        calls.append(1)
+        release.wait(5)
+        raise ValueError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            load()
+        except ValueError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=call) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(errors) == 4
+    assert len(calls) == 1
+
+    with pytest.raises(ValueError):
+        load()
+    assert len(calls) == 2
+
+
+def test_async_concurrent_misses_compute_once():
+    calls = []
+
+    @cached(ttl_seconds=60, key_prefix="async-flight")
+    async def load(n):
+        calls.append(n)
+        await asyncio.sleep(0.05)
+        return n + 1
+
+    async def main():
+        return await asyncio.gather(*(load(1) for _ in range(5)))
+
+    assert asyncio.run(main()) == [2] * 5
+    assert calls == [1]
+
+
+def test_tags_and_prefix_invalidation():
+    calls = []
+
+    @cached(ttl_seconds=60, key_prefix="tagged", tags=lambda company_id: [f"company:{company_id}"])
+    def load(company_id):
+        calls.append(company_id)
+        return company_id
+
+    load(1), load(2)
+    invalidate_cache("company:1")
+    load(1), load(2)
+    assert calls == [1, 2, 1]
+    invalidate_cache("tagged")
+    load(2)
+    assert calls == [1, 2, 1, 2]
+
+
+def test_stale_value_served_while_refresh_uses_its_own_session(db):
+    sessions = []
+
+    # ttl_seconds=0: every value is stale as soon as it is stored
+    @cached(ttl_seconds=0, key_prefix="swr", stale_ttl_seconds=60, session_factory=SessionLocal)
+    def load(db):
+        sessions.append(db)
+        return len(sessions)
+
+    assert load(db) == 1
+    assert load(db) == 1
+    wait_for(lambda: len(sessions) == 2)
+    assert sessions[1] is not db
+
+
+def test_stale_value_taking_a_session_without_factory_is_recomputed_inline(db):
+    sessions = []
+
+    @cached(ttl_seconds=0, key_prefix="swr-inline", stale_ttl_seconds=60)
+    def load(db):
+        sessions.append(db)
+        return len(sessions)
+
+    assert load(db) == 1
+    assert load(db) == 2
+    assert sessions == [db, db]
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.config import settings
+from app.db_pool import (
+    InstrumentedNullPool,
+    InstrumentedQueuePool,
+    PoolLimits,
+    engine_pool_options,
+    instrument_engine,
+    metrics_for,
+    pool_limits,
+    pool_stats,
+)
+
+
+@pytest.fixture
+def budget(monkeypatch):
+    monkeypatch.setattr(settings, "DB_CONNECTION_BUDGET", 80)
+    monkeypatch.setattr(settings, "WEB_CONCURRENCY", 4)
+    monkeypatch.setattr(settings, "CACHE_SYNC_ENABLED", True)
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", None)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", None)
+
+
+def test_limits_split_the_budget_across_workers_and_engines(budget):
+    # 80 / 4 workers - 1 listener connection = 19 per worker
+    assert pool_limits() == PoolLimits(12, 7)
+    assert pool_limits(engines_per_worker=2) == PoolLimits(6, 3)
+    workers = settings.WEB_CONCURRENCY
+    assert workers * (sum(pool_limits()) + 1) <= settings.DB_CONNECTION_BUDGET
+
+
+def test_explicit_sizes_override_the_budget(budget, monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 0)
+    assert pool_limits() == PoolLimits(5, 0)
+
+
+def test_pgbouncer_leaves_pooling_to_pgbouncer(budget, monkeypatch):
+    monkeypatch.setattr(settings, "DB_PGBOUNCER", True)
+    options = engine_pool_options("primary_async", is_async=True)
+    assert options["poolclass"] is InstrumentedNullPool
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert "pool_size" not in options
+
+
+def test_checkouts_waits_and_timeouts_are_recorded(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.1,
+        pool_logging_name="test_pool",
+    )
+    instrument_engine("test_pool", engine)
+    metrics = metrics_for("test_pool")
+    try:
+        with engine.connect():
+            assert metrics.in_use == 1
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+        stats = pool_stats()["test_pool"]
+    finally:
+        engine.dispose()
+
+    assert stats["checkouts"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["in_use"] == 0
+    assert stats["wait_seconds_max"] >= 0.1
+    assert sum(stats["wait_buckets"].values()) == 2
+    assert (stats["pool_class"], stats["size"], stats["idle"]) == ("InstrumentedQueuePool", 1, 1)
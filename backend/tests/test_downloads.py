@@ -0,0 +1,114 @@
+import hashlib
+
+import pytest
+
+from app.models import Application, ResumeBlob, User, UserRole
+from app.storage.file_handler import file_handler
+
+CONTENT = b"%PDF-1.4 " + bytes(range(256)) * 4
+
+
+@pytest.fixture
+def seeker(db):
+    user = User(email="seeker@example.com", password_hash="x", role=UserRole.seeker)
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def application(db, make_job, seeker):
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    path = file_handler.blob_path(sha256)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(CONTENT)
+    db.add(ResumeBlob(sha256=sha256, size=len(CONTENT), content_type="application/pdf", ref_count=1))
+    application = Application(
+        job_id=make_job().id,
+        user_id=seeker.id,
+        resume_file_url=f"/uploads/blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}",
+    )
+    db.add(application)
+    db.commit()
+    return application
+
+
+def download(client, application, headers, **extra):
+    return client.get(f"/api/v1/applications/{application.id}/resume", headers={**headers, **extra})
+
+
+def test_full_download_with_etag(client, application, seeker, auth_headers):
+    response = download(client, application, auth_headers(seeker))
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["etag"] == f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+    assert response.headers["accept-ranges"] == "bytes"
+    assert response.headers["cache-control"].startswith("private")
+
+
+def test_if_none_match_revalidates(client, application, seeker, auth_headers):
+    etag = download(client, application, auth_headers(seeker)).headers["etag"]
+    response = download(client, application, auth_headers(seeker), **{"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.parametrize("header, start, end", [
+    ("bytes=0-9", 0, 9),
+    ("bytes=100-", 100, len(CONTENT) - 1),
+    ("bytes=-16", len(CONTENT) - 16, len(CONTENT) - 1),
+    ("bytes=10-99999", 10, len(CONTENT) - 1),
+])
+def test_single_ranges(client, application, seeker, auth_headers, header, start, end):
+    response = download(client, application, auth_headers(seeker), Range=header)
+    assert response.status_code == 206
+    assert response.content == CONTENT[start:end + 1]
+    assert response.headers["content-range"] == f"bytes {start}-{end}/{len(CONTENT)}"
+
+
+def test_unsatisfiable_range(client, application, seeker, auth_headers):
+    response = download(client, application, auth_headers(seeker), Range="bytes=99999-")
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+    assert response.json()["error"]["code"] == "RANGE_NOT_SATISFIABLE"
+
+
+def test_stale_if_range_sends_the_whole_file(client, application, seeker, auth_headers):
+    response = download(
+        client, application, auth_headers(seeker), Range="bytes=0-9", **{"If-Range": '"old"'}
+    )
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_access_control(client, db, application, company, auth_headers):
+    owner = db.get(User, company.owner_id)
+    assert download(client, application, auth_headers(owner)).status_code == 200
+
+    stranger = User(email="stranger@example.com", password_hash="x", role=UserRole.seeker)
+    db.add(stranger)
+    db.commit()
+    response = download(client, application, auth_headers(stranger))
+    assert response.status_code == 403
+    assert response.json()["error"]["code"] == "FORBIDDEN"
+
+
+def test_missing_application_and_file(client, db, application, seeker, auth_headers):
+    response = client.get("/api/v1/applications/999/resume", headers=auth_headers(seeker))
+    assert response.json()["error"]["code"] == "APPLICATION_NOT_FOUND"
+
+    file_handler.get_absolute_path(application.resume_file_url).unlink()
+    response = download(client, application, auth_headers(seeker))
+    assert response.status_code == 404
+    assert response.json()["error"]["code"] == "RESUME_NOT_FOUND"
+
+
+def test_accel_redirect_sends_headers_only(client, application, seeker, auth_headers, monkeypatch):
+    from app.config import settings
+
+    monkeypatch.setattr(settings, "RESUME_ACCEL_REDIRECT_PREFIX", "/protected/")
+    response = download(client, application, auth_headers(seeker))
+    sha256 = hashlib.sha256(CONTENT).hexdigest()
+    assert response.headers["x-accel-redirect"] == f"/protected/blobs/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+    assert response.content == b""
@@ -0,0 +1,53 @@
+import re
+
+import pytest
+
+from app.models import Application, Profile, User, UserRole
+
+
+def query_count(response):
+    assert response.status_code == 200, response.text
+    return int(re.search(r'desc="(\d+) queries"', response.headers["server-timing"]).group(1))
+
+
+@pytest.fixture
+def seeker(db):
+    user = User(email="seeker@example.com", password_hash="x", role=UserRole.seeker)
+    db.add(user)
+    db.flush()
+    db.add(Profile(user_id=user.id, full_name="Sam Seeker"))
+    db.commit()
+    return user
+
+
+def apply(db, make_job, seeker, count):
+    for _ in range(count):
+        db.add(Application(
+            job_id=make_job().id, user_id=seeker.id, resume_file_url="/uploads/resume.pdf",
+        ))
+    db.commit()
+
+
+def test_job_detail_loads_its_company_in_one_query(client, make_job):
+    job = make_job()
+    response = client.get(f"/api/v1/jobs/{job.id}")
+    assert response.json()["company"]["name"] == "Acme"
+    assert query_count(response) == 1
+
+
+@pytest.mark.parametrize("path, owner", [
+    ("/api/v1/applications/my-applications", False),
+    ("/api/v1/applications/employer/applications", True),
+])
+def test_application_lists_do_not_query_per_row(client, db, company, make_job, seeker, auth_headers, path, owner):
+    headers = auth_headers(db.get(User, company.owner_id) if owner else seeker)
+    apply(db, make_job, seeker, 1)
+    client.get(path, headers=headers)  # caches the principal
+    one = client.get(path, headers=headers)
+
+    apply(db, make_job, seeker, 4)
+    five = client.get(path, headers=headers)
+    assert len(five.json()) == 5
+    assert {row["company_name"] for row in five.json()} == {"Acme"}
+    assert {row["applicant_name"] for row in five.json()} == {"Sam Seeker"}
+    assert query_count(five) == query_count(one)
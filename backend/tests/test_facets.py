@@ -0,0 +1,72 @@
+from decimal import Decimal
+
+import pytest
+
+from app.cache import invalidate_cache
+from app.database import get_db
+from app.jobs import routes, search_index
+from app.jobs.facets import get_job_facets, normalize_filters
+from app.jobs.search_index import JobSearchIndex
+from app.models import EmploymentType, JobStatus
+
+
+@pytest.fixture
+def jobs(make_job):
+    make_job(title="Python developer", location="Berlin", salary_min=Decimal("50000"))
+    make_job(title="Python lead", location=" berlin ", salary_max=Decimal("120000"))
+    make_job(
+        title="Go developer", location="Paris", employment_type=EmploymentType.contract,
+        status=JobStatus.closed,
+    )
+    make_job(title="Designer", location="Paris")
+
+
+def as_dict(entries):
+    return {entry["value"]: entry["count"] for entry in entries}
+
+
+def test_sql_counts(db, jobs):
+    facets = get_job_facets(normalize_filters(), 20, False, db)
+    assert facets["total"] == 4
+    assert as_dict(facets["employment_type"]) == {"full_time": 3, "contract": 1}
+    # Locations are grouped case- and whitespace-insensitively
+    assert as_dict(facets["location"]) == {"Berlin": 2, "Paris": 2}
+    assert [(s["min"], s["max"], s["count"]) for s in facets["salary"]] == [
+        (30000, 60000, 1), (100000, 150000, 1),
+    ]
+    assert facets["company"] == [{"id": 1, "name": "Acme", "count": 4}]
+
+
+def test_filters_apply_to_every_facet(db, jobs):
+    facets = get_job_facets(normalize_filters(q="python", status=JobStatus.open), 20, False, db)
+    assert facets["total"] == 2
+    assert as_dict(facets["location"]) == {"Berlin": 2}
+
+
+def test_index_counts_match_sql(db, jobs, monkeypatch):
+    index = JobSearchIndex()
+    monkeypatch.setattr(search_index, "job_search_index", index)
+    monkeypatch.setattr("app.jobs.facets.job_search_index", index)
+    index.rebuild_from_db(db)
+
+    filters = normalize_filters(q="developer")
+    from_sql = get_job_facets(filters, 20, False, db)
+    from_index = get_job_facets(filters, 20, True, db)
+    assert from_index == from_sql
+
+
+def test_cached_until_jobs_are_invalidated(db, jobs, make_job):
+    filters = normalize_filters()
+    assert get_job_facets(filters, 20, False, db)["total"] == 4
+
+    make_job(title="Another")
+    assert get_job_facets(filters, 20, False, db)["total"] == 4
+    invalidate_cache("jobs")
+    assert get_job_facets(filters, 20, False, db)["total"] == 5
+
+
+def test_route_computes_on_the_primary():
+    # Cached counts must not come from a lagging replica
+    route = next(r for r in routes.router.routes if r.path.endswith("/facets"))
+    dependencies = [d.call for d in route.dependant.dependencies]
+    assert get_db in dependencies
@@ -0,0 +1,156 @@
+import asyncio
+import io
+import os
+import threading
+import time
+
+import pytest
+from fastapi import HTTPException, UploadFile
+from starlette.datastructures import Headers
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import ResumeBlob
+from app.storage.file_handler import FileHandler
+
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch, db):
+    monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path / "uploads"))
+    return FileHandler()
+
+
+def upload(content: bytes, content_type: str = "application/pdf") -> UploadFile:
+    return UploadFile(
+        io.BytesIO(content),
+        size=len(content),
+        filename="resume.pdf",
+        headers=Headers({"content-type": content_type}),
+    )
+
+
+def save(handler, content, db):
+    url = asyncio.run(handler.save_resume(upload(content), db))
+    db.commit()
+    return url
+
+
+def ref_count(db, url):
+    db.expire_all()
+    blob = db.get(ResumeBlob, FileHandler.blob_hash(url))
+    return blob.ref_count if blob else None
+
+
+def test_identical_uploads_share_one_blob(handler, db):
+    first = save(handler, b"%PDF resume", db)
+    second = save(handler, b"%PDF resume", db)
+    other = save(handler, b"%PDF another resume", db)
+
+    assert first == second != other
+    assert ref_count(db, first) == 2
+    assert handler.get_absolute_path(first).read_bytes() == b"%PDF resume"
+    assert len(list(handler.blob_dir.glob("*/*/*"))) == 2
+    assert list(handler.temp_dir.iterdir()) == []
+
+
+def test_oversized_and_invalid_uploads_leave_nothing_behind(handler, db, monkeypatch):
+    monkeypatch.setattr(handler, "max_size", 10)
+    with pytest.raises(HTTPException):
+        # The declared size is unknown, so the limit is hit while streaming
+        asyncio.run(handler.save_resume(UploadFile(
+            io.BytesIO(b"x" * 100), headers=Headers({"content-type": "application/pdf"}),
+        ), db))
+    with pytest.raises(HTTPException):
+        asyncio.run(handler.save_resume(upload(b"text", "text/plain"), db))
+    db.rollback()
+    assert list(handler.temp_dir.iterdir()) == []
+    assert list(handler.blob_dir.glob("*/*/*")) == []
+
+
+def test_delete_releases_a_reference_and_gc_removes_unreferenced_blobs(handler, db):
+    url = save(handler, b"%PDF resume", db)
+    save(handler, b"%PDF resume", db)
+    path = handler.get_absolute_path(url)
+
+    handler.delete_file(url, db)
+    db.commit()
+    assert ref_count(db, url) == 1
+    assert handler.collect_garbage(db) == 0
+    assert path.exists()
+
+    handler.delete_file(url, db)
+    handler.delete_file(url, db)  # never below zero
+    db.commit()
+    assert ref_count(db, url) == 0
+    assert handler.collect_garbage(db) == 1
+    assert ref_count(db, url) is None
+    assert not path.exists()
+
+
+def test_rolled_back_reference_is_not_counted(handler, db):
+    url = save(handler, b"%PDF resume", db)
+    asyncio.run(handler.save_resume(upload(b"%PDF resume"), db))
+    db.rollback()
+    assert ref_count(db, url) == 1
+
+
+def test_upload_racing_gc_keeps_its_file(handler, db, monkeypatch):
+    url = save(handler, b"%PDF resume", db)
+    handler.delete_file(url, db)
+    db.commit()
+
+    collecting = threading.Event()
+    release = threading.Event()
+    commit_and_unlink = FileHandler._commit_and_unlink
+
+    def paused(session, path):
+        collecting.set()
+        release.wait(5)
+        commit_and_unlink(session, path)
+
+    monkeypatch.setattr(FileHandler, "_commit_and_unlink", staticmethod(paused))
+    gc_session = SessionLocal()
+    gc = threading.Thread(target=handler.collect_garbage, args=(gc_session,))
+    gc.start()
+    assert collecting.wait(5)
+
+    # GC holds the blob lock with the row deleted but not yet committed:
+    # the upload's reference must wait for it rather than see the old file
+    uploaded = []
+    upload_session = SessionLocal()
+
+    def upload_again():
+        uploaded.append(save(handler, b"%PDF resume", upload_session))
+
+    uploader = threading.Thread(target=upload_again)
+    uploader.start()
+    time.sleep(0.2)
+    assert not uploaded
+    release.set()
+    gc.join(5)
+    uploader.join(5)
+    gc_session.close()
+    upload_session.close()
+
+    assert uploaded == [url]
+    assert ref_count(db, url) == 1
+    assert handler.get_absolute_path(url).read_bytes() == b"%PDF resume"
+
+
+def test_sweep_removes_old_orphans_only(handler, db):
+    url = save(handler, b"%PDF resume", db)
+    orphan = handler.blob_path("f" * 64)
+    orphan.parent.mkdir(parents=True)
+    orphan.write_bytes(b"rolled back upload")
+    partial = handler.temp_dir / "upload.part"
+    partial.write_bytes(b"partial")
+
+    assert handler.sweep_orphans(db, min_age=60) == 0
+    old = time.time() - 120
+    for path in (orphan, partial, handler.get_absolute_path(url)):
+        os.utime(path, (old, old))
+
+    assert handler.sweep_orphans(db, min_age=60) == 2
+    assert not orphan.exists()
+    assert not partial.exists()
+    assert handler.get_absolute_path(url).exists()
@@ -0,0 +1,69 @@
+from decimal import Decimal
+
+import pytest
+
+from app.jobs.search import _fts5_match_expression
+from app.models import EmploymentType
+
+
+@pytest.fixture
+def jobs(make_job):
+    return {
+        "title": make_job(title="Python developer", required_skills="Django"),
+        "skills": make_job(title="Backend engineer", required_skills="Python, Go"),
+        "description": make_job(title="Data analyst", description="Some Python scripting"),
+        "other": make_job(title="Rust developer", description="Systems work"),
+    }
+
+
+def search(client, **params):
+    response = client.get("/api/v1/jobs", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_matches_are_ranked_title_skills_description(client, jobs):
+    ids = [job["id"] for job in search(client, q="python")]
+    assert ids == [jobs["title"].id, jobs["skills"].id, jobs["description"].id]
+
+
+def test_search_is_an_alias_of_q(client, jobs):
+    assert search(client, search="rust") == search(client, q="rust")
+    assert [job["id"] for job in search(client, q="rust")] == [jobs["other"].id]
+
+
+def test_terms_are_stemmed_prefixes_and_all_required(client, jobs):
+    assert {job["id"] for job in search(client, q="develop")} == {jobs["title"].id, jobs["other"].id}
+    assert [job["id"] for job in search(client, q="pyth djan")] == [jobs["title"].id]
+    assert search(client, q="python rust") == []
+
+
+def test_filters_combine_with_the_text_match(client, make_job, jobs):
+    remote = make_job(
+        title="Python contractor", location="Remote",
+        employment_type=EmploymentType.contract,
+        salary_min=Decimal("50000"), salary_max=Decimal("70000"),
+    )
+    assert [job["id"] for job in search(client, q="python", location="remote")] == [remote.id]
+    assert [job["id"] for job in search(client, q="python", employment_type="contract")] == [remote.id]
+    assert [job["id"] for job in search(client, q="python", salary_min=60000)] == [remote.id]
+    assert search(client, q="python", salary_max=40000) == []
+
+
+def test_updates_and_deletes_reach_the_index(client, db, jobs):
+    jobs["other"].title = "Elixir developer"
+    db.commit()
+    assert search(client, q="rust") == []
+    assert [job["id"] for job in search(client, q="elixir")] == [jobs["other"].id]
+
+    db.delete(jobs["other"])
+    db.commit()
+    assert search(client, q="elixir") == []
+
+
+def test_user_input_cannot_inject_fts5_syntax(client, jobs):
+    assert _fts5_match_expression('title:python OR "x') == '"title"* "python"* "or"* "x"*'
+    assert _fts5_match_expression("*** ---") is None
+    assert search(client, q='python" OR *') == []
+    # Punctuation-only queries fall back to the unfiltered list
+    assert len(search(client, q="***")) == 4
@@ -0,0 +1,49 @@
+from prometheus_client import REGISTRY
+
+from app.cache import cached
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def requests_served(route, status, method="GET"):
+    return sample("http_requests_total", method=method, route=route, status=status)
+
+
+def test_requests_are_labelled_by_route_template(client):
+    before = requests_served("/api/v1/jobs/{job_id}", "404")
+    client.get("/api/v1/jobs/12345")
+    client.get("/api/v1/jobs/67890")
+    assert requests_served("/api/v1/jobs/{job_id}", "404") == before + 2
+
+
+def test_unmatched_paths_share_one_series(client):
+    before = requests_served("<unmatched>", "404")
+    client.get("/no/such/path/1")
+    client.get("/no/such/path/2")
+    assert requests_served("<unmatched>", "404") == before + 2
+
+
+def test_latency_is_observed(client):
+    before = sample("http_request_duration_seconds_count", method="GET", route="/", status="200")
+    client.get("/")
+    assert sample("http_request_duration_seconds_count", method="GET", route="/", status="200") == before + 1
+
+
+def test_cache_lookups_are_counted_per_prefix():
+    @cached(ttl_seconds=60, key_prefix="metrics-test")
+    def load():
+        return 1
+
+    load(), load(), load()
+    assert sample("cache_lookups_total", prefix="metrics-test", result="miss") == 1
+    assert sample("cache_lookups_total", prefix="metrics-test", result="hit") == 2
+
+
+def test_metrics_endpoint_exposes_the_registry(client):
+    client.get("/")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'http_requests_total{method="GET",route="/",status="200"}' in response.text
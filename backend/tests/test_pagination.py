@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, create_engine, func, text
+from sqlalchemy.orm import Session, declarative_base
+
+from app.pagination import paginate_keyset
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+def walk(db: Session, limit: int):
+    pages, cursor = [], ""
+    while cursor is not None:
+        rows, cursor = paginate_keyset(db.query(Item), Item.created_at, Item.id, cursor, limit)
+        pages.append([row.id for row in rows])
+        assert len(pages) < 20, "next_cursor does not advance"
+    return pages
+
+
+def test_page_boundary_splits_equal_timestamps():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        # Same instant in both SQLite text formats: as a server default
+        # writes it ("... 10:00:00") and as a bound datetime ("....000000")
+        for item_id in range(1, 5):
+            db.execute(text(
+                "INSERT INTO items (id, created_at) VALUES (:id, '2024-01-01 10:00:00')"
+            ), {"id": item_id})
+        db.add_all(Item(id=item_id, created_at=datetime(2024, 1, 1, 10, 0, 0)) for item_id in range(5, 8))
+        db.add(Item(id=8, created_at=datetime(2023, 12, 31, 9, 0, 0)))
+        db.commit()
+
+        pages = walk(db, limit=3)
+
+    assert pages == [[7, 6, 5], [4, 3, 2], [1, 8]]
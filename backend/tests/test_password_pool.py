@@ -0,0 +1,81 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.auth import hashing, password_pool
+from app.config import settings
+from app.errors import APIError
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    # Threads instead of spawned processes keep the test fast
+    pool = ThreadPoolExecutor(4)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 4)
+    monkeypatch.setattr(password_pool, "_pool", pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_hash_and_verify_round_trip(thread_pool):
+    hashed = password_pool.get_password_hash("correct horse")
+    assert password_pool.verify_password("correct horse", hashed)
+    assert not password_pool.verify_password("wrong", hashed)
+
+
+def test_inline_without_workers(monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr(password_pool, "_get_pool", lambda: pytest.fail("pool used"))
+    assert password_pool.verify_password("pw", hashing.get_password_hash("pw"))
+
+
+def test_calls_beyond_the_pending_limit_are_shed(thread_pool, monkeypatch):
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    release = threading.Event()
+    monkeypatch.setattr(hashing, "verify_password", lambda *args: release.wait(5))
+
+    callers = [threading.Thread(target=password_pool.verify_password, args=("pw", "x")) for _ in range(2)]
+    for caller in callers:
+        caller.start()
+    while password_pool._pending < 2:
+        time.sleep(0.01)
+
+    with pytest.raises(APIError) as excinfo:
+        password_pool.verify_password("pw", "x")
+    assert excinfo.value.status_code == 503
+    assert excinfo.value.code == "AUTH_BUSY"
+
+    release.set()
+    for caller in callers:
+        caller.join(5)
+    assert password_pool._pending == 0
+
+
+def test_broken_pool_is_replaced(thread_pool, monkeypatch):
+    def broken(*args):
+        raise BrokenProcessPool("worker died")
+
+    monkeypatch.setattr(hashing, "verify_password", broken)
+    with pytest.raises(BrokenProcessPool):
+        password_pool.verify_password("pw", "x")
+    assert password_pool._pool is None
+    assert password_pool._pending == 0
+
+
+def test_start_does_not_wait_for_workers(monkeypatch):
+    class SlowPool:
+        submitted = 0
+
+        def submit(self, func, *args):
+            self.submitted += 1
+            # Never completes, like a worker still spawning
+            return Future()
+
+    pool = SlowPool()
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 3)
+    monkeypatch.setattr(password_pool, "_pool", pool)
+    password_pool.start_password_pool()
+    assert pool.submitted == 3
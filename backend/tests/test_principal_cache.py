@@ -0,0 +1,96 @@
+import pytest
+
+from app.auth import dependencies
+from app.auth.dependencies import CachedUser, _get_user_by_id
+from app.cache import cache
+from app.config import settings
+from app.models import Profile, User, UserRole
+
+
+@pytest.fixture
+def user(db):
+    user = User(email="seeker@example.com", password_hash="x", role=UserRole.seeker)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def cached_principal(user_id):
+    return cache.get(f"user:{user_id}")
+
+
+def test_principal_is_cached_after_the_first_lookup(db, user):
+    _get_user_by_id(user.id, db)
+    principal = cached_principal(user.id)
+    assert isinstance(principal, CachedUser)
+    assert (principal.email, principal.role, principal.is_active) == (user.email, UserRole.seeker, True)
+    assert _get_user_by_id(user.id, db) is principal
+
+
+@pytest.mark.parametrize("field, value", [
+    ("email", "renamed@example.com"),
+    ("role", UserRole.admin),
+    ("is_active", False),
+])
+def test_principal_changes_evict_on_commit(db, user, field, value):
+    _get_user_by_id(user.id, db)
+    setattr(user, field, value)
+    db.flush()
+    assert cached_principal(user.id) is not None
+    db.commit()
+    assert cached_principal(user.id) is None
+    assert getattr(_get_user_by_id(user.id, db), field) == value
+
+
+def test_rolled_back_changes_keep_the_entry(db, user):
+    _get_user_by_id(user.id, db)
+    user.role = UserRole.admin
+    db.flush()
+    db.rollback()
+    db.commit()
+    assert cached_principal(user.id) is not None
+
+
+def test_other_fields_do_not_evict(db, user):
+    _get_user_by_id(user.id, db)
+    user.password_hash = "y"
+    db.commit()
+    assert cached_principal(user.id) is not None
+
+
+def test_deleting_the_user_evicts(db, user):
+    _get_user_by_id(user.id, db)
+    user_id = user.id
+    db.delete(user)
+    db.commit()
+    assert cached_principal(user_id) is None
+
+
+def test_disabled_user_is_refused_on_the_next_request(client, db, user, auth_headers):
+    db.add(Profile(user_id=user.id, full_name="Sam Seeker"))
+    db.commit()
+    headers = auth_headers(user)
+    assert client.get("/api/v1/users/profile", headers=headers).status_code == 200
+    user.is_active = False
+    db.commit()
+    response = client.get("/api/v1/users/profile", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["error"]["code"] == "ACCOUNT_DISABLED"
+
+
+@pytest.mark.parametrize("healthy, ttl", [
+    (True, settings.AUTH_USER_CACHE_TTL),
+    (False, settings.AUTH_USER_CACHE_FALLBACK_TTL),
+])
+def test_long_ttl_only_while_cache_sync_is_healthy(db, user, monkeypatch, healthy, ttl):
+    monkeypatch.setattr(dependencies, "cache_sync_healthy", lambda: healthy)
+    ttls = []
+    set_value = cache.set
+
+    def recording_set(key, value, ttl_seconds=300, **kwargs):
+        ttls.append(ttl_seconds)
+        set_value(key, value, ttl_seconds, **kwargs)
+
+    monkeypatch.setattr(cache, "set", recording_set)
+    _get_user_by_id(user.id, db)
+    assert ttls == [ttl]
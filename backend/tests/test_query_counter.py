@@ -0,0 +1,61 @@
+import logging
+
+import pytest
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+from app.query_counter import QueryBudgetExceeded, _format_parameters, track_queries
+
+
+@pytest.fixture
+def log_every_query(monkeypatch):
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 0)
+
+
+def slow_query_records(caplog):
+    return [record for record in caplog.records if record.name == "app.sql"]
+
+
+def test_parameters_are_redacted_by_default(db, log_every_query, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        db.execute(text("SELECT :email, :id, :missing"), {
+            "email": "alice@example.com", "id": 7, "missing": None,
+        })
+    record = slow_query_records(caplog)[-1]
+    assert "alice@example.com" not in record.params
+    assert "<str>" in record.params and "<int>" in record.params
+    assert record.sql == "SELECT ?, ?, ?"
+
+
+def test_parameter_values_are_logged_when_enabled(db, log_every_query, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_LOG_PARAMETERS", True)
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        db.execute(text("SELECT :email"), {"email": "alice@example.com"})
+    assert "alice@example.com" in slow_query_records(caplog)[-1].params
+
+
+def test_executemany_logs_row_count_and_first_row_shape():
+    rows = [("alice@example.com", 1), ("bob@example.com", 2)]
+    assert _format_parameters(rows, executemany=True) == "2 rows, first: (<str>, <int>)"
+
+
+def test_fast_queries_are_not_logged(db, caplog):
+    with caplog.at_level(logging.WARNING, logger="app.sql"):
+        db.execute(text("SELECT 1"))
+    assert slow_query_records(caplog) == []
+
+
+def test_trackers_nest_and_enforce_budgets():
+    with track_queries() as outer:
+        with engine.connect() as conn:
+            with track_queries(limit=2) as inner:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+                with pytest.raises(QueryBudgetExceeded):
+                    conn.execute(text("SELECT 3"))
+    # The rejected statement never runs; only the inner budget saw it
+    assert inner.count == 3
+    assert outer.count == 2
+    assert inner.duration > 0
+    assert inner.server_timing().endswith('desc="3 queries"')
@@ -0,0 +1,92 @@
+import time
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app import database, db_replicas
+from app.db_replicas import READ_YOUR_WRITES_COOKIE, ReplicaSet, wants_primary
+from app.middleware.request_context import RequestContextMiddleware
+
+
+@pytest.fixture
+def replica_set(monkeypatch):
+    replicas = ReplicaSet(max_lag_seconds=5, check_interval=60)
+    engines = [create_engine("sqlite://") for _ in range(2)]
+    for n, engine in enumerate(engines):
+        replicas.add(f"replica{n}", engine)
+    monkeypatch.setattr(database, "replicas", replicas)
+    yield replicas
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def client(replica_set):
+    app = FastAPI()
+
+    @app.get("/read")
+    def read(request: Request, db=Depends(database.get_read_db)):
+        return {"route": request.state.db_route}
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    @app.post("/invalid")
+    def invalid():
+        raise HTTPException(status_code=400)
+
+    app.add_middleware(RequestContextMiddleware, read_your_writes=True)
+    # The cookie is Secure
+    return TestClient(app, base_url="https://testserver")
+
+
+def test_healthy_replicas_are_picked_round_robin(replica_set):
+    assert replica_set.pick() is None  # never checked
+    replica_set.check()
+    assert [replica_set.pick().name for _ in range(4)] == ["replica0", "replica1"] * 2
+
+
+def test_lagging_and_stale_replicas_leave_rotation(replica_set, monkeypatch):
+    lags = {"replica0": 1.0, "replica1": 30.0}
+    monkeypatch.setattr(
+        db_replicas, "measure_lag",
+        lambda engine: lags[next(r.name for r in replica_set.replicas if r.engine is engine)],
+    )
+    replica_set.check()
+    assert {replica_set.pick().name for _ in range(4)} == {"replica0"}
+    assert replica_set.replicas[1].error == "lag 30.0s over limit"
+
+    # A replica whose last check is too old is treated as unchecked
+    replica_set.replicas[0].checked_at = time.time() - 3 * replica_set.check_interval - 1
+    assert replica_set.pick() is None
+
+
+def test_wants_primary_only_while_the_window_is_open():
+    assert wants_primary({READ_YOUR_WRITES_COOKIE: str(time.time() + 10)})
+    assert not wants_primary({READ_YOUR_WRITES_COOKIE: str(time.time() - 1)})
+    assert not wants_primary({READ_YOUR_WRITES_COOKIE: "garbage"})
+    assert not wants_primary({})
+
+
+def test_successful_writes_pin_the_client_to_the_primary(client, replica_set):
+    replica_set.check()
+    assert client.get("/read").json()["route"].startswith("replica")
+    assert READ_YOUR_WRITES_COOKIE not in client.cookies
+
+    client.post("/invalid")
+    assert READ_YOUR_WRITES_COOKIE not in client.cookies
+
+    response = client.post("/write")
+    cookie = response.headers["set-cookie"]
+    assert "HttpOnly" in cookie and "Path=/" in cookie
+    assert client.get("/read").json()["route"] == "primary"
+
+
+def test_other_clients_keep_using_replicas(client, replica_set):
+    replica_set.check()
+    client.post("/write")
+    other = TestClient(client.app, base_url="https://testserver")
+    assert other.get("/read").json()["route"].startswith("replica")
@@ -0,0 +1,76 @@
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import get_db
+from app.middleware.request_context import RequestContextMiddleware
+from app.query_counter import QueryBudgetExceeded
+
+
+def make_client():
+    app = FastAPI()
+
+    @app.get("/plain")
+    def plain():
+        return JSONResponse({}, headers={"Server": "uvicorn", "X-Frame-Options": "SAMEORIGIN"})
+
+    @app.get("/queries")
+    def queries(db=Depends(get_db)):
+        for _ in range(3):
+            db.execute(text("SELECT 1"))
+        return {}
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"first,", b"second"]), media_type="text/csv")
+
+    app.add_middleware(RequestContextMiddleware)
+    return TestClient(app)
+
+
+@pytest.fixture
+def client(db):
+    return make_client()
+
+
+def test_security_headers_replace_the_apps_own(client):
+    response = client.get("/plain")
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert "frame-ancestors 'none'" in response.headers["content-security-policy"]
+    assert "server" not in response.headers
+    # Development settings: no HSTS
+    assert "strict-transport-security" not in response.headers
+
+
+def test_every_response_gets_its_own_request_id(client):
+    first, second = client.get("/plain"), client.get("/plain")
+    assert first.headers["x-request-id"] != second.headers["x-request-id"]
+    assert float(first.headers["x-process-time"]) >= 0
+
+
+def test_server_timing_counts_the_requests_queries(client):
+    timing = client.get("/queries").headers["server-timing"]
+    assert 'desc="3 queries"' in timing
+    assert "total;dur=" in timing
+
+
+def test_streaming_bodies_pass_through(client):
+    response = client.get("/stream")
+    assert response.content == b"first,second"
+    assert response.headers["x-request-id"]
+    assert response.headers["x-frame-options"] == "DENY"
+
+
+def test_query_guard_rejects_n_plus_one(db, monkeypatch):
+    monkeypatch.setattr(settings, "QUERY_GUARD_MAX_QUERIES", 2)
+    with pytest.raises(QueryBudgetExceeded):
+        make_client().get("/queries")
+
+
+def test_server_timing_can_be_disabled(db, monkeypatch):
+    monkeypatch.setattr(settings, "SERVER_TIMING_ENABLED", False)
+    assert "server-timing" not in make_client().get("/queries").headers
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.config import settings
+from app.models import ResumeText
+from app.storage import resume_text
+from app.storage.text_extraction import DOCX_TYPE, extract_resume
+
+
+@pytest.fixture
+def scheduled(monkeypatch):
+    monkeypatch.setattr(settings, "RESUME_TEXT_EXTRACTION_ENABLED", True)
+    calls = []
+    monkeypatch.setattr(
+        resume_text, "schedule_extraction",
+        lambda sha256, path: calls.append((sha256, threading.current_thread())),
+    )
+    return calls
+
+
+def write_docx(path, *paragraphs):
+    body = "".join(f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>" for text in paragraphs)
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr(
+            "word/document.xml",
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f"<w:body>{body}</w:body></w:document>",
+        )
+
+
+def test_extraction_waits_for_commit(db, scheduled, tmp_path):
+    async def upload_then(finish):
+        resume_text.extract_after_commit(db, "a" * 64, tmp_path / "blob")
+        assert scheduled == []
+        finish()
+        await asyncio.sleep(0)
+
+    asyncio.run(upload_then(db.rollback))
+    assert scheduled == []
+
+    asyncio.run(upload_then(db.commit))
+    assert [sha256 for sha256, _ in scheduled] == ["a" * 64]
+
+
+def test_commit_on_a_worker_thread_schedules_on_the_loop(db, scheduled, tmp_path):
+    async def upload():
+        resume_text.extract_after_commit(db, "b" * 64, tmp_path / "blob")
+        # Sync routes commit on a threadpool thread
+        await asyncio.get_running_loop().run_in_executor(None, db.commit)
+        await asyncio.sleep(0)
+
+    asyncio.run(upload())
+    assert scheduled == [("b" * 64, threading.main_thread())]
+
+
+def test_extract_resume_reads_docx(tmp_path):
+    path = tmp_path / "resume.docx"
+    write_docx(path, "Senior  Python developer", "Kubernetes, Go")
+    extraction = extract_resume(str(path))
+    assert extraction.detected_type == DOCX_TYPE
+    assert extraction.text == "Senior Python developer Kubernetes, Go"
+    assert extraction.tokens == ["developer", "go", "kubernetes", "python", "senior"]
+
+
+def test_unsupported_types_store_empty_text(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("plain text resume")
+    assert extract_resume(str(path)).text == ""
+
+
+def test_extraction_stores_text_once(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "RESUME_TEXT_EXTRACTION_ENABLED", True)
+    # Threads instead of spawned processes keep the test fast
+    monkeypatch.setattr(resume_text, "_get_pool", lambda: ThreadPoolExecutor(1))
+    path = tmp_path / "resume.docx"
+    write_docx(path, "Rust engineer")
+
+    async def extract_twice():
+        resume_text.schedule_extraction("c" * 64, path)
+        await asyncio.gather(*resume_text._tasks)
+        resume_text.schedule_extraction("c" * 64, path)
+        await asyncio.gather(*resume_text._tasks)
+
+    asyncio.run(extract_twice())
+    stored = db.get(ResumeText, "c" * 64)
+    assert stored.text == "Rust engineer"
+    assert stored.tokens == "engineer rust"
+    assert resume_text._in_flight == set()
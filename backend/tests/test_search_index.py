@@ -0,0 +1,166 @@
+import threading
+
+import pytest
+
+from app.jobs import search_index
+from app.jobs.search_index import JobSearchIndex, tokenize
+from app.models import EmploymentType, JobStatus
+
+
+def job(job_id, title="Engineer", skills="", description="", status=JobStatus.open, **fields):
+    values = {
+        "id": job_id,
+        "title": title,
+        "description": description,
+        "required_skills": skills,
+        "location": "Berlin",
+        "employment_type": EmploymentType.full_time,
+        "salary_min": None,
+        "salary_max": None,
+        "company_id": 1,
+        "status": status,
+    }
+    values.update(fields)
+    return values
+
+
+@pytest.fixture
+def index():
+    index = JobSearchIndex()
+    index.rebuild([])
+    return index
+
+
+def test_tokenize_drops_stopwords():
+    assert tokenize("The Python and Go developer") == ["python", "go", "developer"]
+
+
+def test_bm25_ranks_title_over_skills_over_description(index):
+    index.add(job(1, title="Chef", description="We cook with python daily"))
+    index.add(job(2, title="Chef", skills="python"))
+    index.add(job(3, title="Python developer"))
+    assert index.search("python") == [3, 2, 1]
+
+
+def test_every_term_must_match(index):
+    index.add(job(1, title="Python developer"))
+    index.add(job(2, title="Go developer"))
+    assert index.search("python developer") == [1]
+    assert index.search("rust developer") == []
+
+
+def test_terms_match_as_prefixes_like_fts5(index):
+    index.add(job(1, title="Developer", description="Kubernetes clusters"))
+    index.add(job(2, title="Development lead"))
+    assert sorted(index.search("dev")) == [1, 2]
+    assert index.search("kube") == [1]
+
+
+def test_words_are_not_stemmed(index):
+    # FTS5 (porter) and Postgres (english) stem "developers" to "develop";
+    # the in-memory index only matches it as a prefix
+    index.add(job(1, title="Developer"))
+    assert index.search("developers") == []
+
+
+def test_filters_and_status(index):
+    index.add(job(1, title="Python dev", location="Berlin"))
+    index.add(job(2, title="Python dev", location="Paris", status=JobStatus.closed))
+    assert index.search("python", location="paris") == [2]
+    assert index.search("python", status=JobStatus.open) == [1]
+
+
+def test_reindex_and_remove(index):
+    index.add(job(1, title="Python dev"))
+    index.add(job(1, title="Go dev"))
+    assert index.search("python") == []
+    assert index.search("go") == [1]
+    index.remove(1)
+    assert index.search("go") == []
+    assert index.stats()["documents"] == 0
+
+
+def test_compaction_keeps_results(index):
+    for job_id in range(1, 1500):
+        index.add(job(job_id, title=f"Python dev {job_id}"))
+    for job_id in range(1, 1400):
+        index.remove(job_id)
+    assert index.stats()["slots"] < 1499
+    assert sorted(index.search("python")) == list(range(1400, 1500))
+
+
+def test_rebuild_replays_changes_applied_while_building(index):
+    index.add(job(1, title="Stale"))
+
+    def rows():
+        yield job(1, title="Old title")
+        yield job(2, title="Deleted meanwhile")
+        # Commits landing while the rebuild reads the table
+        index.add(job(1, title="New title"))
+        index.remove(2)
+        index.add(job(3, title="Added meanwhile"))
+
+    index.rebuild(rows())
+    assert index.search("new") == [1]
+    assert index.search("old") == []
+    assert index.search("deleted") == []
+    assert index.search("added") == [3]
+    assert not index.building
+
+
+def test_concurrent_writes_and_searches(index):
+    errors = []
+
+    def write(offset):
+        try:
+            for i in range(200):
+                index.add(job(offset + i, title="Python dev"))
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    def read():
+        try:
+            for _ in range(200):
+                index.search("python", limit=10)
+        except Exception as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(n * 1000,)) for n in range(1, 4)]
+    threads += [threading.Thread(target=read) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(index.search("python", limit=1000)) == 600
+
+
+def test_commits_reach_the_index(db, make_job, monkeypatch):
+    index = JobSearchIndex()
+    monkeypatch.setattr(search_index, "job_search_index", index)
+    index.rebuild_from_db(db)
+
+    created = make_job(title="Kotlin engineer")
+    assert index.search("kotlin") == [created.id]
+
+    created.title = "Scala engineer"
+    db.commit()
+    assert index.search("kotlin") == []
+    assert index.search("scala") == [created.id]
+
+    db.delete(created)
+    db.commit()
+    assert index.search("scala") == []
+
+
+def test_rolled_back_changes_are_not_indexed(db, make_job, monkeypatch):
+    index = JobSearchIndex()
+    monkeypatch.setattr(search_index, "job_search_index", index)
+    index.rebuild_from_db(db)
+
+    job_id = make_job(title="Kotlin engineer").id
+    db.get(search_index.Job, job_id).title = "Scala engineer"
+    db.flush()
+    db.rollback()
+    assert index.search("scala") == []
+    assert index.search("kotlin") == [job_id]
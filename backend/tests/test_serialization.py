@@ -0,0 +1,30 @@
+import json
+from decimal import Decimal
+
+from app.jobs.routes import JOB_COLUMNS, JobList
+from app.jobs.schemas import JobResponse
+from app.models import Job
+from app.serialization import json_response, row_dicts, type_adapter
+
+
+def test_fast_path_matches_response_model_output(db, make_job):
+    make_job(salary_min=Decimal("50000.50"), salary_max=Decimal("70000"), location="Berlin")
+    make_job(title="Go developer")
+
+    rows = db.query(*JOB_COLUMNS).order_by(Job.id).all()
+    fast = json.loads(json_response(JobList, row_dicts(rows)).body)
+    orm = db.query(Job).order_by(Job.id).all()
+    slow = [JobResponse.model_validate(job).model_dump(mode="json") for job in orm]
+    assert fast == slow
+
+
+def test_type_adapters_are_built_once():
+    assert type_adapter(JobList) is type_adapter(JobList)
+
+
+def test_job_list_endpoint_serves_the_same_json(client, db, make_job):
+    make_job(salary_min=Decimal("1000"))
+    response = client.get("/api/v1/jobs")
+    assert response.headers["content-type"] == "application/json"
+    orm = db.query(Job).all()
+    assert response.json() == [JobResponse.model_validate(job).model_dump(mode="json") for job in orm]
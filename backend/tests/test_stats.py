@@ -0,0 +1,130 @@
+import re
+import threading
+import warnings
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import SAWarning
+
+from app.admin import stats
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import Job, JobStatus, StatCounter
+
+
+@pytest.fixture
+def incremental(monkeypatch):
+    monkeypatch.setattr(settings, "STATS_COUNTERS_MODE", "incremental")
+    monkeypatch.setattr(settings, "STATS_COUNTER_SHARDS", 4)
+
+
+def shard_values(db, name):
+    db.expire_all()
+    return dict(db.query(StatCounter.shard, StatCounter.value).filter(StatCounter.name == name))
+
+
+def test_aggregate_counts_scans_each_table_once(db, make_job):
+    make_job()
+    make_job(status=JobStatus.closed)
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", SAWarning)
+            counts = stats.aggregate_counts(db)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert counts["jobs_total"] == 2
+    assert counts["jobs_open"] == 1
+    assert counts["users_employers"] == 1
+    assert len(statements) == 1
+    for table in ("users", "profiles", "companies", "jobs", "applications"):
+        assert len(re.findall(rf"FROM {table}\b", statements[0])) == 1, table
+
+
+def test_refresh_adds_drift_and_keeps_committed_deltas(db, make_job, incremental, monkeypatch):
+    stats._track_old_values()
+    monkeypatch.setattr(stats.random, "randrange", lambda n: 2)
+    make_job()
+    stats.refresh_counters(db)
+    assert stats.read_counters(db)["jobs_total"] == 1
+    assert set(shard_values(db, "jobs_total")) == {0, 1, 2, 3}
+
+    # A writer's committed job plus its delta on shard 2...
+    make_job()
+    assert shard_values(db, "jobs_total")[2] == 1
+    # ...and a job inserted without any delta (raw SQL bypasses the ORM)
+    company_id = db.query(Job.company_id).first()[0]
+    db.execute(text(
+        "INSERT INTO jobs (title, description, employment_type, status, company_id) "
+        "VALUES ('Raw', 'raw', 'full_time', 'open', :company_id)"
+    ), {"company_id": company_id})
+    db.commit()
+
+    assert stats.refresh_counters(db)["jobs_total"] == 3
+    # The drift went to shard 0; the committed delta on shard 2 survived
+    assert shard_values(db, "jobs_total") == {0: 2, 1: 0, 2: 1, 3: 0}
+    assert stats.read_counters(db)["jobs_total"] == 3
+
+
+def test_incremental_deltas_use_one_shard_per_transaction(db, make_job, incremental, monkeypatch):
+    stats._track_old_values()
+    stats.refresh_counters(db)
+    job = make_job()
+    counts = stats.read_counters(db)
+    assert (counts["jobs_total"], counts["jobs_open"]) == (1, 1)
+
+    job.status = JobStatus.closed
+    db.commit()
+    counts = stats.read_counters(db)
+    assert (counts["jobs_total"], counts["jobs_open"]) == (1, 0)
+
+    # Two flushes, one transaction: both deltas land on the same shard
+    before = shard_values(db, "jobs_total")
+    monkeypatch.setattr(stats.random, "randrange", lambda n: 3)
+    db.add(Job(title="a", description="d", employment_type=job.employment_type, company_id=job.company_id))
+    db.flush()
+    monkeypatch.setattr(stats.random, "randrange", lambda n: 1)
+    db.add(Job(title="b", description="d", employment_type=job.employment_type, company_id=job.company_id))
+    db.commit()
+    after = shard_values(db, "jobs_total")
+    assert after[3] - before[3] == 2
+    assert after[1] == before[1]
+
+
+def test_refresh_blocks_writers_while_aggregating(db, make_job, incremental, monkeypatch):
+    make_job()
+    stats.refresh_counters(db)
+
+    aggregating = threading.Event()
+    release = threading.Event()
+    aggregate = stats.aggregate_counts
+
+    def slow_aggregate(session):
+        aggregating.set()
+        release.wait(5)
+        return aggregate(session)
+
+    monkeypatch.setattr(stats, "aggregate_counts", slow_aggregate)
+    refresher = SessionLocal()
+    thread = threading.Thread(target=stats.refresh_counters, args=(refresher,))
+    thread.start()
+    try:
+        assert aggregating.wait(5)
+        # The refresh already holds the write lock: a writer cannot commit
+        # a job (or its delta) between the aggregate and the counter update
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA busy_timeout = 0")
+            with pytest.raises(Exception, match="locked"):
+                conn.exec_driver_sql(
+                    "INSERT INTO jobs (title, description, employment_type, status, company_id) "
+                    "VALUES ('x', 'x', 'full_time', 'open', 1)"
+                )
+    finally:
+        release.set()
+        thread.join(5)
+        refresher.close()
+    assert stats.read_counters(db)["jobs_total"] == 1
@@ -0,0 +1,92 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.auth import jwt as auth_jwt
+from app.auth.jwt import VerifiedTokenCache, create_token, decode_token, verified_tokens
+from app.errors import APIError
+
+
+@pytest.fixture(autouse=True)
+def _clear_verified_tokens():
+    verified_tokens.clear()
+    yield
+    verified_tokens.clear()
+
+
+@pytest.fixture
+def decodes(monkeypatch):
+    calls = []
+    decode = auth_jwt.jwt.decode
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_jwt.jwt, "decode", counting)
+    return calls
+
+
+def token(token_type="access", minutes=5, user_id=1):
+    return create_token(
+        user_id=user_id, role="seeker", token_type=token_type,
+        expires_delta=timedelta(minutes=minutes),
+    )
+
+
+def test_access_tokens_are_verified_once(decodes):
+    access = token()
+    assert decode_token(access, "access")["sub"] == "1"
+    assert decode_token(access, "access")["sub"] == "1"
+    assert decodes == [access]
+
+
+def test_refresh_tokens_are_not_cached(decodes):
+    refresh = token("refresh")
+    decode_token(refresh, "refresh")
+    decode_token(refresh, "refresh")
+    assert len(decodes) == 2
+
+
+def test_cached_access_token_is_still_checked_for_type():
+    access = token()
+    decode_token(access, "access")
+    with pytest.raises(APIError) as excinfo:
+        decode_token(access, "refresh")
+    assert excinfo.value.code == "INVALID_TOKEN_TYPE"
+
+
+def test_tampered_tokens_are_rejected_and_not_cached():
+    access = token()
+    tampered = access[:-2] + ("AA" if not access.endswith("AA") else "BB")
+    for _ in range(2):
+        with pytest.raises(APIError) as excinfo:
+            decode_token(tampered, "access")
+        assert excinfo.value.code == "INVALID_TOKEN"
+
+
+def test_entries_are_not_served_past_the_token_expiry():
+    cache = VerifiedTokenCache(max_entries=10)
+    key = VerifiedTokenCache.key("token")
+    cache.set(key, {"sub": "1", "exp": time.time() - 1})
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_tokens_are_evicted():
+    cache = VerifiedTokenCache(max_entries=2)
+    keys = [VerifiedTokenCache.key(f"token{n}") for n in range(3)]
+    payload = {"sub": "1", "exp": time.time() + 60}
+    cache.set(keys[0], payload)
+    cache.set(keys[1], payload)
+    cache.get(keys[0])
+    cache.set(keys[2], payload)
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is payload and cache.get(keys[2]) is payload
+
+
+def test_a_zero_size_cache_stores_nothing():
+    cache = VerifiedTokenCache(max_entries=0)
+    key = VerifiedTokenCache.key("token")
+    cache.set(key, {"sub": "1", "exp": time.time() + 60})
+    assert cache.get(key) is None
@@ -107,6 +107,7 @@ export const applicationsAPI = {
   getForEmployer: (params) => apiClient.get('/applications/employer/applications', { params }),
   updateStatus: (id, data) => apiClient.put(`/applications/${id}/status`, data),
   getById: (id) => apiClient.get(`/applications/${id}`),
+  getResume: (id) => apiClient.get(`/applications/${id}/resume`, { responseType: 'blob' }),
 };
 
 // Users API
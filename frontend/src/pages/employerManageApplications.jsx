@@ -53,6 +53,24 @@ export default function ManageApplications() {
     }
   };
 
+  // The resume endpoint needs the bearer token, so a plain link cannot reach it
+  const handleResumeDownload = async (applicationId) => {
+    try {
+      const response = await applicationsAPI.getResume(applicationId);
+      const disposition = response.headers['content-disposition'] || '';
+      const filename = disposition.match(/filename="([^"]+)"/)?.[1] || 'resume';
+      const url = URL.createObjectURL(response.data);
+      const link = document.createElement('a');
+      link.href = url;
+      link.download = `application-${applicationId}-${filename}`;
+      link.click();
+      setTimeout(() => URL.revokeObjectURL(url), 0);
+    } catch (err) {
+      setError('Failed to download resume');
+      setTimeout(() => setError(''), 3000);
+    }
+  };
+
   const getFilteredApplications = () => {
     let filtered = applications;
 
@@ -380,22 +398,21 @@ export default function ManageApplications() {
                     {app.resume_file_url && (
                       <div style={{ marginBottom: '1rem' }}>
                         <h4 style={{ color: '#1e293b', fontSize: '0.95rem', marginBottom: '0.5rem' }}>Resume</h4>
-                        <a
-                          href={app.resume_file_url}
-                          target="_blank"
-                          rel="noopener noreferrer"
+                        <button
+                          onClick={() => handleResumeDownload(app.id)}
                           style={{
                             display: 'inline-block',
                             padding: '0.5rem 1rem',
                             background: '#667eea',
                             color: 'white',
-                            textDecoration: 'none',
+                            border: 'none',
                             borderRadius: '6px',
+                            cursor: 'pointer',
                             fontSize: '0.9rem'
                           }}
                         >
                           Download Resume
-                        </a>
+                        </button>
                       </div>
                     )}
 
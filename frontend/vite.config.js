@@ -10,10 +10,6 @@ export default defineConfig({
       '/api': {
         target: 'http://backend:8000',
         changeOrigin: true
-      },
-      '/uploads': {
-        target: 'http://backend:8000',
-        changeOrigin: true
       }
     }
   },